@@ -2,7 +2,9 @@
 Application Streamlit pour le scraping d'offres d'emploi data en France.
 Interface moderne en dark mode avec dashboard statistiques et tableau interactif.
 """
+import os
 import sys
+import time
 import asyncio
 
 # Fix pour Windows - DOIT ÊTRE FAIT AVANT TOUT AUTRE IMPORT
@@ -15,12 +17,14 @@ if sys.platform == 'win32':
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from scraper.pipeline import ScrapingPipeline
+# Pas d'import de scraper.pipeline (Playwright, sources): le scraping tourne dans scraper_cli.py
+from scraper.snapshot import load_snapshot, read_snapshot_meta, write_snapshot, add_derived_columns, DERIVED_COLUMNS
+from scraper.browser import chromium_installed
 
-from config import MAX_TABLE_ROWS
+from scraper.db import DatabaseManager, ACTIVE_RUN_STATUSES
+from scraper.events import events_path, read_events, summarize_events
+from config import TABLE_PAGE_SIZE, RUNS_DIR, RUN_POLL_INTERVAL
 
 # Configuration de la page
 st.set_page_config(
@@ -30,28 +34,11 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Fonction pour installer Playwright si nécessaire (pour Streamlit Cloud)
-def ensure_playwright_installed():
-    import subprocess
-    import sys
-    try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            try:
-                p.chromium.launch(headless=True).close()
-            except Exception:
-                # Si le lancement échoue, on suppose qu'il faut installer
-                print("Playwright browsers not found. Installing...")
-                subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
-                subprocess.check_call([sys.executable, "-m", "playwright", "install-deps"])
-    except Exception as e:
-        print(f"Error checking Playwright: {e}")
-
-# Exécuter la vérification au démarrage (mais pas à chaque rerun)
-if 'playwright_checked' not in st.session_state:
-    with st.spinner("Vérification des dépendances..."):
-        ensure_playwright_installed()
-    st.session_state.playwright_checked = True
+# Vérification de Chromium sur le système de fichiers, une fois par processus (sans lancer
+# de navigateur); s'il manque, le CLI l'installe au premier scraping (pour Streamlit Cloud)
+@st.cache_resource
+def browser_installed():
+    return chromium_installed()
 
 # CSS personnalisé pour le dark mode
 st.markdown("""
@@ -143,20 +130,31 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialisation du pipeline
+# Accès à la base (le pipeline de scraping n'est jamais chargé par l'application)
+@st.cache_resource
+def get_db():
+    return DatabaseManager()
+
+db = get_db()
+
+# Processus CLI lancés par l'application (run_id -> Popen), partagés entre les sessions
 @st.cache_resource
-def get_pipeline():
-    return ScrapingPipeline()
+def get_run_processes():
+    return {}
 
-pipeline = get_pipeline()
+# Runs interrompus (CLI terminé sans clore son run, tué, heartbeat perdu) marqués en échec:
+# sans cela le bouton resterait désactivé et la page se rafraîchirait indéfiniment
+run_processes = get_run_processes()
+for process_run_id, process in list(run_processes.items()):
+    if process.poll() is not None:
+        db.abandon_run(process_run_id, f"Le CLI s'est arrêté (code {process.returncode}) sans terminer le run "
+                                       f"(voir {RUNS_DIR}/run_{process_run_id}.log)")
+        del run_processes[process_run_id]
+db.reclaim_stale_runs()
 
-# État de session
-if 'scraping_done' not in st.session_state:
-    st.session_state.scraping_done = False
-if 'is_scraping' not in st.session_state:
-    st.session_state.is_scraping = False
-if 'last_stats' not in st.session_state:
-    st.session_state.last_stats = None
+# Dernier run de scraping (lu en base: survit au rafraîchissement du navigateur)
+current_run = db.get_run()
+run_active = current_run is not None and current_run['status'] in ACTIVE_RUN_STATUSES
 
 
 # En-tête
@@ -191,13 +189,27 @@ with st.sidebar:
     # Mettre à jour la session state
     st.session_state.search_queries = [q.strip() for q in queries_text.split('\n') if q.strip()]
     
+    # Lieux couverts en un seul run: les recherches identiques entre lieux ne sont lancées qu'une fois
+    st.subheader("📍 Lieux")
+    if 'search_locations' not in st.session_state:
+        st.session_state.search_locations = ["France"]
+    locations_text = st.text_area(
+        "Lieux à couvrir (un par ligne)",
+        value="\n".join(st.session_state.search_locations),
+        height=100,
+        help="Ville ou région (en France), ou Pays:Lieu (ex: Belgique:Bruxelles). Un pays seul couvre tout le pays."
+    )
+    st.session_state.search_locations = [l.strip() for l in locations_text.split('\n') if l.strip()]
+    
     st.divider()
     
     st.caption("ℹ️ Les modifications seront prises en compte au prochain scraping.")
+    
+    if not browser_installed():
+        st.caption("🧩 Chromium n'est pas encore installé : il le sera au premier scraping.")
 
 # Zone de contrôle
-# Zone de contrôle
-# Recherche par défaut sur toute la France
+# Recherche par défaut sur toute la France, lieux de la barre latérale planifiés par le CLI
 country_choice = "France"
 location_choice = "France"
 
@@ -205,104 +217,116 @@ st.markdown("<br>", unsafe_allow_html=True)
 
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
-    btn_label = "⏳ Scraping en cours..." if st.session_state.is_scraping else "🚀 Lancer le Scraping"
-    if st.button(btn_label, use_container_width=True, disabled=st.session_state.is_scraping):
-        st.session_state.is_scraping = True
-        # Conteneur pour les logs
-        progress_container = st.container()
-        
-        # Barre de progression visuelle
-        progress_bar = st.progress(0, text="Initialisation...")
-        
-        log_placeholder = progress_container.empty()
-        logs = []
-        
-        def progress_callback(message):
-            logs.append(message)
-            log_placeholder.code('\n'.join(logs[-10:]))  # Réduit à 10 pour plus de clarté
+    btn_label = "⏳ Scraping en cours..." if run_active else "🚀 Lancer le Scraping"
+    if st.button(btn_label, use_container_width=True, disabled=run_active):
+        # Le run est créé en attente (verrou en base) puis exécuté par le CLI en arrière-plan
+        run_id = db.start_run(status='queued')
+        if run_id is None:
+            st.warning("Un scraping est déjà en cours.")
+        else:
+            import subprocess
+            
+            # Forcer l'encodage UTF-8 pour le processus fils
+            env = os.environ.copy()
+            env["PYTHONIOENCODING"] = "utf-8"
+            
+            # Préparer les arguments
+            cmd = [sys.executable, os.path.join(os.getcwd(), "scraper_cli.py"),
+                   "--country", country_choice, "--location", location_choice, "--run-id", str(run_id)]
             
-            # Mise à jour simplifiée de la barre de progression basée sur les sources
-            if "📡 Source:" in message:
-                current_source_idx = len([l for l in logs if "📡 Source:" in l])
-                total_sources = 7
-                progress = min(current_source_idx / total_sources, 0.9)
-                progress_bar.progress(progress, text=f"Scraping de la source {current_source_idx}/{total_sources}...")
+            # Ajouter les queries si disponibles
+            if 'search_queries' in st.session_state and st.session_state.search_queries:
+                cmd.extend(["--queries", ",".join(st.session_state.search_queries)])
+            if st.session_state.get('search_locations'):
+                cmd.extend(["--locations", ",".join(st.session_state.search_locations)])
+            
+            # Processus détaché: la sortie va dans un fichier journal, l'application ne l'attend pas
+            os.makedirs(RUNS_DIR, exist_ok=True)
+            with open(os.path.join(RUNS_DIR, f"run_{run_id}.log"), 'w', encoding='utf-8') as log_file:
+                run_processes[run_id] = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+            st.rerun()
+    
+    # Progression lue dans scrape_runs à chaque rerun
+    if current_run is not None:
+        progress = current_run['progress']
+        finished_sources = sum(1 for p in progress.values() if p.get('status') in ('done', 'failed'))
+        counters = (f"{current_run['jobs_scraped']} offres récupérées, {current_run['jobs_added']} nouvelles, "
+                    f"{current_run['jobs_updated']} mises à jour")
+        if run_active:
+            # Événements du CLI lus de façon incrémentale: l'offset et l'état agrégé sont conservés entre les reruns
+            tracker = st.session_state.get('run_events')
+            if tracker is None or tracker['run_id'] != current_run['id']:
+                tracker = {'run_id': current_run['id'], 'offset': 0, 'state': None}
+            events, tracker['offset'] = read_events(events_path(RUNS_DIR, current_run['id']), tracker['offset'])
+            tracker['state'] = summarize_events(events, tracker['state'])
+            st.session_state.run_events = tracker
+            state = tracker['state']
+            
+            if state['sources_total']:
+                step = state['current_source'] or "Finalisation..."
+                eta = f" — reste ~{int(state['eta_s'] // 60)} min {int(state['eta_s'] % 60):02d} s" if state['eta_s'] is not None else ""
+                st.progress(min(state['sources_done'] / state['sources_total'], 1.0),
+                            text=f"Run #{current_run['id']} — {step} ({state['sources_done']}/{state['sources_total']} sources){eta}")
+                skipped = f", {state['skipped']} sources ignorées" if state['skipped'] else ""
+                st.caption(f"{state['pages']} pages chargées, {state['jobs']} offres récupérées, "
+                           f"{state['valid']} valides, {state['added']} nouvelles enregistrées{skipped}")
+            else:
+                # Pas encore d'événements (run en attente): progression enregistrée en base
+                step = current_run['current_source'] or "Initialisation..."
+                st.progress(min(finished_sources / max(len(progress), 1), 1.0),
+                            text=f"Run #{current_run['id']} — {step} ({finished_sources}/{len(progress)} sources)")
+                st.caption(counters)
+        elif current_run['status'] == 'succeeded':
+            st.success(f"Dernier scraping (run #{current_run['id']}) terminé : {counters}")
+        elif current_run['status'] == 'failed':
+            st.error(f"Le dernier scraping (run #{current_run['id']}) a échoué : {current_run['error']}")
         
-        with st.spinner("Récupération des offres..."):
-            try:
-                import subprocess
-                import os
-                
-                # Utiliser le Python de l'environnement virtuel
-                python_exe = sys.executable
-                script_path = os.path.join(os.getcwd(), "scraper_cli.py")
-                
-                # Forcer l'encodage UTF-8 pour le processus fils
-                env = os.environ.copy()
-                env["PYTHONIOENCODING"] = "utf-8"
-                
-                # Préparer les arguments
-                cmd = [python_exe, script_path, "--country", country_choice, "--location", location_choice]
-                
-                # Ajouter les queries si disponibles
-                if 'search_queries' in st.session_state and st.session_state.search_queries:
-                    queries_str = ",".join(st.session_state.search_queries)
-                    cmd.extend(["--queries", queries_str])
-                
-                # Lancer le scraper en tant que processus séparé
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    env=env
-                )
-                
-                # Lire la sortie en temps réel
-                while True:
-                    line = process.stdout.readline()
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        progress_callback(line.strip())
-                
-                # Vérifier si le processus a réussi
-                return_code = process.wait()
-                
-                st.session_state.is_scraping = False
-                progress_bar.progress(1.0, text="Scraping terminé !")
-                
-                if return_code == 0:
-                    st.session_state.scraping_done = True
-                    # Recharger les stats (le DB a été mise à jour par le processus CLI)
-                    st.success("Scraping terminé avec succès !")
-                    st.rerun()
-                else:
-                    st.error(f"Le scraper a échoué avec le code : {return_code}")
-                
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                st.markdown(f"""
-                <div class="error-message">
-                    <strong>❌ Erreur lors du scraping</strong><br>
-                    {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-                with st.expander("Détails de l'erreur"):
-                    st.code(error_details)
+        failed = {name: p.get('error') for name, p in progress.items() if p.get('status') == 'failed'}
+        log_path = os.path.join(RUNS_DIR, f"run_{current_run['id']}.log")
+        if failed or os.path.exists(log_path):
+            with st.expander("Détails du run"):
+                for name, error in failed.items():
+                    st.markdown(f"❌ **{name}** : {error}")
+                if os.path.exists(log_path):
+                    with open(log_path, encoding='utf-8', errors='replace') as f:
+                        st.code(''.join(f.readlines()[-15:]))
 
 st.markdown("---")
 
-# Récupérer les données
-jobs_data = pipeline.get_all_jobs(limit=MAX_TABLE_ROWS)
-stats = pipeline.get_statistics()
+# Instantané du dashboard, relu uniquement quand sa version change
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_dashboard(version):
+    return load_snapshot()
 
-if jobs_data:
+snapshot_meta = read_snapshot_meta()
+if snapshot_meta is None:
+    # Premier lancement (ou base antérieure aux instantanés): le construire une fois
+    snapshot_meta = write_snapshot(db)
+snapshot_meta, jobs_df = load_dashboard(snapshot_meta['version'])
+stats = snapshot_meta['stats']
+keyword_counts = snapshot_meta['keyword_counts']
+skill_counts = snapshot_meta.get('skill_counts', {})  # Absent des instantanés antérieurs
+
+# Pages du tableau lues en SQL et mises en cache par version des données:
+# un rerun sans écriture ne touche pas SQLite, une écriture du CLI invalide le cache
+data_version = db.get_data_version()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_jobs_page(data_version, filters, sort, descending, page, columns):
+    result = db.query_jobs(filters, sort=sort, descending=descending, page=page, page_size=TABLE_PAGE_SIZE)
+    page_df = add_derived_columns(pd.DataFrame(result['rows'], columns=list(columns)))
+    return page_df, result['total'], result['pages']
+
+# Descriptions complètes: lues (et décompressées) une par une, à la demande
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_described_ids(data_version, job_ids):
+    return db.get_described_job_ids(list(job_ids))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_description(job_id):
+    return db.get_description(job_id)
+
+if not jobs_df.empty:
     # Dashboard statistiques
     st.markdown("<h2>📊 Statistiques</h2>", unsafe_allow_html=True)
     
@@ -326,7 +350,8 @@ if jobs_data:
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Graphiques
+    # Graphiques (plotly n'est importé que lorsqu'il y a des données à afficher)
+    import plotly.express as px
     chart_col1, chart_col2 = st.columns(2)
     
     with chart_col1:
@@ -364,80 +389,128 @@ if jobs_data:
             )
             st.plotly_chart(fig_source, use_container_width=True)
     
-
-    
-
+    # Facettes par mot-clé (calculées à l'écriture de l'instantané)
+    if keyword_counts:
+        fig_keywords = px.bar(
+            x=list(keyword_counts.values()),
+            y=list(keyword_counts.keys()),
+            orientation='h',
+            title="Mots-clés les plus fréquents",
+            labels={'x': 'Nombre d\'offres', 'y': 'Mot-clé'},
+            color=list(keyword_counts.values()),
+            color_continuous_scale='Blues'
+        )
+        fig_keywords.update_layout(
+            plot_bgcolor='#1a1a1a',
+            paper_bgcolor='#1a1a1a',
+            font_color='#e0e0e0',
+            showlegend=False,
+            yaxis={'categoryorder': 'total ascending'}
+        )
+        st.plotly_chart(fig_keywords, use_container_width=True)
+    
+    # Compétences les plus demandées (taxonomie config.SKILLS)
+    if skill_counts:
+        fig_skills = px.bar(
+            x=list(skill_counts.values()),
+            y=list(skill_counts.keys()),
+            orientation='h',
+            title="Compétences les plus demandées",
+            labels={'x': 'Nombre d\'offres', 'y': 'Compétence'},
+            color=list(skill_counts.values()),
+            color_continuous_scale='Blues'
+        )
+        fig_skills.update_layout(
+            plot_bgcolor='#1a1a1a',
+            paper_bgcolor='#1a1a1a',
+            font_color='#e0e0e0',
+            showlegend=False,
+            yaxis={'categoryorder': 'total ascending'}
+        )
+        st.plotly_chart(fig_skills, use_container_width=True)
 
     st.markdown("---")
     
     # Tableau des offres
     st.markdown("<h2>📋 Offres d'Emploi</h2>", unsafe_allow_html=True)
     
-    # Convertir en DataFrame
-    df = pd.DataFrame(jobs_data)
-    
-    # Ajouter le badge Nouveau (offres scrapées il y a moins de 24h)
-    def check_new(scraped_at_val):
-        try:
-            if isinstance(scraped_at_val, str):
-                scraped_at = pd.to_datetime(scraped_at_val)
-            else:
-                scraped_at = scraped_at_val
-                
-            if (datetime.utcnow() - scraped_at.replace(tzinfo=None)) < timedelta(hours=24):
-                return "🆕 Nouveau"
-            return ""
-        except:
-            return ""
-            
-    df['✨ Status'] = df['scraped_at'].apply(check_new)
-    
-    # S'assurer que les colonnes nécessaires existent (pour éviter KeyError si cache ancien)
-    if 'applied' not in df.columns:
-        df['applied'] = False
-    if 'id' not in df.columns:
-        df['id'] = range(len(df)) # Fallback id si manquant (ne permettra pas la persistance mais évite le crash)
-    
-    # Filtres
-    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    # Filtres: exécutés en SQL sur toute la table (DatabaseManager.query_jobs)
+    filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
     
     with filter_col1:
-        categories = ['Toutes'] + sorted(df['role_category'].unique().tolist())
+        categories = ['Toutes'] + sorted(c for c in stats['by_category'] if c)
         selected_category = st.selectbox("Catégorie", categories)
     
     with filter_col2:
-        sources = ['Toutes'] + sorted(df['source'].unique().tolist())
+        sources = ['Toutes'] + sorted(s for s in stats['by_source'] if s)
         selected_source = st.selectbox("Source", sources)
     
     with filter_col3:
-        search_term = st.text_input("Rechercher (titre, entreprise)", "")
+        keywords = ['Tous'] + list(keyword_counts.keys())
+        selected_keyword = st.selectbox("Mot-clé", keywords)
     
-    # Appliquer les filtres
-    filtered_df = df.copy()
+    with filter_col4:
+        search_term = st.text_input("Rechercher (titre, entreprise, mots-clés)", "")
     
-    # Filtre automatique par carte si actif
-
+    selected_skills = st.multiselect("Compétences (toutes requises)", list(skill_counts)) if skill_counts else []
     
-    if selected_category != 'Toutes':
-        filtered_df = filtered_df[filtered_df['role_category'] == selected_category]
+    option_col1, option_col2, option_col3, option_col4 = st.columns(4)
     
-    if selected_source != 'Toutes':
-        filtered_df = filtered_df[filtered_df['source'] == selected_source]
+    with option_col1:
+        date_range = st.date_input("Publiée entre", value=(), help="Laisser vide pour toutes les dates")
+    
+    with option_col2:
+        applied_choice = st.selectbox("Candidature", ['Toutes', 'Postulé', 'Non postulé'])
     
+    with option_col3:
+        sort_options = {
+            'Date de publication': 'published_date',
+            'Date de scraping': 'scraped_at',
+            'Entreprise': 'company',
+            'Titre': 'job_title',
+        }
+        if search_term:
+            sort_options = {'Pertinence': 'relevance', **sort_options}
+        sort_label = st.selectbox("Trier par", list(sort_options))
+        descending = st.checkbox("Ordre décroissant", value=sort_options[sort_label] in ('published_date', 'scraped_at', 'relevance'))
+    
+    with option_col4:
+        page = int(st.number_input("Page", min_value=1, value=1, step=1))
+    
+    filters = {}
+    if selected_category != 'Toutes':
+        filters['category'] = selected_category
+    if selected_source != 'Toutes':
+        filters['source'] = selected_source
+    if selected_keyword != 'Tous':
+        filters['keyword'] = selected_keyword
+    if selected_skills:
+        filters['skill'] = tuple(selected_skills)
     if search_term:
-        mask = (
-            filtered_df['job_title'].str.contains(search_term, case=False, na=False) |
-            filtered_df['company'].str.contains(search_term, case=False, na=False)
-        )
-        filtered_df = filtered_df[mask]
+        filters['search'] = search_term
+    if len(date_range) == 2:
+        filters['since'] = datetime.combine(date_range[0], datetime.min.time())
+        filters['until'] = datetime.combine(date_range[1] + timedelta(days=1), datetime.min.time())
+    if applied_choice != 'Toutes':
+        filters['applied'] = applied_choice == 'Postulé'
+    sort = sort_options[sort_label]
+    
+    if not filters and sort == 'published_date' and descending and page * TABLE_PAGE_SIZE <= len(jobs_df):
+        # Vue par défaut: les premières pages sont déjà dans l'instantané
+        filtered_df = jobs_df.iloc[(page - 1) * TABLE_PAGE_SIZE:page * TABLE_PAGE_SIZE].copy()
+        total = stats['total']
+        pages = max((total + TABLE_PAGE_SIZE - 1) // TABLE_PAGE_SIZE, 1)
+    else:
+        columns = tuple(c for c in jobs_df.columns if c not in DERIVED_COLUMNS)
+        filtered_df, total, pages = cached_jobs_page(data_version, filters, sort, descending, page, columns)
     
     # Afficher le nombre de résultats
-    st.markdown(f"<p style='color: #b0b0b0;'>📊 {len(filtered_df)} offres affichées</p>", unsafe_allow_html=True)
+    st.markdown(f"<p style='color: #b0b0b0;'>📊 {total} offres trouvées — page {page}/{pages}</p>", unsafe_allow_html=True)
     
     # Préparer le tableau pour l'affichage
     display_df = filtered_df[[
-        'id', '✨ Status', 'applied', 'job_title', 'company', 'role_category', 'location', 
-        'source', 'published_date', 'detected_keywords', 'url'
+        'id', 'status', 'applied', 'job_title', 'company', 'role_category', 'location', 
+        'source', 'published_day', 'detected_keywords', 'url'
     ]].copy()
     
     # Renommer les colonnes
@@ -446,16 +519,23 @@ if jobs_data:
         'Source', 'Date Publication', 'Mots-clés', 'URL'
     ]
     
-    # Formater les dates
-    if 'Date Publication' in display_df.columns:
-        # Conversion flexible sans format strict pour supporter différents styles ISO
-        display_df['Date Publication'] = pd.to_datetime(display_df['Date Publication'], errors='coerce').dt.strftime('%Y-%m-%d')
-        # Remplacer les NaT/NaN par une chaîne vide ou un tiret pour éviter "None" texte
-        display_df['Date Publication'] = display_df['Date Publication'].fillna("-")
-    
-    # Afficher le tableau avec st.data_editor pour permettre la modification du statut "Appliqué"
-    edited_df = st.data_editor(
+    # Positions 0..n-1: edited_rows référence les lignes par position
+    display_df = display_df.reset_index(drop=True)
+    
+    # Afficher le tableau avec st.data_editor pour permettre la modification du statut "Appliqué".
+    # La clé ne dépend que de la vue (filtres, tri, page) et d'un compteur incrémenté après chaque
+    # enregistrement: elle ne change pas entre le rendu et le clic suivant de l'utilisateur, et les
+    # positions d'edited_rows ne sont jamais réappliquées à des lignes rechargées
+    editor_generation = st.session_state.get('jobs_editor_generation', 0)
+    for kind, message in st.session_state.pop('jobs_editor_messages', []):
+        if kind == 'toast':
+            st.toast(message, icon="✅")
+        else:
+            st.error(message)
+    editor_key = f"jobs_editor_{editor_generation}_{hash((repr(sorted(filters.items())), sort, descending, page))}"
+    st.data_editor(
         display_df,
+        key=editor_key,
         use_container_width=True,
         height=600,
         hide_index=True,
@@ -475,22 +555,46 @@ if jobs_data:
         disabled=["ID", "Status", "Titre", "Entreprise", "Catégorie", "Localisation", "Source", "Date Publication", "Mots-clés", "URL"]
     )
     
-    # Gérer les modifications du statut "Appliqué"
-    if not edited_df.equals(display_df):
-        # Identifier les lignes modifiées
-        changes = edited_df[edited_df['Appliqué'] != display_df['Appliqué']]
-        for _, row in changes.iterrows():
-            job_id = int(row['ID'])
-            new_status = bool(row['Appliqué'])
-            if pipeline.update_job_status(job_id, new_status):
-                st.toast(f"Statut mis à jour pour : {row['Titre']}", icon="✅")
-            else:
-                st.error(f"Erreur lors de la mise à jour pour : {row['Titre']}")
-    
-    # Export CSV
+    # Gérer les modifications du statut "Appliqué": seules les lignes éditées sont examinées
+    edited_rows = st.session_state.get(editor_key, {}).get('edited_rows', {})
+    changes = {}
+    for position, values in edited_rows.items():
+        row = display_df.iloc[int(position)]
+        if 'Appliqué' in values and bool(values['Appliqué']) != bool(row['Appliqué']):
+            changes[int(row['ID'])] = bool(values['Appliqué'])
+    
+    if changes:
+        results = db.update_job_statuses(changes)
+        titles = dict(zip(display_df['ID'], display_df['Titre']))
+        updated = [job_id for job_id, ok in results.items() if ok]
+        # Messages affichés après le rechargement (st.rerun interrompt le script)
+        messages = []
+        if len(updated) == 1:
+            messages.append(('toast', f"Statut mis à jour pour : {titles[updated[0]]}"))
+        elif updated:
+            messages.append(('toast', f"Statut mis à jour pour {len(updated)} offres"))
+        for job_id in (job_id for job_id, ok in results.items() if not ok):
+            messages.append(('error', f"Erreur lors de la mise à jour pour : {titles[job_id]}"))
+        st.session_state.jobs_editor_messages = messages
+        # Réécrire l'instantané et recharger tout de suite le tableau depuis la nouvelle version
+        write_snapshot(db)
+        st.session_state.jobs_editor_generation = editor_generation + 1
+        st.rerun()
+    
+    # Description complète: chargée seulement pour l'offre choisie (stockée compressée à part)
+    described = set(cached_described_ids(data_version, tuple(int(job_id) for job_id in display_df['ID'])))
+    if described:
+        titles = {int(row['ID']): f"{row['Titre']} — {row['Entreprise']}" for _, row in display_df.iterrows()
+                  if int(row['ID']) in described}
+        with st.expander(f"📄 Descriptions complètes ({len(titles)} offres de la page)"):
+            job_id = st.selectbox("Offre", options=[None, *titles], format_func=lambda i: "—" if i is None else titles[i])
+            if job_id is not None:
+                st.write(cached_description(job_id))
+    
+    # Export CSV de la page affichée
     csv = filtered_df.to_csv(index=False).encode('utf-8')
     st.download_button(
-        label="📥 Exporter en CSV",
+        label="📥 Exporter la page en CSV",
         data=csv,
         file_name=f"offres_emploi_{datetime.now().strftime('%Y%m%d')}.csv",
         mime="text/csv"
@@ -508,3 +612,8 @@ else:
 # Footer
 st.markdown("<br><br>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: #606060; font-size: 12px;'>Job Crawler - Scraping d'offres d'emploi data en France 🇫🇷</p>", unsafe_allow_html=True)
+
+# Pendant un run, la page est rafraîchie périodiquement (après l'avoir affichée en entier)
+if run_active:
+    time.sleep(RUN_POLL_INTERVAL)
+    st.rerun()
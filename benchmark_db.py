@@ -0,0 +1,295 @@
+"""
+Benchmark des requêtes du dashboard sur une base SQLite synthétique.
+
+Usage:
+    python benchmark_db.py --rows 1000000
+    python benchmark_db.py --rows 100000 --descriptions 20000
+    python benchmark_db.py --rows 100000 --skills 100000
+"""
+import os
+import re
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from scraper.db import DatabaseManager
+from scraper.compression import DescriptionCodec, train_dictionary, zstandard
+from scraper.skills import get_matcher
+from config import SKILLS
+
+SOURCES = ['Indeed', 'WTTJ', 'LinkedIn', 'HelloWork', 'APEC', 'Glassdoor', 'Internet Search']
+CATEGORIES = ['Data Analyst', 'Business Analyst', 'Data Engineer', 'Other']
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Bordeaux', 'Lille', 'Nantes', 'Rennes', 'France', 'Télétravail']
+TITLES = ['Data Analyst', 'Business Analyst', 'Data Engineer', 'Analytics Engineer', 'Data Scientist', 'Ingénieur Data']
+KEYWORDS = ['data', 'data analyst', 'data engineer', 'business', 'business analyst', 'données']
+
+# Blocs des descriptions synthétiques: surtout du texte commun à de nombreuses offres
+INTROS = [
+    f"Entreprise {i} est un acteur majeur du {sector} en France et en Europe. Fondée il y a plus de "
+    f"{10 + i % 40} ans, elle accompagne plus de {i * 100} clients et compte aujourd'hui {50 + i * 7} collaborateurs "
+    f"répartis dans {2 + i % 9} bureaux. Notre mission: rendre la donnée utile à chaque décision."
+    for i, sector in enumerate(['conseil', 'retail', 'e-commerce', 'secteur bancaire', 'transport', 'énergie',
+                                'secteur public', 'logiciel SaaS', 'luxe', 'assurance'] * 5)
+]
+MISSIONS = [
+    "Vous concevez et maintenez les tableaux de bord de pilotage de l'activité avec les équipes métier.",
+    "Vous développez et industrialisez les pipelines de données (ingestion, transformation, qualité).",
+    "Vous analysez les parcours clients et formulez des recommandations chiffrées aux équipes produit.",
+    "Vous recueillez les besoins des utilisateurs et rédigez les spécifications fonctionnelles.",
+    "Vous participez à la mise en place de la gouvernance des données et du catalogue de données.",
+    "Vous automatisez les reportings récurrents et fiabilisez les indicateurs clés de performance.",
+    "Vous accompagnez la migration de l'entrepôt de données vers une architecture cloud moderne.",
+    "Vous animez des ateliers avec les parties prenantes et priorisez le backlog avec le product owner.",
+]
+REQUIREMENTS = [
+    "Maîtrise de SQL et d'un langage de programmation (Python ou R).",
+    "Expérience d'un outil de data visualisation (Power BI, Tableau, Looker).",
+    "Connaissance d'un environnement cloud (AWS, GCP ou Azure) et de dbt ou Airflow.",
+    "Bonne compréhension des enjeux métier et excellentes capacités de communication.",
+    "Anglais professionnel, à l'écrit comme à l'oral.",
+    "Diplôme Bac+5 en école d'ingénieur, de commerce ou équivalent universitaire.",
+    "Une première expérience en Spark, Kafka ou dans un environnement Big Data est un plus.",
+]
+BENEFITS = [
+    "Télétravail jusqu'à 3 jours par semaine, carte Swile, mutuelle prise en charge à 100 %, "
+    "RTT, participation et intéressement, budget formation annuel, locaux en plein centre-ville.",
+    "Rémunération selon profil, prime annuelle sur objectifs, tickets restaurant, prise en charge à 50 % "
+    "du titre de transport, forfait mobilités durables et événements d'équipe réguliers.",
+    "Process de recrutement: un premier échange avec notre équipe RH, un entretien technique avec le "
+    "manager puis une rencontre avec l'équipe. Nous nous engageons à répondre à toutes les candidatures.",
+]
+LEGAL = (
+    "Conformément à notre politique en faveur de la diversité, tous nos postes sont ouverts aux personnes "
+    "en situation de handicap. Nous nous engageons à offrir un processus de recrutement équitable et "
+    "inclusif, sans discrimination liée à l'origine, au genre, à l'âge, à l'orientation sexuelle ou au "
+    "handicap. Les données personnelles transmises lors de votre candidature sont traitées conformément "
+    "au Règlement général sur la protection des données (RGPD) et conservées pendant deux ans au plus."
+)
+
+
+def generate_rows(count: int, start_id: int = 0):
+    """Génère des offres synthétiques (tuples prêts pour executemany)."""
+    now = datetime.utcnow()
+    for i in range(start_id, start_id + count):
+        published = now - timedelta(minutes=random.randint(0, 365 * 24 * 60))
+        scraped = published + timedelta(hours=random.randint(0, 72))
+        title = random.choice(TITLES)
+        yield (
+            f"{title} H/F #{i}",
+            f"Entreprise {random.randint(1, 20000)}",
+            random.choice(CATEGORIES),
+            random.choice(SOURCES),
+            published.isoformat(sep=' '),
+            f"{random.choice(CITIES)} {random.randint(1, 200)}" if random.random() < 0.5 else random.choice(CITIES),
+            f"https://example.com/jobs/{i}",
+            f"Nous recherchons un(e) {title} pour rejoindre notre équipe data.",
+            ', '.join(sorted(random.sample(KEYWORDS, 2))),
+            random.random() < 0.05,
+            scraped.isoformat(sep=' ')
+        )
+
+
+def populate(db_path: str, rows: int, chunk_size: int = 50000):
+    """Remplit la base avec des offres synthétiques."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    done = 0
+    while done < rows:
+        count = min(chunk_size, rows - done)
+        conn.executemany(
+            "INSERT INTO jobs (job_title, company, role_category, source, published_date, location, url, "
+            "snippet, detected_keywords, applied, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            generate_rows(count, done)
+        )
+        conn.commit()
+        done += count
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+def generate_description(rng: random.Random, title: str) -> str:
+    """Description synthétique (3 à 10 Ko): présentation, missions, profil, avantages, mentions légales."""
+    intro = rng.choice(INTROS)
+    parts = [intro, f"Au sein de l'équipe data, nous recherchons un(e) {title} H/F.", "Vos missions:"]
+    parts += rng.sample(MISSIONS, rng.randint(4, len(MISSIONS)))
+    parts += ["Votre profil:"] + rng.sample(REQUIREMENTS, rng.randint(3, len(REQUIREMENTS)))
+    parts += rng.sample(BENEFITS, rng.randint(1, len(BENEFITS))) + [LEGAL]
+    text = '\n'.join(parts)
+    # Paragraphes repris d'une offre à l'autre (versions régionales, rappels du poste)
+    while len(text.encode('utf-8')) < rng.randint(3000, 10000):
+        text += '\n' + rng.choice([intro, rng.choice(MISSIONS), rng.choice(BENEFITS), LEGAL])
+    return text
+
+
+def benchmark_descriptions(db: DatabaseManager, db_path: str, count: int):
+    """
+    Compare la compression des descriptions (sans dictionnaire, zlib et zstd avec dictionnaire) et la
+    latence de get_all_jobs selon que les descriptions sont dans une table à part ou dans jobs.
+    """
+    rng = random.Random(42)
+    with db.engine.connect() as conn:
+        jobs = conn.exec_driver_sql(
+            "SELECT id, job_title, detected_keywords FROM jobs WHERE id NOT IN (SELECT job_id FROM job_descriptions) "
+            "ORDER BY id LIMIT ?", (count,)
+        ).all()
+    texts = [generate_description(rng, title.split(' H/F')[0]) for _, title, _ in jobs]
+    raw_bytes = sum(len(text.encode('utf-8')) for text in texts)
+    print(f"\n🗜️  Compression de {len(texts)} descriptions ({raw_bytes / 1e6:.1f} Mo):")
+
+    samples = [text.encode('utf-8') for text in texts[:2000]]
+    codecs = [('zlib sans dictionnaire', DescriptionCodec('zlib')),
+              ('zlib + dictionnaire', DescriptionCodec('zlib', train_dictionary(samples, 'zlib')))]
+    if zstandard is not None:
+        codecs.append(('zstd + dictionnaire', DescriptionCodec('zstd', train_dictionary(samples, 'zstd'))))
+    else:
+        print("  (zstd ignoré: paquet zstandard non installé)")
+    for label, codec in codecs:
+        start = time.perf_counter()
+        bodies = [codec.compress(text) for text in texts]
+        compress_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for body in bodies:
+            codec.decompress(body)
+        decompress_s = time.perf_counter() - start
+        stored = sum(len(body) for body in bodies)
+        print(f"  {label:<26} ratio {raw_bytes / stored:5.1f}x  {stored / 1e6:7.2f} Mo  "
+              f"{raw_bytes / 1e6 / compress_s:6.0f} Mo/s compr.  {raw_bytes / 1e6 / decompress_s:6.0f} Mo/s décompr.")
+
+    # Stockage réel: table job_descriptions, puis dictionnaire entraîné et recompression
+    start = time.perf_counter()
+    rows = [{'job_id': job_id, 'description': text, 'method': 'http', 'detected_keywords': keywords}
+            for (job_id, _, keywords), text in zip(jobs, texts)]
+    for offset in range(0, len(rows), 5000):
+        db.save_descriptions(rows[offset:offset + 5000])
+    print(f"  save_descriptions: {time.perf_counter() - start:.1f} s")
+    start = time.perf_counter()
+    result = db.train_description_dictionary()
+    if result:
+        print(f"  train_description_dictionary ({result['codec']}, {result['dict_size']} octets): "
+              f"{result['rows']} lignes recompressées en {time.perf_counter() - start:.1f} s, ratio {result['ratio']}x")
+
+    print("\n⏱️  get_all_jobs selon le stockage des descriptions:")
+    timed("descriptions à part (job_descriptions)", db.get_all_jobs)
+    timed("  get_jobs_page(limit=500)", lambda: db.get_jobs_page(limit=500))
+    timed("get_description(id)", lambda: db.get_description(jobs[0][0]), repeat=20)
+    # Comparaison: le même texte, non compressé, dans une colonne de jobs
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("ALTER TABLE jobs ADD COLUMN bench_description TEXT")
+        conn.executemany("UPDATE jobs SET bench_description = ? WHERE id = ?",
+                         [(text, job_id) for (job_id, _, _), text in zip(jobs, texts)])
+        conn.commit()
+        timed("descriptions dans jobs (colonne TEXT)", db.get_all_jobs)
+        timed("  get_jobs_page(limit=500)", lambda: db.get_jobs_page(limit=500))
+    finally:
+        conn.execute("ALTER TABLE jobs DROP COLUMN bench_description")
+        conn.commit()
+        conn.close()
+
+
+def benchmark_skills(db: DatabaseManager, count: int):
+    """
+    Débit de l'extraction des compétences (taxonomie compilée) sur count descriptions synthétiques,
+    comparé à une recherche par alias; puis réanalyse de la base et requêtes sur job_skills.
+    """
+    rng = random.Random(7)
+    start = time.perf_counter()
+    matcher = get_matcher.__wrapped__()
+    print(f"\n🧰 Taxonomie: {len(matcher.families)} compétences, expression de {len(matcher.pattern.pattern)} "
+          f"caractères compilée en {(time.perf_counter() - start) * 1000:.1f} ms")
+    jobs = [(rng.choice(TITLES), None, generate_description(rng, rng.choice(TITLES))) for _ in range(count)]
+    mb = sum(len(text.encode('utf-8')) for _, _, text in jobs) / 1e6
+
+    start = time.perf_counter()
+    found = matcher.extract_batch(jobs)
+    elapsed = time.perf_counter() - start
+    print(f"  {'expression compilée (trie)':<40} {count / elapsed:10.0f} offres/s  {mb / elapsed:6.1f} Mo/s  "
+          f"({count} offres en {elapsed:.1f} s, {sum(map(len, found)) / count:.1f} compétences/offre)")
+
+    # Référence: une expression par alias, sur un échantillon
+    patterns = [
+        re.compile(r'(?<![\w.\-])' + re.escape(alias.lstrip('=')) + r'(?![\w\-+#]|\.\w)',
+                   0 if alias.startswith('=') else re.IGNORECASE)
+        for skills in SKILLS.values() for aliases in skills.values() for alias in aliases
+    ]
+    sample = jobs[:min(count, 2000)]
+    start = time.perf_counter()
+    for title, _, text in sample:
+        [pattern.search(title + '\n' + text) for pattern in patterns]
+    elapsed = time.perf_counter() - start
+    print(f"  {f'une expression par alias ({len(patterns)})':<40} {len(sample) / elapsed:10.0f} offres/s")
+
+    print("\n⏱️  Table job_skills:")
+    refreshed = db.refresh_skills()
+    print(f"  refresh_skills: {refreshed['jobs']} offres en {refreshed['seconds']} s, {refreshed['links']} lignes")
+    timed("get_skill_counts()", db.get_skill_counts)
+    timed("query_jobs(skill=['SQL', 'Python'])", lambda: db.query_jobs({'skill': ['SQL', 'Python']}))
+
+
+def timed(label: str, func, repeat: int = 3):
+    """Mesure le meilleur temps d'exécution d'une fonction."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<40} {best * 1000:10.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des requêtes du dashboard.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Nombre d'offres synthétiques")
+    parser.add_argument("--db", type=str, default="", help="Chemin de la base (temporaire par défaut)")
+    parser.add_argument("--descriptions", type=int, default=0,
+                        help="Mesure aussi la compression de N descriptions synthétiques")
+    parser.add_argument("--skills", type=int, default=0,
+                        help="Mesure aussi l'extraction des compétences sur N descriptions synthétiques")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench_jobs.db")
+    print(f"📦 Base: {db_path}")
+
+    db = DatabaseManager(db_path)
+    with db.engine.connect() as conn:
+        existing = conn.exec_driver_sql("SELECT count(*) FROM jobs").scalar()
+    if existing < args.rows:
+        # Connexions du pool fermées: quitter le mode WAL exige un accès exclusif à la base
+        db.engine.dispose()
+        start = time.perf_counter()
+        populate(db_path, args.rows - existing)
+        print(f"✅ {args.rows - existing} offres générées en {time.perf_counter() - start:.1f} s")
+
+    print("\n⏱️  Requêtes du dashboard:")
+    timed("get_all_jobs(limit=500)", lambda: db.get_all_jobs(limit=500))
+    timed("get_jobs_page(limit=500)", lambda: db.get_jobs_page(limit=500))
+    timed("get_jobs_frame(limit=500)", lambda: db.get_jobs_frame(limit=500))
+    timed("get_statistics()", db.get_statistics)
+    timed("search_jobs('ingenieur lyon')", lambda: db.search_jobs('ingenieur lyon', limit=500))
+    timed("get_posting_lifetimes()", db.get_posting_lifetimes)
+
+    print("\n🔎 Plans d'exécution:")
+    plans = {
+        'ORDER BY published_date': "SELECT id FROM jobs ORDER BY published_date DESC LIMIT 500",
+        'GROUP BY role_category': "SELECT role_category, count(id) FROM jobs GROUP BY role_category",
+        'GROUP BY date(published_date)': "SELECT date(jobs.published_date), count(jobs.id) FROM jobs GROUP BY date(jobs.published_date)",
+        'WHERE source = ?': "SELECT id FROM jobs WHERE source = 'WTTJ'",
+    }
+    with db.engine.connect() as conn:
+        for label, sql in plans.items():
+            detail = '; '.join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+            print(f"  {label:<40} {detail}")
+
+    if args.descriptions:
+        benchmark_descriptions(db, db_path, args.descriptions)
+    if args.skills:
+        benchmark_skills(db, args.skills)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
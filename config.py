@@ -19,9 +19,98 @@ ROLE_CATEGORIES = {
     'Other': []  # Fallback pour les matches génériques
 }
 
+# Taxonomie des compétences (scraper/skills.py): famille -> compétence -> alias FR/EN.
+# Alias insensibles à la casse, aux accents et aux séparateurs ("power bi" = "PowerBI" = "Power-BI");
+# préfixés par "=", sensibles à la casse (sigles ambigus). Après modification, les offres sont
+# réanalysées à la fin du run suivant (ou par scraper_cli.py --extract-skills)
+SKILLS = {
+    'Langages': {
+        'SQL': ['sql', 't-sql', 'pl/sql'],
+        'Python': ['python'],
+        'R': ['=R', 'rstudio', 'langage r'],
+        'Scala': ['scala'],
+        'Java': ['java'],
+        'VBA': ['vba', 'macros excel'],
+        'DAX': ['=DAX'],
+        'SAS': ['sas base', 'sas guide', 'sas enterprise guide', 'sas viya', 'sas/stat'],
+    },
+    'BI et dataviz': {
+        'Power BI': ['power bi', 'power query'],
+        'Tableau': ['=Tableau', 'tableau software', 'tableau desktop'],
+        'Looker': ['looker'],
+        'Looker Studio': ['looker studio', 'data studio', 'google data studio'],
+        'Qlik': ['qlik', 'qlikview', 'qlik sense'],
+        'Metabase': ['metabase'],
+        'Excel': ['excel', 'microsoft excel'],
+        'Data visualisation': ['data visualisation', 'data visualization', 'dataviz', 'visualisation de données'],
+    },
+    'Data engineering': {
+        'dbt': ['dbt', 'data build tool'],
+        'Airflow': ['airflow'],
+        'Spark': ['spark', 'pyspark'],
+        'Kafka': ['kafka'],
+        'Hadoop': ['hadoop', 'hdfs'],
+        'Hive': ['hive'],
+        'Databricks': ['databricks'],
+        'Snowflake': ['snowflake'],
+        'BigQuery': ['bigquery'],
+        'Redshift': ['redshift'],
+        'Talend': ['talend'],
+        'Informatica': ['informatica'],
+        'SSIS': ['ssis'],
+        'ETL': ['etl', 'elt'],
+        'Modélisation de données': ['modélisation de données', 'modélisation des données', 'data modeling',
+                                    'data modelling'],
+        'Docker': ['docker'],
+        'Kubernetes': ['kubernetes', 'k8s'],
+        'Terraform': ['terraform'],
+        'Git': ['git', 'github', 'gitlab'],
+    },
+    'Bases de données': {
+        'PostgreSQL': ['postgresql', 'postgres'],
+        'MySQL': ['mysql'],
+        'SQL Server': ['sql server', 'mssql'],
+        'Oracle': ['oracle'],
+        'MongoDB': ['mongodb'],
+        'NoSQL': ['nosql'],
+    },
+    'Cloud': {
+        'AWS': ['aws', 'amazon web services'],
+        'GCP': ['gcp', 'google cloud', 'google cloud platform'],
+        'Azure': ['azure', 'microsoft azure'],
+    },
+    'Data science': {
+        'Machine Learning': ['machine learning', 'apprentissage automatique'],
+        'Deep Learning': ['deep learning', 'apprentissage profond'],
+        'Statistiques': ['statistiques', 'statistique', 'statistics', 'analyse statistique'],
+        'pandas': ['pandas'],
+        'scikit-learn': ['scikit-learn', 'sklearn'],
+        'TensorFlow': ['tensorflow'],
+        'PyTorch': ['pytorch'],
+        'NLP': ['nlp', 'traitement du langage naturel', 'natural language processing'],
+        'IA générative': ['ia générative', 'generative ai', 'genai', 'llm', 'llms'],
+    },
+    'Méthodes et outils': {
+        'Agile': ['agile', 'scrum', 'kanban'],
+        'Jira': ['jira'],
+        'SAP': ['=SAP'],
+        'Salesforce': ['salesforce'],
+        'Google Analytics': ['google analytics', 'ga4'],
+        'A/B testing': ['a/b testing', 'ab testing', 'tests a/b'],
+    },
+}
+# Expressions reconnues puis ignorées (prioritaires sur les alias plus courts qu'elles contiennent)
+SKILL_EXCLUSIONS = ['tableau de bord', 'tableaux de bord', 'R&D', 'R & D']
+
 # Fenêtre temporelle (en jours)
 MAX_DAYS_OLD = 3
 
+# Rétention: les offres non revues depuis RETENTION_DAYS jours sont déplacées
+# vers la base d'archive (jobs_archive.db), toujours lisible via l'API unifiée
+RETENTION_DAYS = 30
+# Entretien après archivage: pages de l'index plein texte fusionnées au plus ('merge' FTS5)
+FTS_MERGE_PAGES = 500
+
 # Localisations françaises (mots-clés pour la détection)
 FRENCH_LOCATIONS = [
     'france', 'paris', 'lyon', 'marseille', 'toulouse', 'nice', 'nantes',
@@ -40,6 +129,12 @@ HEADLESS = True  # Mode headless pour le navigateur
 BROWSER_TIMEOUT = 30000  # Timeout en millisecondes
 PAGE_LOAD_TIMEOUT = 20000  # Timeout pour le chargement des pages
 
+# Navigateur partagé (scraper_cli.py --browser-server start): un Chromium longue durée en écoute
+# CDP sur 127.0.0.1:BROWSER_SERVER_PORT; le pipeline et les scripts s'y connectent tant qu'il est démarré
+BROWSER_SERVER_PORT = 9222
+BROWSER_SERVER_STATE = 'runs/browser_server.json'
+BROWSER_SERVER_PROFILE = 'runs/browser_profile'
+
 # Gestion des erreurs et retry
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # Secondes entre les tentatives
@@ -59,3 +154,82 @@ DATABASE_PATH = 'jobs.db'
 
 # Limite d'affichage dans le tableau
 MAX_TABLE_ROWS = 500
+
+# Nombre d'offres par page dans le tableau du dashboard
+TABLE_PAGE_SIZE = 50
+
+# Runs de scraping: un run actif sans heartbeat depuis STALE_RUN_SECONDS est considéré
+# comme interrompu (libère le verrou); les journaux des runs lancés par l'application vont dans RUNS_DIR
+STALE_RUN_SECONDS = 120
+# Intervalle du heartbeat envoyé par un thread du pipeline pendant tout le run
+HEARTBEAT_INTERVAL = 5
+RUNS_DIR = 'runs'
+RUN_POLL_INTERVAL = 2  # Secondes entre deux rafraîchissements du dashboard pendant un run
+# Reprise: un run CLI relancé avec les mêmes paramètres reprend le dernier run interrompu de
+# moins de RESUME_MAX_HOURS heures, sans refaire ses unités (source, requête) terminées
+RESUME_MAX_HOURS = 24
+
+# Démarrage de l'application: budget (secondes) du temps d'import des modules de app.py,
+# vérifié par verify_startup.py; ces modules ne doivent jamais être chargés au démarrage
+STARTUP_IMPORT_BUDGET = 3.0
+STARTUP_FORBIDDEN_MODULES = ('playwright', 'scraper.pipeline', 'scraper.sources', 'plotly')
+
+# Mode démon (scraper_cli.py --daemon): chaque (source, requête) est relancée tous les
+# SCHEDULE_INTERVALS[source] minutes, à ±SCHEDULE_JITTER (fraction de l'intervalle) près
+SCHEDULE_INTERVALS = {
+    'Indeed': 180,
+    'WTTJ': 120,
+    'LinkedIn': 180,
+    'HelloWork': 360,
+    'APEC': 720,
+    'Glassdoor': 1440,  # Anti-bot fréquent: passages espacés
+    'Internet Search': 1440,
+}
+SCHEDULE_DEFAULT_INTERVAL = 360
+SCHEDULE_JITTER = 0.1
+SCHEDULE_RETRY_DELAY = 15  # Minutes avant de relancer une unité en échec (doublé à chaque échec, plafonné à l'intervalle)
+SCHEDULE_MAX_UNITS_PER_RUN = 6  # Unités échues exécutées par run (borne la durée d'un arrêt propre)
+SCHEDULE_POLL_SECONDS = 60  # Attente maximale entre deux vérifications des échéances
+
+# File de tâches (scraper_cli.py --enqueue / --worker): une tâche réservée par un worker
+# l'est pour TASK_LEASE_SECONDS, prolongé toutes les TASK_HEARTBEAT_SECONDS; un worker mort
+# perd sa tâche à l'expiration du bail. Une tâche en échec est retentée TASK_MAX_ATTEMPTS fois
+# au total, après TASK_RETRY_DELAY secondes (doublé à chaque tentative)
+TASK_LEASE_SECONDS = 300
+TASK_HEARTBEAT_SECONDS = 30
+TASK_MAX_ATTEMPTS = 3
+TASK_RETRY_DELAY = 60
+TASK_POLL_SECONDS = 10  # Attente d'un worker --wait quand la file est vide
+
+# Budget de requêtes (scraper_cli.py --budget-requests / --budget-seconds): le rendement de chaque
+# (source, requête) (nouvelles offres par requête HTTP et par seconde) est mesuré sur les tâches
+# des YIELD_WINDOW_DAYS derniers jours; le budget est dépensé sur les couples les plus productifs,
+# BUDGET_EXPLORATION (fraction) étant réservé aux couples jamais essayés ou les moins récents
+BUDGET_MAX_REQUESTS = None  # Requêtes HTTP par run (None: pas de limite)
+BUDGET_MAX_SECONDS = None  # Durée de scraping par run en secondes (None: pas de limite)
+BUDGET_EXPLORATION = 0.2
+BUDGET_DEFAULT_REQUESTS = 3  # Coût estimé d'un couple sans historique (ni historique de sa source)
+BUDGET_DEFAULT_SECONDS = 60
+YIELD_WINDOW_DAYS = 30
+
+# Enrichissement (scraper_cli.py --enrich): description complète des offres nouvelles du run,
+# téléchargée en HTTP (ENRICH_MAX_WORKERS requêtes simultanées, ENRICH_PER_HOST par site) avec
+# repli sur le navigateur; au plus ENRICH_MAX_JOBS offres par run
+ENRICH_DETAILS = False
+ENRICH_MAX_WORKERS = 8
+ENRICH_PER_HOST = 2
+ENRICH_TIMEOUT = 15  # Secondes par requête HTTP
+ENRICH_BROWSER_FALLBACK = True
+ENRICH_MAX_JOBS = 300
+ENRICH_MIN_LENGTH = 200  # Caractères minimum d'une description (en dessous: page de blocage, extrait)
+
+# Compression des descriptions (scraper/compression.py): zstd si le paquet zstandard est installé,
+# sinon zlib. Un dictionnaire est entraîné sur DESCRIPTION_DICT_SAMPLES descriptions dès que la base
+# en contient DESCRIPTION_DICT_MIN_SAMPLES (ou par scraper_cli.py --train-dictionary)
+DESCRIPTION_DICT_SIZE = 64 * 1024  # Octets (zlib: 32 Ko au plus)
+DESCRIPTION_DICT_SAMPLES = 2000
+DESCRIPTION_DICT_MIN_SAMPLES = 200
+DESCRIPTION_ZSTD_LEVEL = 9
+
+# Instantané du dashboard (Arrow/Feather + métadonnées JSON), réécrit à la fin de chaque run
+SNAPSHOT_PATH = 'dashboard_snapshot.arrow'
@@ -6,6 +6,7 @@ from scraper.sources.hellowork_scraper import HelloWorkScraper
 from scraper.sources.apec_scraper import APECScraper
 from scraper.sources.glassdoor_scraper import GlassdoorScraper
 from scraper.sources.search_scraper import SearchScraper
+from scraper.browser import connect_browser
 from playwright.sync_api import sync_playwright
 import logging
 
@@ -24,7 +25,8 @@ def diagnose():
     ]
     
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+        # Navigateur partagé s'il est démarré (scraper_cli.py --browser-server start)
+        browser, _ = connect_browser(p)
         
         for scraper in scrapers:
             print(f"--- Diagnosing {scraper.source_name} ---")
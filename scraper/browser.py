@@ -0,0 +1,203 @@
+"""
+Navigateur Chromium utilisé par Playwright: installation et navigateur partagé.
+
+La vérification de l'installation se limite au système de fichiers (marqueur d'installation
+de Playwright): elle ne lance pas de navigateur et n'importe pas Playwright.
+
+Le navigateur partagé est un Chromium longue durée lancé une fois (en écoute CDP) auquel le
+pipeline et les scripts se connectent, au lieu de payer un démarrage à froid à chaque run.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import signal
+import subprocess
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from scraper.utils import pid_alive
+from config import HEADLESS, BROWSER_TIMEOUT, BROWSER_SERVER_PORT, BROWSER_SERVER_STATE, BROWSER_SERVER_PROFILE
+
+
+def playwright_browsers_dir() -> str:
+    """Dossier où Playwright installe ses navigateurs (PLAYWRIGHT_BROWSERS_PATH ou emplacement par défaut)."""
+    custom = os.environ.get('PLAYWRIGHT_BROWSERS_PATH')
+    if custom and custom != '0':
+        return custom
+    if custom == '0':
+        # Navigateurs installés dans le paquet playwright lui-même
+        import importlib.util
+        spec = importlib.util.find_spec('playwright')
+        if spec and spec.origin:
+            return os.path.join(os.path.dirname(spec.origin), 'driver', 'package', '.local-browsers')
+    if sys.platform == 'win32':
+        return os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'ms-playwright')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Caches/ms-playwright')
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'ms-playwright')
+
+
+@lru_cache(maxsize=1)
+def chromium_installed() -> bool:
+    """Indique si un Chromium Playwright est installé (résultat mis en cache pour le processus)."""
+    pattern = os.path.join(glob.escape(playwright_browsers_dir()), 'chromium*-*', 'INSTALLATION_COMPLETE')
+    return bool(glob.glob(pattern))
+
+
+def ensure_chromium_installed(progress_callback: Optional[Callable] = None) -> bool:
+    """
+    Installe Chromium (et ses dépendances système sous Linux) s'il est absent.
+
+    Returns:
+        True si une installation a été effectuée
+    """
+    if chromium_installed():
+        return False
+    message = "Navigateur Chromium introuvable, installation..."
+    if progress_callback:
+        progress_callback(message)
+    else:
+        print(message)
+    subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
+    if sys.platform.startswith('linux'):
+        subprocess.check_call([sys.executable, "-m", "playwright", "install-deps", "chromium"])
+    chromium_installed.cache_clear()
+    return True
+
+
+def _endpoint_alive(endpoint: str, timeout: float = 1.0) -> bool:
+    """Indique si le point d'accès CDP répond."""
+    import urllib.request
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def read_browser_server(state_path: str = BROWSER_SERVER_STATE) -> Optional[Dict]:
+    """Lit l'état du navigateur partagé (None s'il n'a pas été démarré)."""
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def browser_server_status(state_path: str = BROWSER_SERVER_STATE) -> Optional[Dict]:
+    """État du navigateur partagé avec 'alive' (processus vivant et point d'accès CDP joignable)."""
+    state = read_browser_server(state_path)
+    if state is None:
+        return None
+    state['alive'] = pid_alive(state['pid']) and _endpoint_alive(state['endpoint'])
+    return state
+
+
+def start_browser_server(playwright=None, port: int = BROWSER_SERVER_PORT, headless: bool = HEADLESS,
+                         state_path: str = BROWSER_SERVER_STATE, profile_dir: str = BROWSER_SERVER_PROFILE,
+                         startup_timeout: float = 30.0) -> Dict:
+    """
+    Lance un Chromium détaché en écoute CDP et enregistre son état (pid, endpoint, durée de lancement).
+
+    Le processus survit au script qui l'a lancé; il est arrêté par stop_browser_server.
+
+    Args:
+        playwright: Instance sync_playwright déjà ouverte (sinon ouverte le temps de trouver l'exécutable)
+
+    Returns:
+        État enregistré: pid, port, endpoint, headless, started_at, launch_ms
+
+    Raises:
+        RuntimeError: si le point d'accès CDP ne répond pas dans startup_timeout secondes
+    """
+    if playwright is None:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            return start_browser_server(p, port, headless, state_path, profile_dir, startup_timeout)
+
+    endpoint = f"http://127.0.0.1:{port}"
+    args = [
+        playwright.chromium.executable_path,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={os.path.abspath(profile_dir)}",
+        "--no-first-run", "--no-default-browser-check", "about:blank",
+    ]
+    if headless:
+        args.insert(1, "--headless=new")
+    # Détaché du groupe de processus: Ctrl+C dans le terminal du script ne l'arrête pas
+    detach = ({'creationflags': subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+              if sys.platform == 'win32' else {'start_new_session': True})
+    start = time.perf_counter()
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **detach)
+    while not _endpoint_alive(endpoint, timeout=0.5):
+        if process.poll() is not None or time.perf_counter() - start > startup_timeout:
+            process.kill()
+            raise RuntimeError(f"Le navigateur partagé n'a pas démarré sur le port {port}")
+        time.sleep(0.1)
+
+    state = {
+        'pid': process.pid, 'port': port, 'endpoint': endpoint, 'headless': headless,
+        'started_at': datetime.utcnow().isoformat(), 'launch_ms': round((time.perf_counter() - start) * 1000),
+    }
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(state_path + '.tmp', state_path)
+    return state
+
+
+def stop_browser_server(state_path: str = BROWSER_SERVER_STATE) -> bool:
+    """Arrête le navigateur partagé. Returns: True s'il était enregistré."""
+    state = read_browser_server(state_path)
+    if state is None:
+        return False
+    if pid_alive(state['pid']):
+        if sys.platform == 'win32':
+            subprocess.run(['taskkill', '/PID', str(state['pid']), '/T', '/F'], capture_output=True)
+        else:
+            os.kill(state['pid'], signal.SIGTERM)
+    os.remove(state_path)
+    return True
+
+
+def connect_browser(playwright, progress_callback: Optional[Callable] = None,
+                    state_path: str = BROWSER_SERVER_STATE) -> Tuple[object, Dict]:
+    """
+    Retourne un navigateur: le navigateur partagé s'il a été démarré, sinon un Chromium local.
+
+    Un navigateur partagé enregistré mais arrêté (plantage) est relancé automatiquement.
+    browser.close() ferme un Chromium local, ou se déconnecte du navigateur partagé en
+    fermant les contextes créés.
+
+    Returns:
+        (browser, infos: mode 'shared' ou 'local', startup_ms, saved_ms)
+    """
+    def log(message: str):
+        if progress_callback:
+            progress_callback(message)
+        else:
+            print(message)
+
+    state = browser_server_status(state_path)
+    if state is not None:
+        try:
+            if not state['alive']:
+                log("♻️  Navigateur partagé arrêté (plantage?), relance...")
+                state = start_browser_server(playwright, port=state['port'], headless=state['headless'],
+                                             state_path=state_path)
+            start = time.perf_counter()
+            browser = playwright.chromium.connect_over_cdp(state['endpoint'], timeout=BROWSER_TIMEOUT)
+            startup_ms = round((time.perf_counter() - start) * 1000)
+            saved_ms = max(state['launch_ms'] - startup_ms, 0)
+            log(f"🔌 Navigateur partagé: connexion en {startup_ms} ms ({saved_ms} ms de démarrage économisées)")
+            return browser, {'mode': 'shared', 'startup_ms': startup_ms, 'saved_ms': saved_ms}
+        except Exception as e:
+            log(f"⚠️  Navigateur partagé indisponible ({e}), lancement local")
+
+    start = time.perf_counter()
+    browser = playwright.chromium.launch(headless=HEADLESS)
+    return browser, {'mode': 'local', 'startup_ms': round((time.perf_counter() - start) * 1000), 'saved_ms': 0}
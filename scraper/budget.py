@@ -0,0 +1,141 @@
+"""
+Répartition d'un budget de requêtes entre les couples (source, requête).
+
+Chaque source lançait toutes ses requêtes à chaque run, y compris les moins utiles
+(Glassdoor souvent bloqué, LinkedIn plafonné à quelques cartes par recherche). Le
+rendement mesuré de chaque couple (DatabaseManager.get_query_yields: nouvelles offres
+par requête HTTP et par seconde) permet de dépenser un budget fixé par run:
+
+- exploitation: les couples au meilleur rendement, jusqu'à (1 - exploration) du budget;
+- exploration: une part du budget va aux couples jamais essayés, puis aux moins récemment
+  lancés, pour que leur rendement reste mesuré;
+- le budget encore libre est complété par les couples suivants dans l'ordre du rendement.
+"""
+from typing import Dict, List, Optional, Tuple
+from config import BUDGET_EXPLORATION, BUDGET_DEFAULT_REQUESTS, BUDGET_DEFAULT_SECONDS
+
+
+def estimate_cost(source: str, query: str, yields: Dict[Tuple[str, str], Dict]) -> Tuple[float, float]:
+    """
+    Coût moyen d'une tâche (requêtes, secondes): historique du couple, sinon moyenne de la
+    source, sinon BUDGET_DEFAULT_REQUESTS et BUDGET_DEFAULT_SECONDS.
+    """
+    history = yields.get((source, query))
+    if history is None:
+        same_source = [info for (name, _), info in yields.items() if name == source]
+        if not same_source:
+            return float(BUDGET_DEFAULT_REQUESTS), float(BUDGET_DEFAULT_SECONDS)
+        history = {key: sum(info[key] for info in same_source) for key in ('tasks', 'requests', 'seconds')}
+    tasks = history['tasks']
+    requests = history['requests'] / tasks if history['requests'] else BUDGET_DEFAULT_REQUESTS
+    seconds = history['seconds'] / tasks if history['seconds'] else BUDGET_DEFAULT_SECONDS
+    return float(requests), float(seconds)
+
+
+def allocate_budget(units: List[Dict], yields: Dict[Tuple[str, str], Dict],
+                    max_requests: Optional[int] = None, max_seconds: Optional[float] = None,
+                    exploration: float = BUDGET_EXPLORATION) -> Dict:
+    """
+    Choisit les unités à exécuter dans le budget, par ordre de priorité.
+
+    Le coût d'une unité est la part du budget qu'elle consomme (la plus grande des parts de
+    requêtes et de secondes quand les deux limites sont fixées); son rendement est le nombre
+    moyen de nouvelles offres par tâche rapporté à ce coût.
+
+    Args:
+        units: Dicts contenant au moins source et query; 'resumed': True pour une unité déjà
+            terminée (reprise d'un run), gardée sans coût
+        yields: Rendements par (source, requête), voir DatabaseManager.get_query_yields
+        max_requests / max_seconds: Limites du run (None: pas de limite)
+        exploration: Part du budget réservée aux couples sans historique ou les moins récents
+
+    Returns:
+        units: unités retenues (exploitation puis exploration), dropped: unités écartées,
+        exploited / explored: nombre d'unités choisies pour leur rendement ou en exploration, estimated_requests / estimated_seconds
+    """
+    if max_requests is None and max_seconds is None:
+        return {'units': list(units), 'dropped': [], 'exploited': len(units), 'explored': 0,
+                'estimated_requests': None, 'estimated_seconds': None}
+
+    candidates = []
+    for index, unit in enumerate(units):
+        requests, seconds = estimate_cost(unit['source'], unit['query'] or '', yields)
+        shares = []
+        if max_requests is not None:
+            shares.append(requests / max(max_requests, 1))
+        if max_seconds is not None:
+            shares.append(seconds / max(max_seconds, 1))
+        history = yields.get((unit['source'], unit['query'] or ''))
+        value = history['added'] / history['tasks'] if history else None
+        candidates.append({
+            'index': index, 'unit': unit, 'requests': requests, 'seconds': seconds,
+            'cost': 0.0 if unit.get('resumed') else max(shares),
+            'rate': value / max(max(shares), 1e-9) if value is not None else None,
+            'last': history['last_finished_at'] if history else None,
+        })
+
+    selected, spent = [], 0.0
+
+    def take(candidate) -> bool:
+        nonlocal spent
+        if candidate in selected or spent + candidate['cost'] > 1.0 + 1e-9:
+            return False
+        selected.append(candidate)
+        spent += candidate['cost']
+        return True
+
+    # Unités déjà terminées (reprise): gardées, sans coût
+    for candidate in candidates:
+        if candidate['unit'].get('resumed'):
+            take(candidate)
+    resumed = len(selected)
+
+    # Exploitation: meilleur rendement d'abord, dans (1 - exploration) du budget; un couple
+    # qui n'a rien rapporté n'est relancé qu'en exploration
+    ranked = sorted((c for c in candidates if c['rate']), key=lambda c: (-c['rate'], c['index']))
+    for candidate in ranked:
+        if spent + candidate['cost'] <= 1.0 - exploration + 1e-9:
+            take(candidate)
+    exploited = len(selected) - resumed
+
+    # Exploration (part du budget réservée): couples jamais essayés (ordre du plan), puis les
+    # moins récemment lancés
+    untried = [c for c in candidates if c['rate'] is None]
+    stale = sorted((c for c in candidates if c['rate'] is not None), key=lambda c: (c['last'], c['index']))
+    limit = spent + exploration
+    for candidate in untried + stale:
+        if spent + candidate['cost'] <= limit + 1e-9:
+            take(candidate)
+
+    # Budget restant: couples suivants par rendement, puis exploration
+    for candidate in ranked:
+        if take(candidate):
+            exploited += 1
+    for candidate in untried + stale:
+        take(candidate)
+    explored = len(selected) - resumed - exploited
+
+    chosen = {c['index'] for c in selected}
+    return {
+        'units': [c['unit'] for c in selected],
+        'dropped': [c['unit'] for c in candidates if c['index'] not in chosen],
+        'exploited': exploited,
+        'explored': explored,
+        'estimated_requests': round(sum(c['requests'] for c in selected if not c['unit'].get('resumed'))),
+        'estimated_seconds': round(sum(c['seconds'] for c in selected if not c['unit'].get('resumed'))),
+    }
+
+
+def format_yields(yields: Dict[Tuple[str, str], Dict]) -> List[str]:
+    """Lignes du rapport de rendement, du couple le plus productif au moins productif."""
+    lines = ["📈 Rendement par (source, requête): nouvelles offres / requête, / minute"]
+    ranked = sorted(yields.items(), key=lambda item: -(item[1]['added_per_request'] or 0))
+    for (source, query), info in ranked:
+        per_request = f"{info['added_per_request']:.2f}" if info['added_per_request'] is not None else "-"
+        per_minute = f"{info['added_per_second'] * 60:.2f}" if info['added_per_second'] is not None else "-"
+        line = (f"  {source:<16} {query or '(défaut)':<24} {per_request:>6} /req {per_minute:>6} /min"
+                f"  ({info['tasks']} tâches, {info['added']} nouvelles, {info['requests']} requêtes")
+        if info['failed']:
+            line += f", {info['failed']} en échec"
+        lines.append(line + ")")
+    return lines
@@ -0,0 +1,94 @@
+"""
+Compression des descriptions d'offres (table job_descriptions).
+
+Une description fait 3 à 10 Ko, surtout du texte répété d'une offre à l'autre (présentation
+de l'entreprise, avantages, mentions légales). Compressée seule, elle laisse peu de prise à
+un compresseur générique; avec un dictionnaire entraîné sur nos propres offres, le texte
+commun n'est plus stocké qu'une fois.
+
+- zstd (paquet optionnel zstandard): dictionnaire entraîné par zstandard.train_dictionary;
+- zlib sinon: dictionnaire prédéfini (zdict, 32 Ko au plus) formé des phrases les plus
+  fréquentes des offres.
+
+Chaque ligne garde son codec et l'identifiant de son dictionnaire: les lignes compressées
+avec un ancien dictionnaire (ou sans) restent lisibles.
+"""
+import re
+import zlib
+from collections import Counter
+from typing import List, Optional
+from config import DESCRIPTION_DICT_SIZE, DESCRIPTION_ZSTD_LEVEL
+
+try:
+    import zstandard
+except ImportError:  # Dépendance optionnelle: repli sur zlib
+    zstandard = None
+
+# Taille maximale d'un dictionnaire zlib (fenêtre de 32 Ko)
+ZLIB_DICT_SIZE = 32 * 1024
+
+
+def default_codec() -> str:
+    """Codec utilisé pour les nouvelles lignes: zstd si le paquet zstandard est installé, sinon zlib."""
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def train_dictionary(samples: List[bytes], codec: Optional[str] = None, size: int = DESCRIPTION_DICT_SIZE) -> bytes:
+    """
+    Entraîne un dictionnaire de compression sur des descriptions (encodées en UTF-8).
+
+    Raises:
+        zstandard.ZstdError: si les échantillons sont trop peu nombreux pour zstd
+    """
+    if (codec or default_codec()) == 'zstd':
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    # zlib: phrases présentes dans plusieurs offres, les plus fréquentes à la fin du
+    # dictionnaire (zlib code moins cher les références proches)
+    counts = Counter()
+    for sample in samples:
+        counts.update({phrase for phrase in re.split(rb'(?<=[.!?:;\n])\s+', sample) if len(phrase) >= 20})
+    chosen, total = [], 0
+    for phrase, count in counts.most_common():
+        if count < 2 or total + len(phrase) + 1 > min(size, ZLIB_DICT_SIZE):
+            continue
+        chosen.append(phrase)
+        total += len(phrase) + 1
+    return b' '.join(reversed(chosen))
+
+
+class DescriptionCodec:
+    """Compresse et décompresse des descriptions avec un codec et un dictionnaire donnés."""
+
+    def __init__(self, codec: str = 'zlib', dictionary: Optional[bytes] = None, dict_id: Optional[int] = None):
+        """
+        Args:
+            codec: 'zstd' ou 'zlib'
+            dictionary: Dictionnaire entraîné (None: compression sans dictionnaire)
+            dict_id: Identifiant du dictionnaire dans description_dicts
+        """
+        if codec == 'zstd' and zstandard is None:
+            raise RuntimeError("Le paquet zstandard est requis pour lire ces descriptions (pip install zstandard)")
+        self.codec = codec
+        self.dictionary = dictionary
+        self.dict_id = dict_id
+        self._zstd_dict = None
+        if codec == 'zstd' and dictionary:
+            self._zstd_dict = zstandard.ZstdCompressionDict(dictionary)
+            self._zstd_dict.precompute_compress(level=DESCRIPTION_ZSTD_LEVEL)
+
+    def compress(self, text: str) -> bytes:
+        """Compresse une description."""
+        data = text.encode('utf-8')
+        if self.codec == 'zstd':
+            # Compresseurs non partagés entre threads: un par appel (dictionnaire précalculé)
+            return zstandard.ZstdCompressor(level=DESCRIPTION_ZSTD_LEVEL, dict_data=self._zstd_dict).compress(data)
+        compressor = zlib.compressobj(9, zdict=self.dictionary) if self.dictionary else zlib.compressobj(9)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, body: bytes) -> str:
+        """Décompresse une description."""
+        if self.codec == 'zstd':
+            return zstandard.ZstdDecompressor(dict_data=self._zstd_dict).decompress(body).decode('utf-8')
+        decompressor = zlib.decompressobj(zdict=self.dictionary) if self.dictionary else zlib.decompressobj()
+        return (decompressor.decompress(body) + decompressor.flush()).decode('utf-8')
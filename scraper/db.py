@@ -2,12 +2,28 @@
 Couche de base de données SQLite pour stocker les offres d'emploi.
 """
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
-from sqlalchemy import create_engine, Column, String, DateTime, Integer, Text, Boolean, func
+import re
+import json
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterator, Tuple
+from sqlalchemy import (
+    create_engine, event, inspect, text, select, union_all, exists, and_, or_, literal_column, case,
+    MetaData, Table, Column, String, DateTime, Integer, Text, Boolean, LargeBinary, Index, UniqueConstraint, func,
+    bindparam, literal
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from config import DATABASE_PATH
+from scraper.migrations import run_migrations, split_keywords
+from scraper.compression import DescriptionCodec, default_codec, train_dictionary
+from scraper.skills import get_matcher
+from scraper.utils import pid_alive
+from config import (
+    DATABASE_PATH, RETENTION_DAYS, FTS_MERGE_PAGES, STALE_RUN_SECONDS, RESUME_MAX_HOURS, TASK_MAX_ATTEMPTS, TASK_LEASE_SECONDS,
+    YIELD_WINDOW_DAYS, DESCRIPTION_DICT_SAMPLES
+)
 
 Base = declarative_base()
 
@@ -18,16 +34,16 @@ class Job(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     job_title = Column(String(500), nullable=False)
-    company = Column(String(300))
-    role_category = Column(String(100))  # Data Analyst, Business Analyst, Data Engineer, Other
-    source = Column(String(100), nullable=False)  # Indeed, WTTJ, LinkedIn, etc.
-    published_date = Column(DateTime)
-    location = Column(String(300))
+    company = Column(String(300), index=True)
+    role_category = Column(String(100), index=True)  # Data Analyst, Business Analyst, Data Engineer, Other
+    source = Column(String(100), nullable=False, index=True)  # Indeed, WTTJ, LinkedIn, etc.
+    published_date = Column(DateTime, index=True)
+    location = Column(String(300), index=True)
     url = Column(String(1000), unique=True)  # Clé unique principale
     snippet = Column(Text)  # Résumé/description courte
     detected_keywords = Column(String(500))  # Liste des mots-clés détectés (séparés par virgule)
     applied = Column(Boolean, default=False)  # Nouveau champ pour le suivi des candidatures
-    scraped_at = Column(DateTime, default=datetime.utcnow)
+    scraped_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     def to_dict(self) -> Dict:
         """Convertit l'objet en dictionnaire."""
@@ -47,14 +63,290 @@ class Job(Base):
         }
 
 
+class JobStat(Base):
+    """Compteur agrégé des offres par dimension (maintenu par triggers SQLite)."""
+    __tablename__ = 'job_stats'
+    
+    dimension = Column(String(20), primary_key=True)  # total, category, source, day, location
+    value = Column(String(300), primary_key=True)  # '' pour les valeurs NULL
+    count = Column(Integer, nullable=False, default=0)
+
+
+class Keyword(Base):
+    """Dictionnaire des mots-clés détectés."""
+    __tablename__ = 'keywords'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+
+
+class JobKeyword(Base):
+    """Relation offre <-> mot-clé (indexée dans les deux sens)."""
+    __tablename__ = 'job_keywords'
+    __table_args__ = (
+        Index('ix_job_keywords_keyword', 'keyword_id', 'job_id'),
+    )
+    
+    job_id = Column(Integer, primary_key=True)
+    keyword_id = Column(Integer, primary_key=True)
+
+
+class ScrapeRun(Base):
+    """Exécution du pipeline de scraping."""
+    __tablename__ = 'scrape_runs'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+    status = Column(String(20), nullable=False, default='running')  # queued, running, succeeded, failed
+    pid = Column(Integer)
+    heartbeat_at = Column(DateTime)
+    current_source = Column(String(100))
+    progress = Column(Text)  # JSON: source -> {'status', 'jobs', 'valid', 'error'}
+    jobs_scraped = Column(Integer, nullable=False, default=0)
+    jobs_added = Column(Integer, nullable=False, default=0)
+    jobs_updated = Column(Integer, nullable=False, default=0)
+    jobs_skipped = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    params = Column(Text)  # JSON: country, location, units [(source, requête)]; clé de reprise
+
+
+class SourceName(Base):
+    """Dictionnaire des sources (encodage entier des apparitions)."""
+    __tablename__ = 'sources'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+
+
+class JobSighting(Base):
+    """Apparition d'une offre dans un run (table en ajout seul)."""
+    __tablename__ = 'job_sightings'
+    
+    job_id = Column(Integer, primary_key=True)
+    source_id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, primary_key=True)
+    seen_at = Column(Integer, nullable=False, index=True)  # Secondes epoch UTC
+
+
+class JobLifetime(Base):
+    """Première/dernière apparition d'une offre par source (maintenu par trigger sur job_sightings)."""
+    __tablename__ = 'job_lifetimes'
+    __table_args__ = (
+        Index('ix_job_lifetimes_source_last_seen', 'source_id', 'last_seen'),
+    )
+    
+    job_id = Column(Integer, primary_key=True)
+    source_id = Column(Integer, primary_key=True)
+    first_seen = Column(Integer, nullable=False)
+    last_seen = Column(Integer, nullable=False)
+    sightings = Column(Integer, nullable=False)
+    published_at = Column(Integer)
+
+
+class JobDescription(Base):
+    """Description complète d'une offre (page de détail, voir scraper/enrich.py), compressée."""
+    __tablename__ = 'job_descriptions'
+    
+    job_id = Column(Integer, primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd, zlib (voir scraper/compression.py)
+    dict_id = Column(Integer)  # Dictionnaire de description_dicts (None: sans dictionnaire)
+    body = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)  # Taille de la description en UTF-8
+    method = Column(String(10), nullable=False)  # http, browser
+    fetched_at = Column(DateTime, nullable=False)
+    fetch_ms = Column(Integer)
+
+
+class Skill(Base):
+    """Compétence de la taxonomie (config.SKILLS)."""
+    __tablename__ = 'skills'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+    family = Column(String(100), nullable=False)
+
+
+class JobSkill(Base):
+    """Relation offre <-> compétence (indexée dans les deux sens)."""
+    __tablename__ = 'job_skills'
+    __table_args__ = (
+        Index('ix_job_skills_skill', 'skill_id', 'job_id'),
+    )
+    
+    job_id = Column(Integer, primary_key=True)
+    skill_id = Column(Integer, primary_key=True)
+    in_title = Column(Boolean, nullable=False)  # Compétence citée dans le titre
+
+
+class DescriptionDict(Base):
+    """Dictionnaire de compression entraîné sur les descriptions (le plus récent sert aux écritures)."""
+    __tablename__ = 'description_dicts'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    codec = Column(String(10), nullable=False)
+    dictionary = Column(LargeBinary, nullable=False)
+    samples = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+class DbMeta(Base):
+    """Métadonnées clé/valeur de la base (ex: data_version)."""
+    __tablename__ = 'db_meta'
+    
+    key = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False)
+
+
+class ScheduleState(Base):
+    """Planification du mode démon: échéance et dernier passage de chaque (source, requête, lieu)."""
+    __tablename__ = 'schedule_state'
+    __table_args__ = (
+        Index('ix_schedule_state_next_due_at', 'next_due_at'),
+    )
+    
+    source = Column(String(100), primary_key=True)
+    query = Column(String(200), primary_key=True)
+    location = Column(String(100), primary_key=True)
+    interval_s = Column(Integer, nullable=False)
+    next_due_at = Column(DateTime, nullable=False)
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_success_at = Column(DateTime)
+    last_status = Column(String(20))  # done, failed
+    last_jobs = Column(Integer)
+    failures = Column(Integer, nullable=False, default=0)  # Échecs consécutifs
+    last_error = Column(Text)
+
+
+class ScrapeTask(Base):
+    """Tâche de la file de scraping: une unité (source, requête, pays, lieu) d'un run."""
+    __tablename__ = 'scrape_tasks'
+    __table_args__ = (
+        UniqueConstraint('run_id', 'source', 'query', 'country', 'location'),
+        Index('ix_scrape_tasks_status_available', 'status', 'available_at'),
+        Index('ix_scrape_tasks_status_lease', 'status', 'lease_expires_at'),
+        Index('ix_scrape_tasks_source_query', 'source', 'query', 'finished_at'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, nullable=False)
+    source = Column(String(100), nullable=False)
+    query = Column(String(200), nullable=False)
+    country = Column(String(100), nullable=False)
+    location = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending, leased, done, failed, interrupted
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    available_at = Column(DateTime, nullable=False)  # Reprise différée après un échec
+    worker = Column(String(100))
+    lease_expires_at = Column(DateTime)  # Prolongé par les heartbeats du worker
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    jobs = Column(Integer, nullable=False, default=0)
+    valid = Column(Integer, nullable=False, default=0)
+    added = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)  # Requêtes HTTP, cumulées sur les tentatives
+    error = Column(Text)
+
+
+# Index créés par scraper/migrations.py (déclarés ici pour refléter le schéma)
+Index('ix_jobs_published_day', func.date(Job.published_date))
+Index('ix_jobs_category_source_applied', Job.role_category, Job.source, Job.applied, Job.published_date)
+Index('ix_jobs_source_published_date', Job.source, Job.published_date)
+
+
+# Table des offres archivées (base SQLite séparée, attachée sous le nom "archive")
+archive_jobs = Table(
+    'jobs', MetaData(schema='archive'),
+    *[Column(column.name, column.type) for column in Job.__table__.columns],
+    Column('archived_at', DateTime)
+)
+# Descriptions et compétences des offres archivées (déplacées avec l'offre, restaurées si elle réapparaît)
+archive_descriptions = Table(
+    'job_descriptions', MetaData(schema='archive'),
+    *[Column(column.name, column.type) for column in JobDescription.__table__.columns]
+)
+archive_skills = Table(
+    'job_skills', MetaData(schema='archive'),
+    *[Column(column.name, column.type) for column in JobSkill.__table__.columns]
+)
+
+
+def _configure_sqlite(engine: Engine, archive_path: str):
+    """
+    Laisse SQLAlchemy gérer les transactions au lieu du module sqlite3.
+    
+    Par défaut, pysqlite n'ouvre pas de transaction avant les instructions DDL,
+    ce qui rendrait les migrations non atomiques. Chaque connexion attache aussi
+    la base d'archive pour permettre les lectures unifiées.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # WAL: les lecteurs (dashboard) ne bloquent pas l'écrivain du pipeline, et inversement
+        dbapi_connection.execute("PRAGMA journal_mode = WAL")
+        dbapi_connection.execute("PRAGMA synchronous = NORMAL")
+        # Sans effet sur une base existante tant qu'un VACUUM complet n'a pas eu lieu
+        dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        dbapi_connection.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+    
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        # execution_options(sqlite_begin='BEGIN IMMEDIATE') prend le verrou d'écriture dès le début
+        conn.exec_driver_sql(conn.get_execution_options().get('sqlite_begin', 'BEGIN'))
+
+
+def _epoch(value: datetime) -> int:
+    """Convertit une date UTC naïve en secondes epoch (encodage des apparitions)."""
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+# Curseur de pagination par clé: (published_date, id) de la dernière ligne lue
+JobCursor = Tuple[Optional[datetime], int]
+
+# Statuts d'un run qui détiennent le verrou (un seul à la fois, index ux_scrape_runs_active)
+ACTIVE_RUN_STATUSES = ('queued', 'running')
+
+# Tris proposés par query_jobs ('relevance' nécessite un filtre 'search')
+SORT_COLUMNS = ('published_date', 'scraped_at', 'company', 'job_title', 'relevance')
+
+# Pondération bm25 des colonnes de jobs_fts (titre prioritaire)
+FTS_RANK = "bm25(jobs_fts, 10.0, 5.0, 1.0, 2.0, 1.0)"
+
+
 class DatabaseManager:
     """Gestionnaire de base de données."""
     
-    def __init__(self, db_path: str = DATABASE_PATH):
-        """Initialise la connexion à la base de données."""
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
-        Base.metadata.create_all(self.engine)
+    def __init__(self, db_path: str = DATABASE_PATH, archive_path: Optional[str] = None):
+        """
+        Initialise la connexion à la base de données et applique les migrations.
+        
+        Args:
+            db_path: Base principale (offres récentes)
+            archive_path: Base d'archive (par défaut: <db_path>_archive.db)
+        """
+        self.db_path = db_path
+        self.archive_path = archive_path or f"{os.path.splitext(db_path)[0]}_archive.db"
+        self.engine = create_engine(f'sqlite:///{db_path}', echo=False, connect_args={'timeout': 30})
+        _configure_sqlite(self.engine, self.archive_path)
+        run_migrations(self.engine)
+        self._create_archive_schema()
         self.SessionLocal = sessionmaker(bind=self.engine)
+        # Codecs des descriptions par dictionnaire (ou par codec sans dictionnaire), chargés à la demande
+        self._codecs: Dict[object, DescriptionCodec] = {}
+    
+    def _create_archive_schema(self):
+        """Crée la table d'archive si besoin (la base d'archive peut être recréée à tout moment)."""
+        columns = ', '.join(f'{column.name} {column.type.compile(self.engine.dialect)}' for column in archive_jobs.columns)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS archive.jobs ({columns}, PRIMARY KEY (id), UNIQUE (url))")
+            conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS archive.ix_jobs_published_date ON jobs (published_date)")
+            conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS archive.ix_jobs_scraped_at ON jobs (scraped_at)")
+            for table, key in ((archive_descriptions, 'job_id'), (archive_skills, 'job_id, skill_id')):
+                columns = ', '.join(f'{column.name} {column.type.compile(self.engine.dialect)}' for column in table.columns)
+                conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS archive.{table.name} ({columns}, PRIMARY KEY ({key}))")
     
     def get_session(self) -> Session:
         """Retourne une nouvelle session."""
@@ -67,11 +359,17 @@ class DatabaseManager:
         Returns:
             (is_new, is_updated): True si nouvelle offre, True si mise à jour
         """
+        _, is_new, is_updated = self._upsert_job(session, job_data)
+        self._bump_data_version(session)
+        return is_new, is_updated
+    
+    def _upsert_job(self, session: Session, job_data: Dict) -> Tuple[Job, bool, bool]:
+        """Insère ou met à jour une offre et retourne l'objet Job correspondant."""
         url = job_data.get('url')
         
         if url:
-            # Chercher par URL
-            existing = session.query(Job).filter_by(url=url).first()
+            # Chercher par URL, puis dans l'archive (offre revue après son archivage)
+            existing = session.query(Job).filter_by(url=url).first() or self._restore_archived_job(session, url)
         else:
             # Si pas d'URL, chercher par hash (title + company + date)
             existing = session.query(Job).filter_by(
@@ -91,7 +389,7 @@ class DatabaseManager:
                 if value and not getattr(existing, key):
                     setattr(existing, key, value)
                     updated = True
-            return False, updated
+            return existing, False, updated
         else:
             # Nouvelle offre
             # S'assurer que scraped_at est défini si non présent
@@ -99,21 +397,70 @@ class DatabaseManager:
                 job_data['scraped_at'] = datetime.utcnow()
             job = Job(**job_data)
             session.add(job)
-            return True, False
+            return job, True, False
     
-    def bulk_upsert(self, jobs_data: List[Dict]) -> Dict[str, int]:
+    def _restore_archived_job(self, session: Session, url: str) -> Optional[Job]:
+        """
+        Ramène une offre archivée dans jobs, avec sa description et ses compétences.
+        
+        L'identifiant d'origine est conservé (sauf s'il a été réattribué): l'historique des
+        apparitions et le statut de candidature restent ceux de l'offre archivée.
+        
+        Returns:
+            Offre restaurée, ou None si l'URL n'est pas dans l'archive
+        """
+        row = session.execute(select(archive_jobs).where(archive_jobs.c.url == url)).mappings().first()
+        if row is None:
+            return None
+        table = Job.__table__
+        values = {column.name: row[column.name] for column in table.columns}
+        if session.execute(select(table.c.id).where(table.c.id == row['id'])).first() is not None:
+            values['id'] = session.execute(select(func.max(table.c.id))).scalar() + 1
+        session.execute(table.insert().values(values))
+        
+        # Les lignes filles suivent l'offre (sous son nouvel identifiant le cas échéant)
+        for cold, hot in ((archive_descriptions, JobDescription.__table__), (archive_skills, JobSkill.__table__)):
+            columns = [column.name for column in hot.columns]
+            session.execute(hot.insert().prefix_with('OR REPLACE').from_select(columns, select(*[
+                literal(values['id']).label(name) if name == 'job_id' else cold.c[name] for name in columns
+            ]).where(cold.c.job_id == row['id'])))
+            session.execute(cold.delete().where(cold.c.job_id == row['id']))
+        session.execute(archive_jobs.delete().where(archive_jobs.c.id == row['id']))
+        
+        job = session.get(Job, values['id'])
+        self._sync_job_keywords(session, [job])
+        return job
+    
+    def bulk_upsert(self, jobs_data: List[Dict], run_id: Optional[int] = None) -> Dict[str, int]:
         """
         Insère ou met à jour plusieurs offres en masse.
         
+        Args:
+            jobs_data: Offres à enregistrer
+            run_id: Run de scraping; si fourni, une apparition est enregistrée par offre
+        
         Returns:
             Statistiques: {'added': int, 'updated': int, 'skipped': int}
         """
         session = self.get_session()
         stats = {'added': 0, 'updated': 0, 'skipped': 0}
+        keyword_jobs = []
+        skill_jobs = []
+        sightings = []
         
         try:
+            # Verrou d'écriture pris dès le début: avec plusieurs écrivains (workers de la file),
+            # une transaction qui lit avant d'écrire échouerait ("database is locked") au lieu d'attendre
+            session.connection(execution_options={'sqlite_begin': 'BEGIN IMMEDIATE'})
             for job_data in jobs_data:
-                is_new, is_updated = self.upsert_job(session, job_data)
+                source = job_data.get('source')
+                job, is_new, is_updated = self._upsert_job(session, job_data)
+                sightings.append((job, source))
+                # L'historique est lu avant le prochain autoflush
+                if inspect(job).attrs.detected_keywords.history.has_changes():
+                    keyword_jobs.append(job)
+                if any(inspect(job).attrs[name].history.has_changes() for name in ('job_title', 'snippet')):
+                    skill_jobs.append(job)
                 if is_new:
                     stats['added'] += 1
                 elif is_updated:
@@ -121,6 +468,13 @@ class DatabaseManager:
                 else:
                     stats['skipped'] += 1
             
+            session.flush()
+            self._sync_job_keywords(session, keyword_jobs)
+            self._sync_job_skills(session, [(job.id, job.job_title, job.snippet) for job in skill_jobs])
+            if run_id is not None:
+                self._record_sightings(session, run_id, sightings)
+            if jobs_data:
+                self._bump_data_version(session)
             session.commit()
         except Exception as e:
             session.rollback()
@@ -130,6 +484,1045 @@ class DatabaseManager:
         
         return stats
     
+    def _bump_data_version(self, conn):
+        """Incrémente la version des données dans la transaction en cours (session ou connexion)."""
+        table = DbMeta.__table__
+        conn.execute(table.update().where(table.c.key == 'data_version').values(value=table.c.value + 1))
+    
+    def get_data_version(self) -> int:
+        """
+        Version des données, incrémentée à chaque écriture (upsert, statut, archivage, purge).
+        
+        Lecture d'une ligne par clé primaire: sert de clé de cache aux lecteurs,
+        y compris pour les écritures faites par un autre processus (CLI).
+        """
+        table = DbMeta.__table__
+        with self.engine.connect() as conn:
+            return conn.execute(select(table.c.value).where(table.c.key == 'data_version')).scalar() or 0
+    
+    def _sync_job_keywords(self, session: Session, jobs: List[Job]):
+        """Réécrit les lignes job_keywords des offres dont les mots-clés ont changé."""
+        if not jobs:
+            return
+        keywords_by_job = {job.id: split_keywords(job.detected_keywords) for job in jobs}
+        names = sorted({name for keywords in keywords_by_job.values() for name in keywords})
+        
+        keyword_table = Keyword.__table__
+        link_table = JobKeyword.__table__
+        if names:
+            session.execute(keyword_table.insert().prefix_with('OR IGNORE'), [{'name': name} for name in names])
+        keyword_ids = dict(session.execute(
+            select(keyword_table.c.name, keyword_table.c.id).where(keyword_table.c.name.in_(names))
+        ).all()) if names else {}
+        
+        session.execute(link_table.delete().where(link_table.c.job_id.in_(list(keywords_by_job))))
+        links = [
+            {'job_id': job_id, 'keyword_id': keyword_ids[name]}
+            for job_id, keywords in keywords_by_job.items()
+            for name in keywords
+        ]
+        if links:
+            session.execute(link_table.insert().prefix_with('OR IGNORE'), links)
+    
+    def _skill_ids(self, conn, names: List[str]) -> Dict[str, int]:
+        """Identifiant de chaque compétence (créée si besoin, avec sa famille)."""
+        table = Skill.__table__
+        names = sorted(set(names))
+        if not names:
+            return {}
+        families = get_matcher().families
+        conn.execute(table.insert().prefix_with('OR IGNORE'),
+                     [{'name': name, 'family': families.get(name, '')} for name in names])
+        return dict(conn.execute(select(table.c.name, table.c.id).where(table.c.name.in_(names))).all())
+    
+    def _load_descriptions(self, conn, job_ids: List[int], table=None) -> Dict[int, str]:
+        """Descriptions décompressées des offres qui en ont une (job_descriptions ou son archive)."""
+        table = JobDescription.__table__ if table is None else table
+        rows = conn.execute(
+            select(table.c.job_id, table.c.codec, table.c.dict_id, table.c.body).where(table.c.job_id.in_(job_ids))
+        ).all() if job_ids else []
+        return {row.job_id: self._codec(row.dict_id, row.codec).decompress(row.body) for row in rows}
+    
+    def _sync_job_skills(self, conn, jobs: List[Tuple[int, str, str]], descriptions: Optional[Dict[int, str]] = None,
+                         archived: bool = False) -> int:
+        """
+        Réécrit les lignes job_skills d'offres (id, titre, extrait), analysées avec leur description.
+        
+        Args:
+            conn: Session ou connexion, dans la transaction en cours
+            descriptions: Descriptions connues (les autres sont lues dans job_descriptions)
+            archived: Offres de l'archive (tables job_skills et job_descriptions de l'archive)
+        
+        Returns:
+            Nombre de lignes job_skills écrites
+        """
+        if not jobs:
+            return 0
+        job_ids = [job_id for job_id, _, _ in jobs]
+        descriptions = dict(descriptions or {})
+        descriptions.update(self._load_descriptions(
+            conn, [job_id for job_id in job_ids if job_id not in descriptions],
+            archive_descriptions if archived else None
+        ))
+        found = get_matcher().extract_batch(
+            (title, snippet, descriptions.get(job_id)) for job_id, title, snippet in jobs
+        )
+        skill_ids = self._skill_ids(conn, [name for skills in found for name in skills])
+        
+        link_table = archive_skills if archived else JobSkill.__table__
+        conn.execute(link_table.delete().where(link_table.c.job_id.in_(job_ids)))
+        links = [
+            {'job_id': job_id, 'skill_id': skill_ids[name], 'in_title': in_title}
+            for job_id, skills in zip(job_ids, found)
+            for name, in_title in skills.items()
+        ]
+        if links:
+            conn.execute(link_table.insert(), links)
+        return len(links)
+    
+    def skills_outdated(self) -> bool:
+        """True si les compétences ont été extraites avec une autre taxonomie (ou jamais)."""
+        table = DbMeta.__table__
+        with self.engine.connect() as conn:
+            stored = conn.execute(select(table.c.value).where(table.c.key == 'skills_taxonomy')).scalar()
+        return stored != get_matcher().fingerprint
+    
+    def refresh_skills(self, batch_size: int = 2000) -> Dict:
+        """
+        Réanalyse les compétences de toutes les offres (titre, extrait, description), par lots.
+        
+        Les offres archivées sont réanalysées aussi: le filtre par compétence les lit dans
+        les lignes job_skills de l'archive. Les compétences retirées de la taxonomie sont supprimées, la famille des autres mise à
+        jour; l'empreinte de la taxonomie est enregistrée (voir skills_outdated).
+        
+        Returns:
+            jobs, links (lignes job_skills), skills (compétences citées), seconds
+        """
+        start = time.perf_counter()
+        matcher = get_matcher()
+        skill_table = Skill.__table__
+        meta = DbMeta.__table__
+        total_jobs = total_links = 0
+        for jobs_table, archived in ((Job.__table__, False), (archive_jobs, True)):
+            last_id = -1
+            while True:
+                with self.engine.connect() as conn:
+                    conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+                    with conn.begin():
+                        batch = conn.execute(
+                            select(jobs_table.c.id, jobs_table.c.job_title, jobs_table.c.snippet)
+                            .where(jobs_table.c.id > last_id).order_by(jobs_table.c.id).limit(batch_size)
+                        ).all()
+                        if not batch:
+                            break
+                        total_links += self._sync_job_skills(conn, [tuple(row) for row in batch], archived=archived)
+                total_jobs += len(batch)
+                last_id = batch[-1].id
+        
+        with self.engine.begin() as conn:
+            for name, family in matcher.families.items():
+                conn.execute(skill_table.update().where(skill_table.c.name == name).values(family=family))
+            removed = select(skill_table.c.id).where(skill_table.c.name.not_in(list(matcher.families)))
+            conn.execute(archive_skills.delete().where(archive_skills.c.skill_id.in_(removed)))
+            conn.execute(skill_table.delete().where(skill_table.c.name.not_in(list(matcher.families))))
+            conn.execute(meta.insert().prefix_with('OR REPLACE').values(key='skills_taxonomy', value=matcher.fingerprint))
+            cited = conn.execute(select(func.count(func.distinct(JobSkill.__table__.c.skill_id)))).scalar()
+            self._bump_data_version(conn)
+        return {'jobs': total_jobs, 'links': total_links, 'skills': cited,
+                'seconds': round(time.perf_counter() - start, 1)}
+    
+    def _source_ids(self, session: Session, names: List[str]) -> Dict[str, int]:
+        """Retourne l'identifiant entier de chaque source (créé si besoin)."""
+        table = SourceName.__table__
+        names = sorted(set(names))
+        if not names:
+            return {}
+        session.execute(table.insert().prefix_with('OR IGNORE'), [{'name': name} for name in names])
+        return dict(session.execute(select(table.c.name, table.c.id).where(table.c.name.in_(names))).all())
+    
+    def _record_sightings(self, session: Session, run_id: int, sightings: List[Tuple[Job, str]]):
+        """Ajoute une apparition (job, run, source, instant) par offre vue dans ce lot."""
+        source_ids = self._source_ids(session, [source for _, source in sightings if source])
+        seen_at = _epoch(datetime.utcnow())
+        rows = [
+            {'job_id': job.id, 'run_id': run_id, 'source_id': source_ids[source], 'seen_at': seen_at}
+            for job, source in sightings if source
+        ]
+        if rows:
+            session.execute(JobSighting.__table__.insert().prefix_with('OR IGNORE'), rows)
+    
+    def start_run(self, status: str = 'running', pid: Optional[int] = None, progress: Optional[Dict] = None,
+                  params: Optional[Dict] = None, resume: bool = False) -> Optional[int]:
+        """
+        Enregistre un nouveau run de scraping s'il n'y en a pas déjà un actif.
+        
+        La vérification et l'insertion se font dans une transaction BEGIN IMMEDIATE:
+        deux processus ne peuvent pas démarrer de run en même temps. Les runs interrompus
+        sont d'abord marqués en échec (voir reclaim_stale_runs).
+        
+        Args:
+            status: 'queued' (créé par l'application, en attente du CLI) ou 'running'
+            pid: Processus qui exécute le run
+            progress: Progression initiale par source
+            params: Paramètres du run (clé de reprise)
+            resume: Si le dernier run lancé avec les mêmes paramètres a échoué il y a moins de
+                RESUME_MAX_HOURS heures, il est rouvert au lieu d'en créer un nouveau
+        
+        Returns:
+            Identifiant du run (nouveau ou repris), ou None si un autre run est déjà actif
+        """
+        table = ScrapeRun.__table__
+        now = datetime.utcnow()
+        active = table.c.status.in_(ACTIVE_RUN_STATUSES)
+        encoded_params = json.dumps(params, sort_keys=True) if params is not None else None
+        values = {'heartbeat_at': now, 'status': status, 'pid': pid,
+                  'progress': json.dumps(progress) if progress is not None else None}
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                self._fail_runs(conn, self._stale_run_ids(conn, now), now, "Processus interrompu (heartbeat perdu)")
+                if conn.execute(select(table.c.id).where(active).limit(1)).first():
+                    return None
+                if resume and encoded_params is not None:
+                    previous = conn.execute(select(table.c.id, table.c.status).where(
+                        table.c.params == encoded_params,
+                        table.c.started_at >= now - timedelta(hours=RESUME_MAX_HOURS)
+                    ).order_by(table.c.id.desc()).limit(1)).first()
+                    if previous is not None and previous.status == 'failed':
+                        conn.execute(table.update().where(table.c.id == previous.id).values(
+                            finished_at=None, error=None, **values
+                        ))
+                        self._release_checkpoints(conn, [previous.id], now)
+                        return previous.id
+                return conn.execute(table.insert().values(
+                    started_at=now, params=encoded_params, **values
+                )).inserted_primary_key[0]
+    
+    def reclaim_stale_runs(self) -> List[int]:
+        """
+        Marque en échec les runs actifs interrompus (libère le verrou).
+        
+        Un run est interrompu si son heartbeat date de plus de STALE_RUN_SECONDS et qu'il n'a
+        plus de tâche en attente ou sous un bail valide (un run de la file attend ses workers
+        sans heartbeat, ses tâches portent son état), ou si son pipeline tournait sur cette
+        machine et que le processus n'existe plus. La recherche se fait en lecture: le verrou
+        d'écriture n'est pris que s'il y a un run à clore (l'application l'appelle à chaque rerun).
+        
+        Returns:
+            Identifiants des runs marqués en échec
+        """
+        now = datetime.utcnow()
+        with self.engine.connect() as conn:
+            if not self._stale_run_ids(conn, now):
+                return []
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                stale_ids = self._stale_run_ids(conn, now)
+                self._fail_runs(conn, stale_ids, now, "Processus interrompu (heartbeat perdu)")
+        return stale_ids
+    
+    def abandon_run(self, run_id: int, error: str) -> bool:
+        """
+        Marque un run en échec s'il est encore actif (processus du CLI terminé sans le clore).
+        
+        Returns:
+            True si le run était encore actif
+        """
+        table = ScrapeRun.__table__
+        now = datetime.utcnow()
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                active = conn.execute(select(table.c.id).where(
+                    table.c.id == run_id, table.c.status.in_(ACTIVE_RUN_STATUSES)
+                )).first() is not None
+                if active:
+                    self._fail_runs(conn, [run_id], now, error)
+        return active
+    
+    def _stale_run_ids(self, conn, now: datetime) -> List[int]:
+        """Runs actifs interrompus (voir reclaim_stale_runs)."""
+        table = ScrapeRun.__table__
+        tasks = ScrapeTask.__table__
+        live_tasks = exists().where(tasks.c.run_id == table.c.id, or_(
+            tasks.c.status == 'pending', and_(tasks.c.status == 'leased', tasks.c.lease_expires_at >= now)
+        ))
+        stale = and_(
+            func.coalesce(table.c.heartbeat_at, table.c.started_at) < now - timedelta(seconds=STALE_RUN_SECONDS),
+            ~live_tasks
+        )
+        return conn.execute(select(table.c.id).where(
+            table.c.status.in_(ACTIVE_RUN_STATUSES), or_(stale, table.c.id.in_(self._dead_pipeline_runs(conn)))
+        )).scalars().all()
+    
+    def _fail_runs(self, conn, run_ids: List[int], now: datetime, error: str):
+        """Marque des runs en échec et libère leurs points de reprise."""
+        if not run_ids:
+            return
+        table = ScrapeRun.__table__
+        conn.execute(table.update().where(table.c.id.in_(run_ids)).values(
+            status='failed', finished_at=now, error=error
+        ))
+        self._release_checkpoints(conn, run_ids, now)
+    
+    @staticmethod
+    def _dead_pipeline_runs(conn) -> List[int]:
+        """Runs actifs dont un point de reprise est tenu par un pipeline de cette machine qui n'existe plus."""
+        tasks = ScrapeTask.__table__
+        runs = ScrapeRun.__table__
+        prefix = f"pipeline:{socket.gethostname()}:"
+        rows = conn.execute(select(tasks.c.run_id, tasks.c.worker).join(runs, runs.c.id == tasks.c.run_id).where(
+            runs.c.status.in_(ACTIVE_RUN_STATUSES), tasks.c.status == 'leased',
+            tasks.c.lease_expires_at.is_(None), tasks.c.worker.like(prefix + '%')
+        )).all()
+        return sorted({
+            run_id for run_id, worker in rows
+            if worker.startswith(prefix) and worker[len(prefix):].isdigit() and not pid_alive(int(worker[len(prefix):]))
+        })
+    
+    @staticmethod
+    def _release_checkpoints(conn, run_ids: List[int], now: datetime):
+        """
+        Libère les points de reprise réservés sans bail par un pipeline interrompu.
+        
+        Le pipeline réserve ses unités sans expiration (il n'y a pas de heartbeat de tâche):
+        sans cela, rien ne les libérerait. Ils passent à l'état 'interrupted', que seul
+        start_task (reprise du run par le pipeline) relance: les workers de la file ne les
+        prennent jamais.
+        """
+        tasks = ScrapeTask.__table__
+        conn.execute(tasks.update().where(
+            tasks.c.run_id.in_(run_ids), tasks.c.status == 'leased', tasks.c.lease_expires_at.is_(None)
+        ).values(status='interrupted', worker=None, finished_at=now, error="Processus interrompu"))
+    
+    def claim_run(self, run_id: int, pid: int, progress: Optional[Dict] = None, params: Optional[Dict] = None) -> bool:
+        """Passe un run en attente à l'état 'running' pour le processus pid."""
+        table = ScrapeRun.__table__
+        values = {'progress': json.dumps(progress)} if progress is not None else {}
+        if params is not None:
+            values['params'] = json.dumps(params, sort_keys=True)
+        with self.engine.begin() as conn:
+            return conn.execute(table.update().where(table.c.id == run_id, table.c.status == 'queued').values(
+                status='running', pid=pid, heartbeat_at=datetime.utcnow(), **values
+            )).rowcount == 1
+    
+    def update_run(self, run_id: int, progress: Optional[Dict] = None, **values):
+        """
+        Met à jour la progression d'un run et son heartbeat.
+        
+        Args:
+            progress: Progression par source (sérialisée en JSON)
+            values: Autres colonnes de scrape_runs (current_source, jobs_scraped, jobs_added...)
+        """
+        table = ScrapeRun.__table__
+        if progress is not None:
+            values['progress'] = json.dumps(progress)
+        with self.engine.begin() as conn:
+            conn.execute(table.update().where(table.c.id == run_id).values(heartbeat_at=datetime.utcnow(), **values))
+    
+    def finish_run(self, run_id: int, status: str = 'succeeded', error: Optional[str] = None, **values):
+        """Enregistre la fin d'un run de scraping (libère le verrou)."""
+        self.update_run(run_id, status=status, error=error, finished_at=datetime.utcnow(),
+                        current_source=None, **values)
+    
+    def get_run(self, run_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Retourne un run de scraping (le plus récent si run_id est omis), progression décodée.
+        """
+        table = ScrapeRun.__table__
+        statement = select(table)
+        statement = statement.where(table.c.id == run_id) if run_id is not None else statement.order_by(table.c.id.desc())
+        with self.engine.connect() as conn:
+            row = conn.execute(statement.limit(1)).mappings().first()
+        if row is None:
+            return None
+        run = dict(row)
+        run['progress'] = json.loads(run['progress']) if run['progress'] else {}
+        return run
+    
+    def enqueue_tasks(self, run_id: int, tasks: List[Dict], max_attempts: int = TASK_MAX_ATTEMPTS) -> int:
+        """
+        Ajoute les tâches d'un run à la file (les doublons d'un même run sont ignorés).
+        
+        Args:
+            tasks: Dictionnaires source, query, country, location
+        
+        Returns:
+            Nombre de tâches ajoutées
+        """
+        if not tasks:
+            return 0
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            return conn.execute(ScrapeTask.__table__.insert().prefix_with('OR IGNORE'), [
+                {**task, 'run_id': run_id, 'status': 'pending', 'attempts': 0, 'max_attempts': max_attempts,
+                 'available_at': now, 'jobs': 0, 'valid': 0, 'added': 0, 'updated': 0, 'requests': 0}
+                for task in tasks
+            ]).rowcount
+    
+    def start_task(self, run_id: int, source: str, query: str, country: str, location: str, worker: str) -> int:
+        """
+        Enregistre le début d'une unité exécutée par le pipeline (point de reprise).
+        
+        La tâche est réservée sans bail (jamais reprise par les workers de la file); une
+        tâche existante du même run (run repris, unité 'interrupted' comprise) est réutilisée.
+        
+        Returns:
+            Identifiant de la tâche
+        """
+        table = ScrapeTask.__table__
+        now = datetime.utcnow()
+        key = and_(table.c.run_id == run_id, table.c.source == source, table.c.query == query,
+                   table.c.country == country, table.c.location == location)
+        with self.engine.begin() as conn:
+            started = conn.execute(table.update().where(key).values(
+                status='leased', attempts=table.c.attempts + 1, worker=worker, lease_expires_at=None,
+                started_at=now, finished_at=None, error=None
+            )).rowcount
+            if started:
+                return conn.execute(select(table.c.id).where(key)).scalar()
+            return conn.execute(table.insert().values(
+                run_id=run_id, source=source, query=query, country=country, location=location,
+                status='leased', attempts=1, max_attempts=1, available_at=now, worker=worker, started_at=now,
+                jobs=0, valid=0, added=0, updated=0
+            )).inserted_primary_key[0]
+    
+    def get_run_tasks(self, run_id: int) -> List[Dict]:
+        """Tâches d'un run (file ou points de reprise du pipeline)."""
+        table = ScrapeTask.__table__
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(
+                select(table).where(table.c.run_id == run_id).order_by(table.c.id)
+            ).mappings()]
+    
+    def claim_task(self, worker: str, lease_seconds: int = TASK_LEASE_SECONDS) -> Optional[Dict]:
+        """
+        Prend la prochaine tâche disponible et la réserve pour lease_seconds secondes.
+        
+        Les tâches disponibles sont celles en attente (pending) ou dont le bail a expiré
+        (worker mort). Une tâche au bail expiré qui a épuisé ses tentatives passe en échec.
+        La sélection et la réservation se font dans une transaction BEGIN IMMEDIATE: deux
+        workers ne peuvent pas prendre la même tâche.
+        
+        Returns:
+            Tâche réservée (attempts incrémenté), ou None si la file est vide
+        """
+        table = ScrapeTask.__table__
+        now = datetime.utcnow()
+        expired = and_(table.c.status == 'leased', table.c.lease_expires_at < now)
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                conn.execute(table.update().where(expired, table.c.attempts >= table.c.max_attempts).values(
+                    status='failed', finished_at=now, error="Bail expiré (worker interrompu)"
+                ))
+                row = conn.execute(select(table).where(or_(
+                    and_(table.c.status == 'pending', table.c.available_at <= now), expired
+                )).order_by(table.c.id).limit(1)).mappings().first()
+                if row is None:
+                    return None
+                values = {'status': 'leased', 'attempts': row['attempts'] + 1, 'worker': worker,
+                          'lease_expires_at': now + timedelta(seconds=lease_seconds), 'started_at': now}
+                conn.execute(table.update().where(table.c.id == row['id']).values(**values))
+                # Le premier worker fait passer le run en attente à l'état 'running'
+                runs = ScrapeRun.__table__
+                conn.execute(runs.update().where(runs.c.id == row['run_id'], runs.c.status == 'queued').values(
+                    status='running', heartbeat_at=now
+                ))
+        return {**dict(row), **values}
+    
+    def heartbeat_task(self, task_id: int, worker: str, lease_seconds: int = TASK_LEASE_SECONDS) -> bool:
+        """
+        Prolonge le bail d'une tâche (et le heartbeat de son run).
+        
+        Returns:
+            False si la tâche n'appartient plus à ce worker (bail expiré et repris)
+        """
+        table = ScrapeTask.__table__
+        runs = ScrapeRun.__table__
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            owned = conn.execute(table.update().where(
+                table.c.id == task_id, table.c.worker == worker, table.c.status == 'leased'
+            ).values(lease_expires_at=now + timedelta(seconds=lease_seconds))).rowcount == 1
+            if owned:
+                conn.execute(runs.update().where(
+                    runs.c.id == select(table.c.run_id).where(table.c.id == task_id).scalar_subquery()
+                ).values(heartbeat_at=now))
+        return owned
+    
+    def complete_task(self, task_id: int, worker: str, jobs: int = 0, valid: int = 0,
+                      added: int = 0, updated: int = 0, requests: int = 0) -> bool:
+        """Marque une tâche terminée (ignoré si le bail a été repris par un autre worker)."""
+        table = ScrapeTask.__table__
+        with self.engine.begin() as conn:
+            return conn.execute(table.update().where(
+                table.c.id == task_id, table.c.worker == worker, table.c.status == 'leased'
+            ).values(status='done', finished_at=datetime.utcnow(), lease_expires_at=None, error=None,
+                     jobs=jobs, valid=valid, added=added, updated=updated,
+                     requests=table.c.requests + requests)).rowcount == 1
+    
+    def fail_task(self, task_id: int, worker: str, error: str, retry_delay: float = 0, requests: int = 0) -> Optional[str]:
+        """
+        Enregistre l'échec d'une tâche: elle est remise en attente après retry_delay secondes
+        tant qu'il reste des tentatives, puis passe en échec. Les requêtes de la tentative
+        s'ajoutent au coût de la tâche.
+        
+        Returns:
+            Nouveau statut ('pending' ou 'failed'), None si le bail a été repris par un autre worker
+        """
+        table = ScrapeTask.__table__
+        now = datetime.utcnow()
+        retry = table.c.attempts < table.c.max_attempts
+        with self.engine.begin() as conn:
+            updated = conn.execute(table.update().where(
+                table.c.id == task_id, table.c.worker == worker, table.c.status == 'leased'
+            ).values(
+                status=case((retry, 'pending'), else_='failed'),
+                available_at=now + timedelta(seconds=retry_delay),
+                finished_at=case((retry, None), else_=now),
+                lease_expires_at=None, error=error, requests=table.c.requests + requests
+            )).rowcount == 1
+            if not updated:
+                return None
+            return conn.execute(select(table.c.status).where(table.c.id == task_id)).scalar()
+    
+    def requeue_failed_tasks(self, run_id: int) -> Optional[int]:
+        """
+        Remet en file les tâches en échec d'un run terminé (tentatives remises à zéro).
+        
+        Le run repasse en attente: il reprend le verrou des runs.
+        
+        Returns:
+            Nombre de tâches remises en file, ou None si un autre run est actif
+        """
+        tasks = ScrapeTask.__table__
+        runs = ScrapeRun.__table__
+        now = datetime.utcnow()
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                if conn.execute(select(runs.c.id).where(runs.c.status.in_(ACTIVE_RUN_STATUSES)).limit(1)).first():
+                    return None
+                count = conn.execute(tasks.update().where(tasks.c.run_id == run_id, tasks.c.status == 'failed').values(
+                    status='pending', attempts=0, available_at=now, worker=None, finished_at=None, error=None
+                )).rowcount
+                if count:
+                    conn.execute(runs.update().where(runs.c.id == run_id).values(
+                        status='queued', heartbeat_at=now, finished_at=None, error=None
+                    ))
+                return count
+    
+    def get_task_counts(self, run_id: Optional[int] = None) -> Dict[str, int]:
+        """Nombre de tâches par statut (pour un run, ou toute la file)."""
+        table = ScrapeTask.__table__
+        statement = select(table.c.status, func.count()).group_by(table.c.status)
+        if run_id is not None:
+            statement = statement.where(table.c.run_id == run_id)
+        with self.engine.connect() as conn:
+            return {status: count for status, count in conn.execute(statement)}
+    
+    def next_task_at(self) -> Optional[datetime]:
+        """Instant où la prochaine tâche en attente sera disponible (None si aucune n'est en attente)."""
+        table = ScrapeTask.__table__
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.min(table.c.available_at)).where(table.c.status == 'pending')).scalar()
+    
+    def sync_task_run(self, run_id: int, current_source: Optional[str] = None) -> Optional[Dict]:
+        """
+        Recalcule la progression et les compteurs d'un run de la file depuis ses tâches.
+        
+        Quand plus aucune tâche n'est en attente ou en cours, le run est terminé ('succeeded',
+        ou 'failed' si des tâches ont échoué). Le calcul et la clôture se font dans une même
+        transaction BEGIN IMMEDIATE: un seul worker clôt le run.
+        
+        Returns:
+            Compteurs du run s'il vient d'être clos par cet appel, sinon None
+        """
+        tasks = ScrapeTask.__table__
+        runs = ScrapeRun.__table__
+        now = datetime.utcnow()
+        with self.engine.connect() as conn:
+            conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+            with conn.begin():
+                rows = conn.execute(select(tasks).where(tasks.c.run_id == run_id).order_by(tasks.c.id)).mappings().all()
+                progress = {}
+                for row in rows:
+                    entry = {'status': 'running' if row['status'] == 'leased' else row['status']}
+                    if row['status'] == 'done':
+                        entry.update(jobs=row['jobs'], valid=row['valid'])
+                    elif row['error']:
+                        entry['error'] = row['error']
+                    progress[f"{row['source']} · {row['query']} · {row['location']}"] = entry
+                totals = {
+                    'jobs_scraped': sum(row['jobs'] for row in rows),
+                    'jobs_added': sum(row['added'] for row in rows),
+                    'jobs_updated': sum(row['updated'] for row in rows),
+                }
+                values = {'progress': json.dumps(progress), 'heartbeat_at': now, 'current_source': current_source, **totals}
+                
+                remaining = sum(1 for row in rows if row['status'] in ('pending', 'leased'))
+                failed = sum(1 for row in rows if row['status'] == 'failed')
+                closing = remaining == 0 and bool(rows)
+                if closing:
+                    values.update(status='failed' if failed else 'succeeded', finished_at=now, current_source=None,
+                                  error=f"{failed} tâches en échec" if failed else None)
+                closed = conn.execute(runs.update().where(
+                    runs.c.id == run_id, runs.c.status.in_(ACTIVE_RUN_STATUSES)
+                ).values(**values)).rowcount == 1
+        if closing and closed:
+            return {**totals, 'tasks': len(rows), 'failed': failed}
+        return None
+    
+    def sync_schedule(self, units: List[Dict]) -> int:
+        """
+        Enregistre les unités planifiées par le mode démon.
+        
+        Les nouvelles unités sont échues immédiatement; pour les unités existantes, seul
+        l'intervalle est mis à jour (l'échéance enregistrée est conservée).
+        
+        Args:
+            units: Dictionnaires source, query, location, interval_s
+        
+        Returns:
+            Nombre d'unités ajoutées
+        """
+        table = ScheduleState.__table__
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            added = conn.execute(table.insert().prefix_with('OR IGNORE'), [
+                {**unit, 'next_due_at': now, 'failures': 0} for unit in units
+            ]).rowcount if units else 0
+            if units:
+                conn.execute(table.update().where(
+                    table.c.source == bindparam('b_source'), table.c.query == bindparam('b_query'),
+                    table.c.location == bindparam('b_location')
+                ).values(interval_s=bindparam('b_interval_s')), [
+                    {f'b_{key}': value for key, value in unit.items()} for unit in units
+                ])
+        return added
+    
+    def get_schedule(self, location: Optional[str] = None) -> List[Dict]:
+        """Unités planifiées, de la plus proche échéance à la plus lointaine."""
+        table = ScheduleState.__table__
+        statement = select(table).order_by(table.c.next_due_at)
+        if location is not None:
+            statement = statement.where(table.c.location == location)
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(statement).mappings()]
+    
+    def update_schedule(self, source: str, query: str, location: str, **values):
+        """Met à jour une unité planifiée (next_due_at, last_status, failures...)."""
+        table = ScheduleState.__table__
+        with self.engine.begin() as conn:
+            conn.execute(table.update().where(
+                table.c.source == source, table.c.query == query, table.c.location == location
+            ).values(**values))
+    
+    def get_source_freshness(self, location: Optional[str] = None, now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """
+        Fraîcheur des données par source dans le mode démon.
+        
+        Returns:
+            source -> units, never_succeeded (unités jamais réussies), failing (en échec),
+            oldest_success_at, lag_s (âge du plus ancien passage réussi, None si aucun),
+            next_due_at, overdue_s (retard de la prochaine échéance, 0 si à l'heure)
+        """
+        table = ScheduleState.__table__
+        now = now or datetime.utcnow()
+        statement = select(
+            table.c.source,
+            func.count().label('units'),
+            (func.count() - func.count(table.c.last_success_at)).label('never_succeeded'),
+            func.count(case((table.c.failures > 0, 1))).label('failing'),
+            func.min(table.c.last_success_at).label('oldest_success_at'),
+            func.min(table.c.next_due_at).label('next_due_at'),
+        ).group_by(table.c.source).order_by(table.c.source)
+        if location is not None:
+            statement = statement.where(table.c.location == location)
+        
+        freshness = {}
+        with self.engine.connect() as conn:
+            for row in conn.execute(statement).mappings():
+                oldest = row['oldest_success_at']
+                freshness[row['source']] = {
+                    'units': row['units'],
+                    'never_succeeded': row['never_succeeded'],
+                    'failing': row['failing'],
+                    'oldest_success_at': oldest,
+                    'lag_s': round((now - oldest).total_seconds()) if oldest else None,
+                    'next_due_at': row['next_due_at'],
+                    'overdue_s': max(round((now - row['next_due_at']).total_seconds()), 0),
+                }
+        return freshness
+    
+    def get_query_yields(self, since: Optional[datetime] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Rendement de chaque (source, requête) sur les tâches terminées ou en échec.
+        
+        Une tâche en échec compte dans le coût (requêtes, durée) sans apporter d'offre: un couple
+        souvent bloqué a un rendement faible.
+        
+        Args:
+            since: Début de la fenêtre (par défaut il y a YIELD_WINDOW_DAYS jours)
+        
+        Returns:
+            (source, requête) -> tasks, failed, requests, seconds, jobs, added, last_finished_at,
+            added_per_request et added_per_second (None sans coût mesuré)
+        """
+        table = ScrapeTask.__table__
+        since = since or datetime.utcnow() - timedelta(days=YIELD_WINDOW_DAYS)
+        duration = (func.julianday(table.c.finished_at) - func.julianday(table.c.started_at)) * 86400
+        statement = select(
+            table.c.source, table.c.query,
+            func.count().label('tasks'),
+            func.count(case((table.c.status == 'failed', 1))).label('failed'),
+            func.sum(table.c.requests).label('requests'),
+            func.coalesce(func.sum(duration), 0).label('seconds'),
+            func.sum(table.c.jobs).label('jobs'),
+            func.sum(table.c.added).label('added'),
+            func.max(table.c.finished_at).label('last_finished_at'),
+        ).where(
+            table.c.status.in_(('done', 'failed')), table.c.finished_at >= since
+        ).group_by(table.c.source, table.c.query)
+        
+        yields = {}
+        with self.engine.connect() as conn:
+            for row in conn.execute(statement).mappings():
+                info = dict(row)
+                source, query = info.pop('source'), info.pop('query')
+                info['seconds'] = round(info['seconds'], 1)
+                info['added_per_request'] = round(info['added'] / info['requests'], 3) if info['requests'] else None
+                info['added_per_second'] = round(info['added'] / info['seconds'], 4) if info['seconds'] else None
+                yields[(source, query)] = info
+        return yields
+    
+    def get_jobs_to_enrich(self, run_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Offres insérées pendant un run et pas encore enrichies.
+        
+        Une offre est nouvelle si elle a été vue dans ce run et dans aucun run précédent.
+        
+        Returns:
+            Dicts id, url, source, job_title, snippet, role_category
+        """
+        jobs = Job.__table__
+        sightings = JobSighting.__table__
+        descriptions = JobDescription.__table__
+        earlier = sightings.alias('earlier')
+        statement = select(
+            jobs.c.id, jobs.c.url, jobs.c.source, jobs.c.job_title, jobs.c.snippet, jobs.c.role_category
+        ).where(
+            jobs.c.url != '',
+            exists().where(sightings.c.job_id == jobs.c.id, sightings.c.run_id == run_id),
+            ~exists().where(earlier.c.job_id == jobs.c.id, earlier.c.run_id < run_id),
+            ~exists().where(descriptions.c.job_id == jobs.c.id),
+        ).order_by(jobs.c.id)
+        if limit:
+            statement = statement.limit(limit)
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(statement).mappings()]
+    
+    def save_descriptions(self, rows: List[Dict]) -> int:
+        """
+        Enregistre des descriptions et les mots-clés (et catégories) recalculés sur le texte complet.
+        
+        Args:
+            rows: Dicts job_id, description, method, fetch_ms, detected_keywords et, en option, role_category
+        
+        Returns:
+            Nombre de descriptions enregistrées
+        """
+        if not rows:
+            return 0
+        now = datetime.utcnow()
+        codec = self._current_codec()
+        session = self.get_session()
+        try:
+            session.connection(execution_options={'sqlite_begin': 'BEGIN IMMEDIATE'})
+            session.execute(JobDescription.__table__.insert().prefix_with('OR REPLACE'), [
+                {'job_id': row['job_id'], 'codec': codec.codec, 'dict_id': codec.dict_id,
+                 'body': codec.compress(row['description']), 'raw_size': len(row['description'].encode('utf-8')),
+                 'method': row['method'], 'fetched_at': now, 'fetch_ms': row.get('fetch_ms')}
+                for row in rows
+            ])
+            by_id = {row['job_id']: row for row in rows}
+            jobs = session.query(Job).filter(Job.id.in_(list(by_id))).all()
+            for job in jobs:
+                job.detected_keywords = by_id[job.id]['detected_keywords']
+                if by_id[job.id].get('role_category'):
+                    job.role_category = by_id[job.id]['role_category']
+            session.flush()
+            self._sync_job_keywords(session, jobs)
+            self._sync_job_skills(session, [(job.id, job.job_title, job.snippet) for job in jobs],
+                                  {row['job_id']: row['description'] for row in rows})
+            self._bump_data_version(session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return len(rows)
+    
+    def _codec(self, dict_id: Optional[int], codec: Optional[str] = None) -> DescriptionCodec:
+        """Codec d'un dictionnaire, ou sans dictionnaire pour dict_id None (lu une fois par processus)."""
+        key = dict_id if dict_id is not None else codec or default_codec()
+        if key not in self._codecs:
+            if dict_id is None:
+                self._codecs[key] = DescriptionCodec(key)
+            else:
+                table = DescriptionDict.__table__
+                with self.engine.connect() as conn:
+                    row = conn.execute(select(table.c.codec, table.c.dictionary).where(table.c.id == dict_id)).one()
+                self._codecs[key] = DescriptionCodec(row.codec, row.dictionary, dict_id)
+        return self._codecs[key]
+    
+    def _current_dict_id(self) -> Optional[int]:
+        """Dictionnaire le plus récent utilisable par ce processus (zstd exige le paquet zstandard)."""
+        table = DescriptionDict.__table__
+        codecs = [default_codec(), 'zlib']
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(table.c.id).where(table.c.codec.in_(codecs)).order_by(table.c.id.desc()).limit(1)
+            ).scalar()
+    
+    def _current_codec(self) -> DescriptionCodec:
+        """Codec des nouvelles descriptions: dernier dictionnaire entraîné, sinon sans dictionnaire."""
+        return self._codec(self._current_dict_id())
+    
+    def get_description(self, job_id: int) -> Optional[str]:
+        """Description complète d'une offre, décompressée (None si elle n'a pas été enrichie)."""
+        table = JobDescription.__table__
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.codec, table.c.dict_id, table.c.body).where(table.c.job_id == job_id)
+            ).first()
+        if row is None:
+            return None
+        return self._codec(row.dict_id, row.codec).decompress(row.body)
+    
+    def get_described_job_ids(self, job_ids: List[int]) -> List[int]:
+        """Offres de la liste qui ont une description (clé primaire seule, sans lire les descriptions)."""
+        table = JobDescription.__table__
+        if not job_ids:
+            return []
+        with self.engine.connect() as conn:
+            return conn.execute(select(table.c.job_id).where(table.c.job_id.in_(job_ids))).scalars().all()
+    
+    def train_description_dictionary(self, samples: int = DESCRIPTION_DICT_SAMPLES, codec: Optional[str] = None,
+                                     batch_size: int = 500) -> Optional[Dict]:
+        """
+        Entraîne un dictionnaire sur les descriptions les plus récentes et recompresse toutes les descriptions.
+        
+        Returns:
+            dict_id, codec, samples, dict_size, rows (recompressées), raw_bytes, stored_bytes, ratio;
+            None s'il n'y a aucune description
+        """
+        table = JobDescription.__table__
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(table.c.codec, table.c.dict_id, table.c.body).order_by(table.c.fetched_at.desc()).limit(samples)
+            ).all()
+        if not rows:
+            return None
+        texts = [self._codec(row.dict_id, row.codec).decompress(row.body).encode('utf-8') for row in rows]
+        codec = codec or default_codec()
+        try:
+            dictionary = train_dictionary(texts, codec)
+        except Exception:
+            if codec == 'zlib':
+                raise
+            # Trop peu d'échantillons pour zstd: dictionnaire zlib
+            codec = 'zlib'
+            dictionary = train_dictionary(texts, codec)
+        
+        dicts = DescriptionDict.__table__
+        with self.engine.begin() as conn:
+            dict_id = conn.execute(dicts.insert().values(
+                codec=codec, dictionary=dictionary, samples=len(texts), created_at=datetime.utcnow()
+            )).inserted_primary_key[0]
+        new_codec = self._codec(dict_id)
+        
+        # Recompression par lots (une transaction par lot), dans l'ordre de la clé primaire
+        recompressed, last_id = 0, -1
+        while True:
+            with self.engine.connect() as conn:
+                conn.execution_options(sqlite_begin='BEGIN IMMEDIATE')
+                with conn.begin():
+                    batch = conn.execute(
+                        select(table.c.job_id, table.c.codec, table.c.dict_id, table.c.body)
+                        .where(table.c.job_id > last_id).order_by(table.c.job_id).limit(batch_size)
+                    ).all()
+                    if not batch:
+                        break
+                    conn.execute(table.update().where(table.c.job_id == bindparam('id')), [
+                        {'id': row.job_id, 'codec': new_codec.codec, 'dict_id': dict_id,
+                         'body': new_codec.compress(self._codec(row.dict_id, row.codec).decompress(row.body))}
+                        for row in batch
+                    ])
+            recompressed += len(batch)
+            last_id = batch[-1].job_id
+        
+        stats = self.get_description_stats()
+        return {'dict_id': dict_id, 'codec': codec, 'samples': len(texts), 'dict_size': len(dictionary),
+                'rows': recompressed, 'raw_bytes': stats['raw_bytes'], 'stored_bytes': stats['stored_bytes'],
+                'ratio': stats['ratio']}
+    
+    def get_description_stats(self) -> Dict:
+        """
+        Volume des descriptions.
+        
+        Returns:
+            rows, raw_bytes (UTF-8), stored_bytes (compressé), ratio (raw / stored), dict_id
+            (dictionnaire courant, None sans dictionnaire), codecs: lignes par codec
+        """
+        table = JobDescription.__table__
+        with self.engine.connect() as conn:
+            totals = conn.execute(select(
+                func.count(), func.coalesce(func.sum(table.c.raw_size), 0),
+                func.coalesce(func.sum(func.length(table.c.body)), 0)
+            )).one()
+            codecs = dict(conn.execute(select(table.c.codec, func.count()).group_by(table.c.codec)).all())
+        rows, raw_bytes, stored_bytes = totals
+        return {'rows': rows, 'raw_bytes': raw_bytes, 'stored_bytes': stored_bytes,
+                'ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+                'dict_id': self._current_dict_id(), 'codecs': codecs}
+    
+    def get_posting_lifetimes(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                              closed_after_days: float = 1.0) -> List[Dict]:
+        """
+        Durée de vie des offres et délai de pourvoi, par source.
+        
+        Une offre est considérée comme retirée (pourvue) si sa dernière apparition précède
+        de plus de closed_after_days jours la dernière apparition observée pour sa source.
+        
+        Args:
+            since/until: Offres vues pendant cette fenêtre
+            closed_after_days: Délai de grâce avant de considérer une offre retirée
+        
+        Returns:
+            Une ligne par source: jobs, open, closed, avg_lifetime_days, max_lifetime_days,
+            avg_sightings, avg_time_to_fill_days (publication -> disparition, offres retirées)
+        """
+        lifetimes = JobLifetime.__table__
+        sources = SourceName.__table__
+        with self.engine.connect() as conn:
+            # Dernière apparition par source: une recherche dans l'index (source_id, last_seen) par source
+            names = dict(conn.execute(select(sources.c.id, sources.c.name)).all())
+            latest = {}
+            for source_id in names:
+                last_seen = conn.execute(
+                    select(func.max(lifetimes.c.last_seen)).where(lifetimes.c.source_id == source_id)
+                ).scalar()
+                if last_seen is not None:
+                    latest[str(source_id)] = last_seen
+            if not latest:
+                return []
+            
+            # Une ligne par (offre, source) dans job_lifetimes, quel que soit le nombre d'apparitions
+            rows = conn.execute(text("""
+                WITH latest AS (
+                    SELECT CAST(key AS INTEGER) AS source_id, value AS last_seen FROM json_each(:latest)
+                ),
+                classified AS (
+                    SELECT l.*, l.last_seen < latest.last_seen - :grace AS closed
+                    FROM job_lifetimes AS l JOIN latest ON latest.source_id = l.source_id
+                    WHERE (:since IS NULL OR l.last_seen >= :since) AND (:until IS NULL OR l.first_seen < :until)
+                )
+                SELECT source_id,
+                       count(*),
+                       sum(closed),
+                       avg(last_seen - first_seen),
+                       max(last_seen - first_seen),
+                       avg(sightings),
+                       avg(CASE WHEN closed THEN max(last_seen - published_at, 0) END)
+                FROM classified
+                GROUP BY source_id
+            """), {
+                'latest': json.dumps(latest),
+                'since': _epoch(since) if since else None,
+                'until': _epoch(until) if until else None,
+                'grace': int(closed_after_days * 86400),
+            }).all()
+        
+        def days(seconds: Optional[float]) -> Optional[float]:
+            return round(seconds / 86400, 2) if seconds is not None else None
+        
+        return sorted([{
+            'source': names[source_id],
+            'jobs': jobs,
+            'open': jobs - closed,
+            'closed': closed,
+            'avg_lifetime_days': days(avg_lifetime),
+            'max_lifetime_days': days(max_lifetime),
+            'avg_sightings': round(avg_sightings, 2),
+            'avg_time_to_fill_days': days(avg_fill),
+        } for source_id, jobs, closed, avg_lifetime, max_lifetime, avg_sightings, avg_fill in rows],
+            key=lambda row: row['source'])
+    
+    def get_keyword_counts(self, filters: Optional[Dict] = None, limit: int = 20) -> Dict[str, int]:
+        """
+        Compte les offres par mot-clé (facettes), via la table job_keywords.
+        
+        Args:
+            filters: Filtres sur les offres (voir _job_filter_clauses), ex: {'since': date}
+            limit: Nombre maximum de mots-clés retournés
+        """
+        keyword_table = Keyword.__table__
+        link_table = JobKeyword.__table__
+        job_count = func.count(link_table.c.job_id)
+        statement = select(keyword_table.c.name, job_count).join(
+            keyword_table, keyword_table.c.id == link_table.c.keyword_id
+        )
+        clauses = self._job_filter_clauses(filters)
+        if clauses:
+            statement = statement.join(Job.__table__, Job.__table__.c.id == link_table.c.job_id).where(*clauses)
+        statement = statement.group_by(keyword_table.c.name).order_by(job_count.desc()).limit(limit)
+        
+        with self.engine.connect() as conn:
+            return dict(conn.execute(statement).all())
+    
+    def get_skill_counts(self, filters: Optional[Dict] = None, limit: int = 20,
+                         family: Optional[str] = None) -> Dict[str, int]:
+        """
+        Compte les offres par compétence (facettes), via la table job_skills.
+        
+        Args:
+            filters: Filtres sur les offres (voir _job_filter_clauses)
+            limit: Nombre maximum de compétences retournées
+            family: Famille de la taxonomie (ex: 'Cloud'); toutes par défaut
+        """
+        skill_table = Skill.__table__
+        link_table = JobSkill.__table__
+        job_count = func.count(link_table.c.job_id)
+        statement = select(skill_table.c.name, job_count).join(
+            skill_table, skill_table.c.id == link_table.c.skill_id
+        )
+        if family:
+            statement = statement.where(skill_table.c.family == family)
+        clauses = self._job_filter_clauses(filters)
+        if clauses:
+            statement = statement.join(Job.__table__, Job.__table__.c.id == link_table.c.job_id).where(*clauses)
+        statement = statement.group_by(skill_table.c.name).order_by(job_count.desc()).limit(limit)
+        
+        with self.engine.connect() as conn:
+            return dict(conn.execute(statement).all())
+    
+    def get_job_skills(self, job_id: int) -> List[Dict]:
+        """Compétences d'une offre: name, family, in_title (celles du titre d'abord)."""
+        skill_table = Skill.__table__
+        link_table = JobSkill.__table__
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(skill_table.c.name, skill_table.c.family, link_table.c.in_title)
+                .join(skill_table, skill_table.c.id == link_table.c.skill_id)
+                .where(link_table.c.job_id == job_id)
+                .order_by(link_table.c.in_title.desc(), skill_table.c.name)
+            ).all()
+        return [{'name': name, 'family': family, 'in_title': bool(in_title)} for name, family, in_title in rows]
+    
     def get_all_jobs(self, limit: Optional[int] = None) -> List[Dict]:
         """Récupère toutes les offres."""
         session = self.get_session()
@@ -141,71 +1534,450 @@ class DatabaseManager:
             return [job.to_dict() for job in jobs]
         finally:
             session.close()
+    
+    def _job_filter_clauses(self, filters: Optional[Dict], table=None) -> List:
+        """
+        Traduit un dictionnaire de filtres en clauses SQL sur la table jobs.
+        
+        Clés supportées: category, source, keyword (valeur ou liste), skill (valeur ou liste: offres
+        citant toutes ces compétences), search (texte libre, FTS5),
+        applied (bool), since/until (published_date), scraped_since (scraped_at strictement postérieur).
+        
+        Args:
+            table: Table ou sous-requête à filtrer (jobs par défaut)
+        """
+        table = Job.__table__ if table is None else table
+        filters = filters or {}
+        clauses = []
+        
+        for key, column in (('category', table.c.role_category), ('source', table.c.source)):
+            value = filters.get(key)
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(column.in_(list(value)))
+            elif value:
+                clauses.append(column == value)
+        
+        keyword = filters.get('keyword')
+        if keyword:
+            names = list(keyword) if isinstance(keyword, (list, tuple, set)) else [keyword]
+            if table is Job.__table__:
+                clauses.append(table.c.id.in_(
+                    select(JobKeyword.__table__.c.job_id).join(
+                        Keyword.__table__, Keyword.__table__.c.id == JobKeyword.__table__.c.keyword_id
+                    ).where(Keyword.__table__.c.name.in_(names))
+                ))
+            else:
+                # Les offres archivées n'ont pas de lignes job_keywords: recherche dans la colonne texte
+                padded = ', ' + func.coalesce(table.c.detected_keywords, '') + ', '
+                clauses.append(or_(*[padded.like(f'%, {name}, %') for name in names]))
+        
+        skill = filters.get('skill')
+        if skill:
+            skills = Skill.__table__
+            for name in (list(skill) if isinstance(skill, (list, tuple, set)) else [skill]):
+                if table is Job.__table__:
+                    clauses.append(table.c.id.in_(
+                        select(JobSkill.__table__.c.job_id).join(
+                            skills, skills.c.id == JobSkill.__table__.c.skill_id
+                        ).where(skills.c.name == name)
+                    ))
+                else:
+                    # Union jobs + archive: les identifiants peuvent se recouvrir, l'offre est retrouvée
+                    # par son URL dans les lignes job_skills de sa table
+                    clauses.append(or_(*[
+                        exists().where(
+                            jobs.c.url == table.c.url, links.c.job_id == jobs.c.id,
+                            skills.c.id == links.c.skill_id, skills.c.name == name
+                        )
+                        for jobs, links in ((Job.__table__, JobSkill.__table__), (archive_jobs, archive_skills))
+                    ]))
+        
+        search = self._build_fts_query(filters.get('search'))
+        if search:
+            if table is Job.__table__:
+                clauses.append(table.c.id.in_(
+                    select(literal_column('rowid')).select_from(text('jobs_fts')).where(
+                        literal_column('jobs_fts').op('MATCH')(search)
+                    )
+                ))
+            else:
+                # Pas d'index FTS sur l'archive: chaque terme doit apparaître dans le titre ou l'entreprise
+                for term in re.findall(r'\w+', filters['search']):
+                    clauses.append(or_(table.c.job_title.ilike(f'%{term}%'), table.c.company.ilike(f'%{term}%')))
+        
+        if filters.get('applied') is not None:
+            clauses.append(table.c.applied == bool(filters['applied']))
+        if filters.get('since'):
+            clauses.append(table.c.published_date >= filters['since'])
+        if filters.get('until'):
+            clauses.append(table.c.published_date < filters['until'])
+        if filters.get('scraped_since'):
+            clauses.append(table.c.scraped_at > filters['scraped_since'])
+        return clauses
+    
+    def _jobs_source(self, include_archive: bool = False):
+        """
+        Retourne la source des lectures: la table jobs, ou l'union jobs + archive.
+        
+        Une offre archivée puis revue (de nouveau présente dans jobs) n'est lue qu'une fois.
+        """
+        table = Job.__table__
+        if not include_archive:
+            return table
+        hot = select(*table.columns)
+        cold = select(*[archive_jobs.c[column.name] for column in table.columns]).where(
+            ~exists().where(table.c.url == archive_jobs.c.url)
+        )
+        return union_all(hot, cold).subquery('all_jobs')
+    
+    def _select_jobs(self, filters: Optional[Dict] = None, columns: Optional[List[str]] = None, source=None):
+        """Construit un SELECT (SQLAlchemy Core) trié du plus récent au plus ancien."""
+        table = Job.__table__ if source is None else source
+        names = list(columns) if columns else [column.name for column in Job.__table__.columns]
+        # id et published_date sont toujours lus: ils servent de clé de pagination
+        for key in ('published_date', 'id'):
+            if key not in names:
+                names.append(key)
+        
+        return select(*[table.c[name] for name in names]).where(
+            *self._job_filter_clauses(filters, table)
+        ).order_by(table.c.published_date.desc(), table.c.id.desc())
+    
+    def get_jobs_page(self, filters: Optional[Dict] = None, columns: Optional[List[str]] = None,
+                      after: Optional[JobCursor] = None, limit: int = 100,
+                      include_archive: bool = False) -> Dict:
+        """
+        Lit une page d'offres sans passer par l'ORM (pagination par clé).
+        
+        Args:
+            filters: Filtres (voir _job_filter_clauses)
+            columns: Colonnes à lire (toutes par défaut)
+            after: Curseur retourné par la page précédente
+            limit: Nombre maximum de lignes
+            include_archive: Inclure les offres archivées (analyse de tendances)
+        
+        Returns:
+            {'rows': [dict], 'next_cursor': JobCursor ou None si dernière page}
+        """
+        table = self._jobs_source(include_archive)
+        statement = self._select_jobs(filters, columns, table)
+        
+        if after is not None:
+            last_date, last_id = after
+            if last_date is None:
+                # Les dates NULL sont en fin de tri (DESC): on ne compare plus que l'id
+                statement = statement.where(table.c.published_date.is_(None), table.c.id < last_id)
+            else:
+                statement = statement.where(or_(
+                    table.c.published_date < last_date,
+                    and_(table.c.published_date == last_date, table.c.id < last_id),
+                    table.c.published_date.is_(None)
+                ))
+        
+        with self.engine.connect() as conn:
+            rows = [dict(row) for row in conn.execute(statement.limit(limit)).mappings()]
+        
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1]['published_date'], rows[-1]['id'])
+        return {'rows': rows, 'next_cursor': next_cursor}
+    
+    def query_jobs(self, filters: Optional[Dict] = None, sort: str = 'published_date', descending: bool = True,
+                   page: int = 1, page_size: int = 50, columns: Optional[List[str]] = None) -> Dict:
+        """
+        Lit une page d'offres filtrée et triée, en SQL sur toute la table (vue tableau du dashboard).
+        
+        Args:
+            filters: Filtres (voir _job_filter_clauses), ex: {'category': 'Data Engineer', 'search': 'lyon'}
+            sort: Colonne de tri (voir SORT_COLUMNS); 'relevance' trie par score bm25 de la recherche
+            descending: Ordre décroissant
+            page: Numéro de page (à partir de 1)
+            page_size: Nombre de lignes par page
+            columns: Colonnes à lire (toutes par défaut)
+        
+        Returns:
+            {'rows': [dict], 'total': int, 'page': int, 'pages': int}
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Tri inconnu: {sort} (attendu: {', '.join(SORT_COLUMNS)})")
+        
+        table = Job.__table__
+        clauses = self._job_filter_clauses(filters)
+        names = list(columns) if columns else [column.name for column in table.columns]
+        statement = select(*[table.c[name] for name in names]).where(*clauses)
+        
+        search = self._build_fts_query((filters or {}).get('search'))
+        if sort == 'relevance' and search:
+            # Score bm25 calculé une fois par offre trouvée, puis jointure sur la clé primaire
+            fts = select(
+                literal_column('rowid').label('job_id'), literal_column(FTS_RANK).label('rank')
+            ).select_from(text('jobs_fts')).where(literal_column('jobs_fts').op('MATCH')(search)).subquery('fts')
+            # bm25 est négatif: le plus pertinent a le score le plus bas
+            statement = statement.join(fts, fts.c.job_id == table.c.id).order_by(
+                fts.c.rank.asc() if descending else fts.c.rank.desc()
+            )
+        elif sort != 'relevance':
+            column = table.c[sort]
+            statement = statement.order_by(column.desc() if descending else column.asc())
+        statement = statement.order_by(table.c.id.desc() if descending else table.c.id.asc())
+        
+        page = max(int(page), 1)
+        with self.engine.connect() as conn:
+            total = conn.execute(select(func.count()).select_from(table).where(*clauses)).scalar()
+            rows = [dict(row) for row in conn.execute(
+                statement.limit(page_size).offset((page - 1) * page_size)
+            ).mappings()]
+        
+        return {
+            'rows': rows,
+            'total': total,
+            'page': page,
+            'pages': max((total + page_size - 1) // page_size, 1),
+        }
+    
+    def iter_jobs(self, filters: Optional[Dict] = None, columns: Optional[List[str]] = None,
+                  chunk_size: int = 1000, include_archive: bool = False) -> Iterator[List[Dict]]:
+        """Parcourt les offres par blocs de chunk_size lignes (mémoire constante)."""
+        cursor = None
+        while True:
+            page = self.get_jobs_page(filters, columns, after=cursor, limit=chunk_size, include_archive=include_archive)
+            if page['rows']:
+                yield page['rows']
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+    
+    def get_jobs_frame(self, filters: Optional[Dict] = None, columns: Optional[List[str]] = None,
+                       limit: Optional[int] = None, dtype_backend: Optional[str] = None,
+                       include_archive: bool = False):
+        """
+        Lit les offres directement dans un DataFrame pandas, en une seule requête.
+        
+        Args:
+            dtype_backend: None (types pandas par défaut), 'numpy_nullable' ou 'pyarrow' (colonnes Arrow)
+            include_archive: Inclure les offres archivées
+        """
+        import pandas as pd
+        
+        statement = self._select_jobs(filters, columns, self._jobs_source(include_archive))
+        if limit:
+            statement = statement.limit(limit)
+        options = {'dtype_backend': dtype_backend} if dtype_backend else {}
+        with self.engine.connect() as conn:
+            return pd.read_sql(statement, conn, **options)
+    
+    def export_jobs(self, path: str, fmt: str = 'parquet', filters: Optional[Dict] = None,
+                    since_scraped_at: Optional[datetime] = None, chunk_size: int = 10000,
+                    include_archive: bool = False) -> Dict:
+        """
+        Exporte les offres en flux vers Parquet, Arrow IPC (flux) ou JSON Lines.
+        
+        Args:
+            path: Fichier de sortie
+            fmt: 'parquet', 'arrow' ou 'jsonl'
+            filters: Filtres (voir _job_filter_clauses)
+            since_scraped_at: Export incrémental: uniquement les offres vues après cette date
+            chunk_size: Nombre de lignes lues et écrites par bloc
+            include_archive: Inclure les offres archivées
+        
+        Returns:
+            {'rows': int, 'chunks': int, 'max_scraped_at': datetime} (max_scraped_at sert
+            de point de départ au prochain export incrémental)
+        """
+        from scraper.export import write_jobs
+        
+        filters = dict(filters or {})
+        if since_scraped_at:
+            filters['scraped_since'] = since_scraped_at
+        chunks = self.iter_jobs(filters, chunk_size=chunk_size, include_archive=include_archive)
+        return write_jobs(chunks, path, fmt)
+    
+    @staticmethod
+    def _build_fts_query(query: str) -> str:
+        """
+        Convertit une saisie libre en requête FTS5.
+        
+        Chaque mot devient un préfixe entre guillemets ("data"* "lyon"*),
+        ce qui neutralise la syntaxe FTS5 et combine les termes en ET.
+        """
+        terms = re.findall(r'\w+', query or '')
+        return ' '.join(f'"{term}"*' for term in terms)
+    
+    def search_jobs(self, query: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Recherche plein texte (titre, entreprise, résumé, mots-clés, localisation).
+        
+        La recherche porte sur tout l'historique, par préfixe et sans tenir compte
+        des accents. Les résultats sont triés par pertinence (bm25, titre prioritaire).
+        """
+        fts_query = self._build_fts_query(query)
+        if not fts_query:
+            return []
+        
+        session = self.get_session()
+        try:
+            statement = text("""
+                SELECT jobs.* FROM jobs_fts
+                JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH :query
+                ORDER BY {rank}
+                LIMIT :limit OFFSET :offset
+            """.format(rank=FTS_RANK))
+            jobs = session.query(Job).from_statement(statement).params(
+                query=fts_query, limit=limit, offset=offset
+            ).all()
+            return [job.to_dict() for job in jobs]
+        finally:
+            session.close()
             
     def update_job_status(self, job_id: int, applied: bool) -> bool:
         """Met à jour le statut de candidature d'une offre."""
-        session = self.get_session()
+        return self.update_job_statuses({job_id: applied})[job_id]
+    
+    def update_job_statuses(self, changes: Dict[int, bool]) -> Dict[int, bool]:
+        """
+        Met à jour le statut de candidature de plusieurs offres en une transaction.
+        
+        Un seul UPDATE préparé est exécuté pour toutes les lignes (executemany);
+        la colonne applied ne déclenche ni les triggers de job_stats ni ceux de l'index FTS.
+        
+        Args:
+            changes: {id de l'offre: postulé}
+        
+        Returns:
+            {id de l'offre: True si mise à jour, False si introuvable ou en cas d'erreur}
+        """
+        changes = {int(job_id): bool(applied) for job_id, applied in changes.items()}
+        if not changes:
+            return {}
+        
+        table = Job.__table__
+        statement = table.update().where(table.c.id == bindparam('job_id')).values(applied=bindparam('new_applied'))
         try:
-            job = session.query(Job).filter_by(id=job_id).first()
-            if job:
-                job.applied = applied
-                session.commit()
-                return True
-            return False
+            with self.engine.begin() as conn:
+                existing = set(conn.execute(
+                    select(table.c.id).where(table.c.id.in_(list(changes)))
+                ).scalars())
+                if existing:
+                    conn.execute(statement, [
+                        {'job_id': job_id, 'new_applied': changes[job_id]} for job_id in existing
+                    ])
+                    self._bump_data_version(conn)
         except Exception:
-            session.rollback()
-            return False
-        finally:
-            session.close()
+            return {job_id: False for job_id in changes}
+        return {job_id: job_id in existing for job_id in changes}
     
     def get_statistics(self) -> Dict:
-        """Calcule les statistiques sur les offres."""
+        """
+        Lit les statistiques sur les offres depuis la table job_stats.
+        
+        Les compteurs sont tenus à jour par triggers à chaque écriture sur jobs,
+        le coût de lecture ne dépend donc pas du nombre d'offres.
+        """
         session = self.get_session()
         try:
-            # Total
-            total = session.query(func.count(Job.id)).scalar()
-            
-            # Par catégorie
-            by_category = session.query(
-                Job.role_category,
-                func.count(Job.id)
-            ).group_by(Job.role_category).all()
-            
-            # Par source
-            by_source = session.query(
-                Job.source,
-                func.count(Job.id)
-            ).group_by(Job.source).all()
+            rows = session.query(JobStat.dimension, JobStat.value, JobStat.count).filter(
+                JobStat.dimension.in_(['total', 'category', 'source', 'day']),
+                JobStat.count > 0
+            ).order_by(JobStat.dimension, JobStat.value).all()
             
-            # Par jour (published_date)
-            by_day = session.query(
-                func.date(Job.published_date),
-                func.count(Job.id)
-            ).group_by(func.date(Job.published_date)).all()
-            
-            # Top localisations
-            top_locations = session.query(
-                Job.location,
-                func.count(Job.id)
-            ).filter(Job.location.isnot(None)).group_by(Job.location).order_by(
-                func.count(Job.id).desc()
-            ).limit(10).all()
+            # Top localisations (index sur dimension, count)
+            top_locations = session.query(JobStat.value, JobStat.count).filter(
+                JobStat.dimension == 'location',
+                JobStat.value != '',
+                JobStat.count > 0
+            ).order_by(JobStat.count.desc()).limit(10).all()
             
+            total = sum(count for dimension, _, count in rows if dimension == 'total')
             return {
                 'total': total,
-                'by_category': dict(by_category),
-                'by_source': dict(by_source),
-                'by_day': [(str(day), count) for day, count in by_day if day],
+                'by_category': {value or None: count for dimension, value, count in rows if dimension == 'category'},
+                'by_source': {value or None: count for dimension, value, count in rows if dimension == 'source'},
+                'by_day': [(value, count) for dimension, value, count in rows if dimension == 'day' and value],
                 'top_locations': dict(top_locations)
             }
         finally:
             session.close()
     
+    def archive_old_jobs(self, max_age_days: int = RETENTION_DAYS, batch_size: int = 5000) -> int:
+        """
+        Déplace vers la base d'archive les offres non revues depuis max_age_days jours.
+        
+        Le déplacement se fait par lots (une transaction par lot) pour ne pas bloquer
+        les lecteurs. Les descriptions et les compétences sont copiées dans l'archive avant la
+        suppression; les triggers de jobs mettent ensuite à jour job_stats, l'index FTS,
+        job_keywords, job_descriptions et job_skills. Une offre archivée qui réapparaît est
+        restaurée par bulk_upsert.
+        
+        Returns:
+            Nombre d'offres archivées
+        """
+        cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+        table = Job.__table__
+        columns = [column.name for column in table.columns]
+        archived = 0
+        
+        while True:
+            with self.engine.begin() as conn:
+                ids = conn.execute(
+                    select(table.c.id).where(table.c.scraped_at < cutoff).limit(batch_size)
+                ).scalars().all()
+                if not ids:
+                    break
+                conn.execute(
+                    archive_jobs.insert().prefix_with('OR REPLACE').from_select(
+                        columns + ['archived_at'],
+                        select(*table.columns, func.datetime('now')).where(table.c.id.in_(ids))
+                    )
+                )
+                for cold, hot in ((archive_descriptions, JobDescription.__table__), (archive_skills, JobSkill.__table__)):
+                    conn.execute(cold.delete().where(cold.c.job_id.in_(ids)))
+                    conn.execute(cold.insert().from_select(
+                        [column.name for column in hot.columns], select(*hot.columns).where(hot.c.job_id.in_(ids))
+                    ))
+                conn.execute(table.delete().where(table.c.id.in_(ids)))
+                self._bump_data_version(conn)
+            archived += len(ids)
+        return archived
+    
+    def run_maintenance(self, vacuum_pages: int = 0, fts_merge_pages: int = FTS_MERGE_PAGES) -> Dict:
+        """
+        Entretien de la base principale après archivage.
+        
+        - libère les pages vides (VACUUM incrémental; la base passe en mode auto_vacuum
+          incrémental par une migration, jamais ici: un VACUUM complet verrouille la base),
+        - fusionne une partie des segments de l'index FTS ('merge', borné, au lieu de
+          'optimize' qui réécrit tout l'index) et supprime les compteurs job_stats à zéro,
+        - met à jour les statistiques du planificateur (PRAGMA optimize).
+        
+        Args:
+            vacuum_pages: Nombre maximum de pages à libérer (0 = toutes)
+            fts_merge_pages: Pages de l'index FTS fusionnées au plus
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM job_stats WHERE count <= 0")
+            conn.exec_driver_sql(f"INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('merge', {int(fts_merge_pages)})")
+        
+        # VACUUM est interdit dans une transaction: connexion DBAPI en autocommit
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            free_before = cursor.execute("PRAGMA main.freelist_count").fetchone()[0]
+            if cursor.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 2:
+                cursor.execute(f"PRAGMA main.incremental_vacuum({int(vacuum_pages)})")
+            cursor.execute("PRAGMA main.optimize")
+            free_after = cursor.execute("PRAGMA main.freelist_count").fetchone()[0]
+            cursor.close()
+        finally:
+            raw.close()
+        return {'pages_freed': free_before - free_after}
+    
     def clear_all(self):
         """Supprime toutes les offres (pour tests)."""
         session = self.get_session()
         try:
             session.query(Job).delete()
+            self._bump_data_version(session)
             session.commit()
         finally:
             session.close()
@@ -0,0 +1,202 @@
+"""
+Enrichissement des nouvelles offres par leur page de détail.
+
+Les cartes de résultats ne donnent qu'un extrait (vide pour LinkedIn, résumé de l'entreprise
+pour WTTJ): la détection des mots-clés et la catégorisation travaillent sur très peu de
+texte. Cette étape optionnelle (config.ENRICH_DETAILS, scraper_cli.py --enrich) télécharge
+la description complète des offres insérées pendant le run, et d'elles seules:
+
+- HTTP d'abord, en parallèle (ENRICH_MAX_WORKERS threads), avec au plus ENRICH_PER_HOST
+  requêtes simultanées par site;
+- repli sur le navigateur du run pour les pages sans description en HTTP (site rendu en
+  JavaScript, anti-bot), une page à la fois: l'API synchrone de Playwright n'est utilisable
+  que depuis le thread qui l'a ouverte.
+
+La description est extraite des données JSON-LD JobPosting de la page, sinon de sélecteurs
+propres à chaque source.
+"""
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+import requests
+from scraper.utils import clean_text
+from config import (
+    ENRICH_MAX_WORKERS, ENRICH_PER_HOST, ENRICH_TIMEOUT, ENRICH_MIN_LENGTH, BROWSER_TIMEOUT, USER_AGENTS
+)
+
+# Conteneur de la description par source, essayés après le JSON-LD
+DESCRIPTION_SELECTORS = {
+    'LinkedIn': ['div.show-more-less-html__markup', 'div.description__text'],
+    'Indeed': ['#jobDescriptionText'],
+    'WTTJ': ['[data-testid="job-section-description"]'],
+    'HelloWork': ['[data-truncate-text-target="content"]', '[data-cy="jobDescription"]'],
+    'APEC': ['.details-post', 'apec-poste-informations'],
+    'Glassdoor': ['[class*="JobDetails_jobDescription"]', '#JobDescriptionContainer'],
+}
+GENERIC_SELECTORS = ['[class*="job-description"]', '[class*="jobDescription"]', '[id*="description"]', 'article']
+
+
+def _json_ld_items(data) -> Iterator[Dict]:
+    """Objets d'un bloc JSON-LD (listes et @graph aplatis)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_items(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _json_ld_items(data.get('@graph'))
+
+
+def extract_description(html: str, source: Optional[str] = None) -> Optional[str]:
+    """
+    Extrait la description d'une page d'offre.
+
+    Returns:
+        Texte de la description, ou None si aucune description d'au moins ENRICH_MIN_LENGTH caractères
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        for item in _json_ld_items(data):
+            types = item.get('@type')
+            if 'JobPosting' in (types if isinstance(types, list) else [types]) and item.get('description'):
+                text = clean_text(BeautifulSoup(item['description'], 'lxml').get_text(' '))
+                if len(text) >= ENRICH_MIN_LENGTH:
+                    return text
+
+    for selector in DESCRIPTION_SELECTORS.get(source, []) + GENERIC_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None:
+            text = clean_text(element.get_text(' '))
+            if len(text) >= ENRICH_MIN_LENGTH:
+                return text
+    return None
+
+
+class DetailFetcher:
+    """Téléchargement borné des pages de détail: HTTP concurrent, repli navigateur séquentiel."""
+
+    def __init__(self, max_workers: int = ENRICH_MAX_WORKERS, per_host: int = ENRICH_PER_HOST,
+                 timeout: float = ENRICH_TIMEOUT):
+        """
+        Args:
+            max_workers: Requêtes HTTP simultanées au total
+            per_host: Requêtes HTTP simultanées par site
+            timeout: Délai maximum d'une requête HTTP (secondes)
+        """
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        """Sémaphore du site de l'URL (créé au premier accès)."""
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _session(self) -> requests.Session:
+        """Session HTTP du thread courant (connexions réutilisées)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update({'User-Agent': random.choice(USER_AGENTS), 'Accept-Language': 'fr-FR,fr;q=0.9'})
+        return session
+
+    def fetch_http(self, job: Dict) -> Dict:
+        """
+        Télécharge une page de détail en HTTP.
+
+        Returns:
+            job_id, source, description (None si absente), method, requests, fetch_ms, error
+        """
+        result = {'job_id': job['id'], 'source': job['source'], 'description': None, 'method': None,
+                  'requests': 0, 'fetch_ms': 0, 'error': None}
+        start = time.perf_counter()
+        try:
+            with self._slot(job['url']):
+                result['requests'] += 1
+                response = self._session().get(job['url'], timeout=self.timeout)
+            if response.status_code == 200:
+                result['description'] = extract_description(response.text, job['source'])
+                result['method'] = 'http' if result['description'] else None
+            else:
+                result['error'] = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            result['error'] = type(e).__name__
+        result['fetch_ms'] += round((time.perf_counter() - start) * 1000)
+        return result
+
+    def fetch_browser(self, page, job: Dict, result: Dict):
+        """Repli: charge la page dans le navigateur et complète result."""
+        start = time.perf_counter()
+        try:
+            result['requests'] += 1
+            page.goto(job['url'], wait_until='domcontentloaded', timeout=BROWSER_TIMEOUT)
+            result['description'] = extract_description(page.content(), job['source'])
+            if result['description']:
+                result.update(method='browser', error=None)
+        except Exception as e:
+            result['error'] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        result['fetch_ms'] += round((time.perf_counter() - start) * 1000)
+
+    def fetch_all(self, jobs: List[Dict], browser=None, progress_callback: Optional[Callable] = None) -> List[Dict]:
+        """
+        Télécharge les descriptions d'offres (dicts id, url, source), dans l'ordre de jobs.
+
+        Args:
+            browser: Navigateur Playwright pour le repli (None: HTTP seulement); doit avoir été
+                ouvert par le thread appelant
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='enrich') as pool:
+            results = list(pool.map(self.fetch_http, jobs))
+
+        missing = [(job, result) for job, result in zip(jobs, results) if result['description'] is None]
+        if browser is not None and missing:
+            if progress_callback:
+                progress_callback(f"🌐 Repli navigateur pour {len(missing)} pages sans description en HTTP")
+            context = browser.new_context(user_agent=random.choice(USER_AGENTS), locale='fr-FR')
+            try:
+                page = context.new_page()
+                for job, result in missing:
+                    self.fetch_browser(page, job, result)
+            finally:
+                context.close()
+        return results
+
+
+def summarize_costs(results: List[Dict]) -> Dict[str, Dict]:
+    """
+    Coût de l'enrichissement par source.
+
+    Returns:
+        source -> jobs, enriched, http, browser, failed, requests, seconds (durée cumulée des téléchargements)
+    """
+    costs: Dict[str, Dict] = {}
+    for result in results:
+        cost = costs.setdefault(result['source'], {
+            'jobs': 0, 'enriched': 0, 'http': 0, 'browser': 0, 'failed': 0, 'requests': 0, 'seconds': 0.0
+        })
+        cost['jobs'] += 1
+        cost['requests'] += result['requests']
+        cost['seconds'] += result['fetch_ms'] / 1000
+        if result['method']:
+            cost['enriched'] += 1
+            cost[result['method']] += 1
+        else:
+            cost['failed'] += 1
+    for cost in costs.values():
+        cost['seconds'] = round(cost['seconds'], 1)
+    return costs
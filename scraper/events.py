@@ -0,0 +1,152 @@
+"""
+Protocole d'événements JSON lines entre scraper_cli.py et l'application.
+
+Le pipeline émet un événement par étape (un objet JSON par ligne, avec 'event' et 'ts'):
+
+- run_started: run_id, sources
+- source_started: source, index
+- page_fetched: source, url, status, duration_ms
+- jobs_extracted: source, jobs, valid
+- source_finished: source, status ('done', 'failed' ou 'skipped'), jobs, valid, duration_s, error;
+  une unité reprise d'un run interrompu (resumed) porte aussi added et updated
+- db_committed: batch, added, updated, skipped, commit_ms
+- details_enriched: source, jobs, enriched, http, browser, failed, requests, seconds
+- run_finished: status, duration_s, error
+
+L'application relit le fichier à partir du dernier offset lu et agrège les événements
+dans un état de progression (summarize_events), sans relire tout le fichier.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+EVENT_TYPES = (
+    'run_started', 'source_started', 'page_fetched', 'jobs_extracted',
+    'source_finished', 'db_committed', 'details_enriched', 'run_finished',
+)
+
+
+class EventLog:
+    """Écrit les événements d'un run dans un fichier JSON lines (utilisable depuis plusieurs threads)."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Fichier d'événements (créé, ou complété s'il existe)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        """Ajoute un événement (une ligne, écrite et vidée immédiatement)."""
+        if event not in EVENT_TYPES:
+            raise ValueError(f"Événement inconnu: {event}")
+        line = json.dumps({'event': event, 'ts': round(time.time(), 3), **fields}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        """Ferme le fichier."""
+        with self._lock:
+            self._file.close()
+
+
+def events_path(runs_dir: str, run_id: int) -> str:
+    """Fichier d'événements d'un run."""
+    return os.path.join(runs_dir, f"run_{run_id}.events.jsonl")
+
+
+def read_events(path: str, offset: int = 0) -> Tuple[List[Dict], int]:
+    """
+    Lit les nouveaux événements à partir d'un offset (en octets).
+
+    Une dernière ligne incomplète (en cours d'écriture) est laissée pour la lecture suivante.
+
+    Returns:
+        (événements, nouvel offset)
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+
+    end = data.rfind(b'\n') + 1
+    events = []
+    for line in data[:end].splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events, offset + end
+
+
+def summarize_events(events: List[Dict], state: Optional[Dict] = None) -> Dict:
+    """
+    Agrège des événements dans un état de progression (mis à jour en place).
+
+    Returns:
+        État: sources_total, sources_done, current_source, pages, jobs, valid, added, updated,
+        enriched, skipped, started_ts, last_ts, source_durations, status, eta_s (None tant qu'aucune source
+        n'est terminée)
+    """
+    if state is None:
+        state = {
+            'sources_total': 0, 'sources_done': 0, 'current_source': None, 'current_started_ts': None,
+            'pages': 0, 'jobs': 0, 'valid': 0, 'added': 0, 'updated': 0, 'enriched': 0, 'skipped': 0,
+            'started_ts': None, 'last_ts': None, 'source_durations': [], 'status': 'running', 'eta_s': None,
+        }
+
+    for event in events:
+        kind = event.get('event')
+        state['last_ts'] = event.get('ts', state['last_ts'])
+        if kind == 'run_started':
+            state['sources_total'] = len(event.get('sources', []))
+            state['started_ts'] = event.get('ts')
+        elif kind == 'source_started':
+            state['current_source'] = event.get('source')
+            state['current_started_ts'] = event.get('ts')
+        elif kind == 'page_fetched':
+            state['pages'] += 1
+        elif kind == 'jobs_extracted':
+            state['jobs'] += event.get('jobs', 0)
+            state['valid'] += event.get('valid', 0)
+        elif kind == 'source_finished':
+            state['sources_done'] += 1
+            state['current_source'] = None
+            if event.get('resumed'):
+                # Unité terminée avant l'interruption du run: pas d'autre événement pour ses offres
+                for key in ('jobs', 'valid', 'added', 'updated'):
+                    state[key] += event.get(key, 0)
+            elif event.get('status') == 'skipped':
+                state['skipped'] += 1
+            else:
+                # Les unités reprises ou ignorées ne comptent pas dans la durée moyenne (ETA)
+                state['source_durations'].append(event.get('duration_s', 0))
+        elif kind == 'db_committed':
+            state['added'] += event.get('added', 0)
+            state['updated'] += event.get('updated', 0)
+        elif kind == 'details_enriched':
+            state['enriched'] += event.get('enriched', 0)
+        elif kind == 'run_finished':
+            state['status'] = event.get('status', 'succeeded')
+            state['current_source'] = None
+
+    # ETA: durée moyenne des sources terminées x sources restantes, moins le temps déjà passé sur la source en cours
+    durations = state['source_durations']
+    remaining = state['sources_total'] - state['sources_done']
+    if state['status'] != 'running' or remaining <= 0:
+        state['eta_s'] = 0 if state['status'] != 'running' else None
+    elif durations:
+        average = sum(durations) / len(durations)
+        elapsed = (time.time() - state['current_started_ts']) if state['current_source'] and state['current_started_ts'] else 0
+        state['eta_s'] = max(average * remaining - min(elapsed, average), 0)
+    return state
@@ -0,0 +1,108 @@
+"""
+Export en flux de la table jobs vers Parquet, Arrow IPC ou JSON Lines.
+
+Les offres sont lues par blocs (pagination par clé) et écrites au fur et à mesure:
+la mémoire utilisée ne dépend que de la taille d'un bloc, pas de la taille de la table.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+EXPORT_FORMATS = ('parquet', 'arrow', 'jsonl')
+
+# Colonnes à faible cardinalité, encodées en dictionnaire (catégories pandas à la relecture)
+CATEGORICAL_COLUMNS = ('role_category', 'source', 'location')
+
+
+def _arrow_schema():
+    """Schéma Arrow de la table jobs."""
+    import pyarrow as pa
+
+    fields = [
+        ('id', pa.int64()),
+        ('job_title', pa.string()),
+        ('company', pa.string()),
+        ('role_category', pa.string()),
+        ('source', pa.string()),
+        ('published_date', pa.timestamp('us')),
+        ('location', pa.string()),
+        ('url', pa.string()),
+        ('snippet', pa.string()),
+        ('detected_keywords', pa.string()),
+        ('applied', pa.bool_()),
+        ('scraped_at', pa.timestamp('us')),
+    ]
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([(name, categorical if name in CATEGORICAL_COLUMNS else type_) for name, type_ in fields])
+
+
+def _to_record_batch(rows: List[Dict], schema):
+    """Convertit un bloc de lignes en RecordBatch Arrow."""
+    import pyarrow as pa
+
+    arrays = [pa.array([row[field.name] for row in rows], type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _json_default(value):
+    """Sérialise les dates en ISO 8601."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable: {type(value)}")
+
+
+def write_jobs(chunks: Iterator[List[Dict]], path: str, fmt: str = 'parquet') -> Dict:
+    """
+    Écrit des blocs d'offres dans un fichier.
+
+    Args:
+        chunks: Itérateur de blocs de lignes (voir DatabaseManager.iter_jobs)
+        path: Fichier de sortie
+        fmt: 'parquet', 'arrow' (flux IPC) ou 'jsonl'
+
+    Returns:
+        {'rows': int, 'chunks': int, 'max_scraped_at': datetime ou None}
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {fmt} (attendu: {', '.join(EXPORT_FORMATS)})")
+
+    stats = {'rows': 0, 'chunks': 0, 'max_scraped_at': None}
+
+    def track(rows: List[Dict]):
+        stats['rows'] += len(rows)
+        stats['chunks'] += 1
+        scraped = [row['scraped_at'] for row in rows if row.get('scraped_at')]
+        if scraped:
+            stats['max_scraped_at'] = max([stats['max_scraped_at'] or scraped[0]] + scraped)
+
+    if fmt == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as f:
+            for rows in chunks:
+                for row in rows:
+                    f.write(json.dumps(row, default=_json_default, ensure_ascii=False) + '\n')
+                track(rows)
+        return stats
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("L'export Parquet/Arrow nécessite pyarrow (pip install pyarrow)") from e
+
+    schema = _arrow_schema()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+    else:
+        # Format flux: chaque bloc peut porter son propre dictionnaire
+        writer = pa.ipc.new_stream(path, schema)
+    try:
+        for rows in chunks:
+            batch = _to_record_batch(rows, schema)
+            if fmt == 'parquet':
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            track(rows)
+    finally:
+        writer.close()
+    return stats
@@ -0,0 +1,563 @@
+"""
+Migrations versionnées du schéma SQLite.
+
+La version courante du schéma est stockée dans `PRAGMA user_version`.
+Chaque migration est appliquée une seule fois, dans sa propre transaction,
+puis la version est incrémentée. Les migrations interdites dans une transaction
+(VACUUM) reçoivent un curseur DBAPI en autocommit.
+"""
+from typing import Any, Callable, List, Tuple
+from sqlalchemy.engine import Connection, Engine
+from scraper.compression import DescriptionCodec
+
+# Liste ordonnée des migrations: (version, description, fonction, dans une transaction)
+MIGRATIONS: List[Tuple[int, str, Callable[[Any], None], bool]] = []
+
+
+def migration(version: int, description: str, transaction: bool = True) -> Callable:
+    """
+    Enregistre une fonction comme migration du schéma.
+
+    Args:
+        transaction: False pour une migration hors transaction: la fonction reçoit alors un
+            curseur DBAPI en autocommit au lieu d'une Connection
+    """
+    def decorator(func: Callable[[Any], None]) -> Callable[[Any], None]:
+        MIGRATIONS.append((version, description, func, transaction))
+        return func
+    return decorator
+
+
+def _table_columns(conn: Connection, table: str) -> set:
+    """Retourne le nom des colonnes d'une table."""
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+@migration(1, "Schéma initial de la table jobs")
+def _initial_schema(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER NOT NULL,
+            job_title VARCHAR(500) NOT NULL,
+            company VARCHAR(300),
+            role_category VARCHAR(100),
+            source VARCHAR(100) NOT NULL,
+            published_date DATETIME,
+            location VARCHAR(300),
+            url VARCHAR(1000),
+            snippet TEXT,
+            detected_keywords VARCHAR(500),
+            applied BOOLEAN DEFAULT 0,
+            scraped_at DATETIME,
+            PRIMARY KEY (id),
+            UNIQUE (url)
+        )
+    """)
+    # Les bases créées avant le suivi des candidatures n'ont pas la colonne
+    if 'applied' not in _table_columns(conn, 'jobs'):
+        conn.exec_driver_sql("ALTER TABLE jobs ADD COLUMN applied BOOLEAN DEFAULT 0")
+
+
+@migration(2, "Index pour les requêtes du dashboard")
+def _dashboard_indexes(conn: Connection):
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_published_date ON jobs (published_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_scraped_at ON jobs (scraped_at)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_source ON jobs (source)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_role_category ON jobs (role_category)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_location ON jobs (location)")
+    # Index d'expression pour le regroupement par jour (get_statistics)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_published_day ON jobs (date(published_date))")
+    conn.exec_driver_sql("ANALYZE jobs")
+
+
+# Dimensions agrégées dans job_stats: nom -> expression SQL ({row} = NEW/OLD)
+STAT_DIMENSIONS = {
+    'category': "coalesce({row}.role_category, '')",
+    'source': "coalesce({row}.source, '')",
+    'day': "coalesce(date({row}.published_date), '')",
+    'location': "coalesce({row}.location, '')",
+}
+
+
+def _stats_delta_sql(row: str, delta: int, with_total: bool) -> str:
+    """Construit l'upsert qui applique +/-1 aux compteurs d'une ligne de jobs."""
+    values = [f"('{dimension}', {expr.format(row=row)}, {delta})" for dimension, expr in STAT_DIMENSIONS.items()]
+    if with_total:
+        values.insert(0, f"('total', '', {delta})")
+    return (
+        "INSERT INTO job_stats (dimension, value, count) VALUES " + ", ".join(values) +
+        " ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;"
+    )
+
+
+@migration(3, "Table job_stats maintenue par triggers")
+def _job_stats(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_stats (
+            dimension VARCHAR(20) NOT NULL,
+            value VARCHAR(300) NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    """)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_job_stats_dimension_count ON job_stats (dimension, count)")
+    
+    # Les compteurs sont mis à jour dans la même transaction que l'écriture sur jobs
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_stats_insert AFTER INSERT ON jobs BEGIN
+            {_stats_delta_sql('NEW', 1, with_total=True)}
+        END
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_stats_delete AFTER DELETE ON jobs BEGIN
+            {_stats_delta_sql('OLD', -1, with_total=True)}
+        END
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_stats_update
+        AFTER UPDATE OF role_category, source, published_date, location ON jobs BEGIN
+            {_stats_delta_sql('OLD', -1, with_total=False)}
+            {_stats_delta_sql('NEW', 1, with_total=False)}
+        END
+    """)
+    
+    # Initialisation à partir des offres existantes
+    conn.exec_driver_sql("DELETE FROM job_stats")
+    conn.exec_driver_sql("INSERT INTO job_stats (dimension, value, count) SELECT 'total', '', count(*) FROM jobs")
+    for dimension, expr in STAT_DIMENSIONS.items():
+        column = expr.format(row='jobs')
+        conn.exec_driver_sql(
+            f"INSERT INTO job_stats (dimension, value, count) "
+            f"SELECT '{dimension}', {column}, count(*) FROM jobs GROUP BY {column}"
+        )
+
+
+# Colonnes de jobs indexées en plein texte
+FTS_COLUMNS = ['job_title', 'company', 'snippet', 'detected_keywords', 'location']
+
+
+@migration(4, "Index plein texte FTS5 sur les offres")
+def _jobs_fts(conn: Connection):
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f'NEW.{column}' for column in FTS_COLUMNS)
+    old_values = ', '.join(f'OLD.{column}' for column in FTS_COLUMNS)
+    
+    # Table externe (content='jobs'): l'index ne duplique pas le texte des offres.
+    # remove_diacritics 2 rend la recherche insensible aux accents, prefix accélère les requêtes "term*"
+    conn.exec_driver_sql(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            {columns},
+            content='jobs',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+        END
+    """)
+    conn.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF {columns} ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO jobs_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END
+    """)
+    conn.exec_driver_sql("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+def split_keywords(value: str) -> List[str]:
+    """Découpe la colonne detected_keywords ("a, b, c") en liste de mots-clés."""
+    return [keyword.strip() for keyword in (value or '').split(',') if keyword.strip()]
+
+
+@migration(5, "Tables keywords et job_keywords")
+def _job_keywords(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS keywords (
+            id INTEGER NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (name)
+        )
+    """)
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_keywords (
+            job_id INTEGER NOT NULL,
+            keyword_id INTEGER NOT NULL,
+            PRIMARY KEY (job_id, keyword_id)
+        ) WITHOUT ROWID
+    """)
+    # Index inverse: offres d'un mot-clé (filtres et facettes)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_job_keywords_keyword ON job_keywords (keyword_id, job_id)")
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS jobs_keywords_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_keywords WHERE job_id = OLD.id;
+        END
+    """)
+    
+    # Initialisation à partir de la colonne detected_keywords
+    pairs = []
+    for job_id, detected in conn.exec_driver_sql("SELECT id, detected_keywords FROM jobs WHERE detected_keywords != ''"):
+        pairs.extend((job_id, keyword) for keyword in split_keywords(detected))
+    if pairs:
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO keywords (name) VALUES (?)",
+            [(keyword,) for keyword in sorted({keyword for _, keyword in pairs})]
+        )
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO job_keywords (job_id, keyword_id) "
+            "SELECT ?, id FROM keywords WHERE name = ?",
+            pairs
+        )
+
+
+@migration(6, "Historique des apparitions (job_sightings, job_lifetimes) et runs de scraping")
+def _job_sightings(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS scrape_runs (
+            id INTEGER NOT NULL,
+            started_at DATETIME NOT NULL,
+            finished_at DATETIME,
+            PRIMARY KEY (id)
+        )
+    """)
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS sources (
+            id INTEGER NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (name)
+        )
+    """)
+    # Table en ajout seul, encodée en entiers (seen_at en secondes epoch UTC)
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_sightings (
+            job_id INTEGER NOT NULL,
+            source_id INTEGER NOT NULL,
+            run_id INTEGER NOT NULL,
+            seen_at INTEGER NOT NULL,
+            PRIMARY KEY (job_id, source_id, run_id)
+        ) WITHOUT ROWID
+    """)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_job_sightings_seen_at ON job_sightings (seen_at)")
+    
+    # Résumé par (offre, source) tenu à jour par trigger: les métriques de durée de vie
+    # lisent une ligne par offre au lieu de toutes les apparitions
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_lifetimes (
+            job_id INTEGER NOT NULL,
+            source_id INTEGER NOT NULL,
+            first_seen INTEGER NOT NULL,
+            last_seen INTEGER NOT NULL,
+            sightings INTEGER NOT NULL,
+            published_at INTEGER,
+            PRIMARY KEY (job_id, source_id)
+        ) WITHOUT ROWID
+    """)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_job_lifetimes_source_last_seen ON job_lifetimes (source_id, last_seen)")
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS job_sightings_lifetime AFTER INSERT ON job_sightings BEGIN
+            INSERT INTO job_lifetimes (job_id, source_id, first_seen, last_seen, sightings, published_at)
+            VALUES (
+                NEW.job_id, NEW.source_id, NEW.seen_at, NEW.seen_at, 1,
+                (SELECT CAST(strftime('%s', published_date) AS INTEGER) FROM jobs WHERE id = NEW.job_id)
+            )
+            ON CONFLICT (job_id, source_id) DO UPDATE SET
+                first_seen = min(first_seen, excluded.first_seen),
+                last_seen = max(last_seen, excluded.last_seen),
+                sightings = sightings + 1,
+                published_at = coalesce(published_at, excluded.published_at);
+        END
+    """)
+    
+    # Les offres existantes comptent comme vues une fois (run 0) à leur dernier scraped_at
+    conn.exec_driver_sql("INSERT OR IGNORE INTO sources (name) SELECT DISTINCT source FROM jobs WHERE source IS NOT NULL")
+    conn.exec_driver_sql("""
+        INSERT OR IGNORE INTO job_sightings (job_id, source_id, run_id, seen_at)
+        SELECT jobs.id, sources.id, 0, CAST(strftime('%s', coalesce(jobs.scraped_at, 'now')) AS INTEGER)
+        FROM jobs JOIN sources ON sources.name = jobs.source
+    """)
+
+
+@migration(7, "Compteur de version des données (db_meta)")
+def _data_version(conn: Connection):
+    # Incrémenté par chaque écriture de DatabaseManager: clé de cache des lecteurs
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS db_meta (
+            key VARCHAR(50) NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (key)
+        ) WITHOUT ROWID
+    """)
+    conn.exec_driver_sql("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)")
+
+
+@migration(8, "Index composites pour les filtres et tris du tableau")
+def _table_filter_indexes(conn: Connection):
+    # Comptages couverts pour catégorie/source/statut, page triée par date pour chaque combinaison
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_category_source_applied "
+        "ON jobs (role_category, source, applied, published_date)"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_source_published_date ON jobs (source, published_date)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_jobs_company ON jobs (company)")
+    conn.exec_driver_sql("ANALYZE jobs")
+
+
+# Colonnes de suivi ajoutées à scrape_runs: nom -> définition
+RUN_TRACKING_COLUMNS = {
+    'status': "VARCHAR(20) NOT NULL DEFAULT 'running'",
+    'pid': "INTEGER",
+    'heartbeat_at': "DATETIME",
+    'current_source': "VARCHAR(100)",
+    'progress': "TEXT",
+    'jobs_scraped': "INTEGER NOT NULL DEFAULT 0",
+    'jobs_added': "INTEGER NOT NULL DEFAULT 0",
+    'jobs_updated': "INTEGER NOT NULL DEFAULT 0",
+    'jobs_skipped': "INTEGER NOT NULL DEFAULT 0",
+    'error': "TEXT",
+}
+
+
+@migration(9, "Suivi des runs de scraping (statut, progression, heartbeat) et verrou")
+def _run_tracking(conn: Connection):
+    existing = _table_columns(conn, 'scrape_runs')
+    for name, definition in RUN_TRACKING_COLUMNS.items():
+        if name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE scrape_runs ADD COLUMN {name} {definition}")
+    conn.exec_driver_sql(
+        "UPDATE scrape_runs SET status = CASE WHEN finished_at IS NULL THEN 'failed' ELSE 'succeeded' END"
+    )
+    # Verrou: au plus un run en attente ou en cours
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_scrape_runs_active ON scrape_runs ((status IN ('queued', 'running'))) "
+        "WHERE status IN ('queued', 'running')"
+    )
+
+
+@migration(10, "Planification du mode démon (schedule_state)")
+def _schedule_state(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS schedule_state (
+            source VARCHAR(100) NOT NULL,
+            query VARCHAR(200) NOT NULL,
+            location VARCHAR(100) NOT NULL,
+            interval_s INTEGER NOT NULL,
+            next_due_at DATETIME NOT NULL,
+            last_started_at DATETIME,
+            last_finished_at DATETIME,
+            last_success_at DATETIME,
+            last_status VARCHAR(20),
+            last_jobs INTEGER,
+            failures INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            PRIMARY KEY (source, query, location)
+        ) WITHOUT ROWID
+    """)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_schedule_state_next_due_at ON schedule_state (next_due_at)")
+
+
+@migration(11, "File de tâches de scraping (scrape_tasks)")
+def _scrape_tasks(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS scrape_tasks (
+            id INTEGER NOT NULL,
+            run_id INTEGER NOT NULL,
+            source VARCHAR(100) NOT NULL,
+            query VARCHAR(200) NOT NULL,
+            country VARCHAR(100) NOT NULL,
+            location VARCHAR(100) NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at DATETIME NOT NULL,
+            worker VARCHAR(100),
+            lease_expires_at DATETIME,
+            started_at DATETIME,
+            finished_at DATETIME,
+            jobs INTEGER NOT NULL DEFAULT 0,
+            valid INTEGER NOT NULL DEFAULT 0,
+            added INTEGER NOT NULL DEFAULT 0,
+            updated INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            PRIMARY KEY (id),
+            UNIQUE (run_id, source, query, country, location)
+        )
+    """)
+    # Prise de tâche: tâches disponibles (pending) ou dont le bail a expiré (leased), par ordre d'insertion
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_scrape_tasks_status_available ON scrape_tasks (status, available_at)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_scrape_tasks_status_lease ON scrape_tasks (status, lease_expires_at)")
+
+
+@migration(12, "Paramètres des runs (reprise d'un run interrompu)")
+def _run_params(conn: Connection):
+    if 'params' not in _table_columns(conn, 'scrape_runs'):
+        conn.exec_driver_sql("ALTER TABLE scrape_runs ADD COLUMN params TEXT")
+
+
+@migration(13, "Requêtes HTTP par tâche (rendement des couples source, requête)")
+def _task_requests(conn: Connection):
+    if 'requests' not in _table_columns(conn, 'scrape_tasks'):
+        conn.exec_driver_sql("ALTER TABLE scrape_tasks ADD COLUMN requests INTEGER NOT NULL DEFAULT 0")
+    # Agrégation du rendement par (source, requête) sur une fenêtre de dates
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_scrape_tasks_source_query ON scrape_tasks (source, query, finished_at)"
+    )
+
+
+@migration(14, "Descriptions complètes des offres (job_descriptions)")
+def _job_descriptions(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_descriptions (
+            job_id INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            method VARCHAR(10) NOT NULL,
+            fetched_at DATETIME NOT NULL,
+            fetch_ms INTEGER,
+            PRIMARY KEY (job_id)
+        )
+    """)
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS jobs_descriptions_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_descriptions WHERE job_id = OLD.id;
+        END
+    """)
+
+
+@migration(15, "Descriptions compressées (job_descriptions.body, description_dicts)")
+def _compressed_descriptions(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS description_dicts (
+            id INTEGER NOT NULL,
+            codec VARCHAR(10) NOT NULL,
+            dictionary BLOB NOT NULL,
+            samples INTEGER NOT NULL,
+            created_at DATETIME NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """)
+    if 'body' in _table_columns(conn, 'job_descriptions'):
+        return
+    conn.exec_driver_sql("""
+        CREATE TABLE job_descriptions_new (
+            job_id INTEGER NOT NULL,
+            codec VARCHAR(10) NOT NULL,
+            dict_id INTEGER,
+            body BLOB NOT NULL,
+            raw_size INTEGER NOT NULL,
+            method VARCHAR(10) NOT NULL,
+            fetched_at DATETIME NOT NULL,
+            fetch_ms INTEGER,
+            PRIMARY KEY (job_id)
+        )
+    """)
+    # Descriptions existantes: zlib sans dictionnaire (recompressées à l'entraînement du premier dictionnaire)
+    codec = DescriptionCodec('zlib')
+    rows = conn.exec_driver_sql(
+        "SELECT job_id, description, method, fetched_at, fetch_ms FROM job_descriptions"
+    ).fetchall()
+    for job_id, description, method, fetched_at, fetch_ms in rows:
+        conn.exec_driver_sql(
+            "INSERT INTO job_descriptions_new (job_id, codec, dict_id, body, raw_size, method, fetched_at, fetch_ms) "
+            "VALUES (?, 'zlib', NULL, ?, ?, ?, ?, ?)",
+            (job_id, codec.compress(description), len(description.encode('utf-8')), method, fetched_at, fetch_ms)
+        )
+    # Le trigger de suppression référence la table: recréé après le renommage
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS jobs_descriptions_delete")
+    conn.exec_driver_sql("DROP TABLE job_descriptions")
+    conn.exec_driver_sql("ALTER TABLE job_descriptions_new RENAME TO job_descriptions")
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS jobs_descriptions_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_descriptions WHERE job_id = OLD.id;
+        END
+    """)
+
+
+@migration(16, "Compétences des offres (skills, job_skills)")
+def _job_skills(conn: Connection):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            family VARCHAR(100) NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (name)
+        )
+    """)
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS job_skills (
+            job_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            in_title BOOLEAN NOT NULL,
+            PRIMARY KEY (job_id, skill_id)
+        ) WITHOUT ROWID
+    """)
+    # Index inverse: offres d'une compétence (filtres et facettes)
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_job_skills_skill ON job_skills (skill_id, job_id)")
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS jobs_skills_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_skills WHERE job_id = OLD.id;
+        END
+    """)
+    # Pas d'initialisation ici: la taxonomie vit dans config.SKILLS et change sans migration;
+    # DatabaseManager.refresh_skills analyse les offres existantes (fin de run, --extract-skills)
+
+
+@migration(17, "Compétences des offres archivées (job_skills de l'archive)")
+def _archive_skills(conn: Connection):
+    # Les offres archivées avant cette version n'ont pas de lignes job_skills dans l'archive:
+    # l'empreinte oubliée, refresh_skills les analyse au prochain run
+    conn.exec_driver_sql("DELETE FROM db_meta WHERE key = 'skills_taxonomy'")
+
+
+@migration(18, "Base principale en auto_vacuum incrémental", transaction=False)
+def _incremental_auto_vacuum(cursor):
+    # Le mode auto_vacuum d'une base existante ne change qu'après un VACUUM complet (verrou
+    # exclusif): fait une fois ici; l'entretien après archivage se contente du VACUUM incrémental
+    if cursor.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+        cursor.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM main")
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Retourne la version du schéma appliquée à la base."""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Applique les migrations manquantes.
+
+    Returns:
+        Liste des versions appliquées
+    """
+    applied = []
+    for version, description, func, transaction in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if transaction:
+            with engine.begin() as conn:
+                if version <= get_schema_version(conn):
+                    continue
+                func(conn)
+                conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+        else:
+            with engine.connect() as conn:
+                if version <= get_schema_version(conn):
+                    continue
+            # Connexion DBAPI en autocommit (isolation_level None, voir _configure_sqlite)
+            raw = engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                func(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
+                cursor.close()
+            finally:
+                raw.close()
+        applied.append(version)
+    return applied
@@ -2,11 +2,21 @@
 Pipeline principal de scraping d'offres d'emploi.
 Orchestre les différentes sources et applique les filtres.
 """
+import os
 import sys
-from typing import List, Dict, Callable, Optional
+import time
+import socket
+import threading
+from typing import List, Dict, Callable, Optional, Tuple
 from datetime import datetime
 from playwright.sync_api import sync_playwright
 from scraper.db import DatabaseManager
+from scraper.writer import BatchWriter
+from scraper.snapshot import write_snapshot
+from scraper.browser import ensure_chromium_installed, connect_browser
+from scraper.planner import plan_tasks, format_plan
+from scraper.budget import allocate_budget
+from scraper.enrich import DetailFetcher, summarize_costs
 from scraper.utils import (
     is_recent, is_valid_location, matches_keywords,
     categorize_role, detect_keywords, clean_text
@@ -18,7 +28,10 @@ from scraper.sources.hellowork_scraper import HelloWorkScraper
 from scraper.sources.apec_scraper import APECScraper
 from scraper.sources.glassdoor_scraper import GlassdoorScraper
 from scraper.sources.search_scraper import SearchScraper
-from config import HEADLESS, BROWSER_TIMEOUT
+from config import (
+    BROWSER_TIMEOUT, HEARTBEAT_INTERVAL, ENRICH_DETAILS, ENRICH_BROWSER_FALLBACK, ENRICH_MAX_JOBS,
+    DESCRIPTION_DICT_MIN_SAMPLES
+)
 
 
 class ScrapingPipeline:
@@ -37,9 +50,42 @@ class ScrapingPipeline:
             SearchScraper()
         ]
     
-    def run(self, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> Dict:
+    def run(self, country: str = "France", location: str = "France", queries: Optional[List[str]] = None,
+            progress_callback: Optional[Callable] = None, run_id: Optional[int] = None,
+            event_callback: Optional[Callable] = None, units: Optional[List[Tuple[str, Optional[str]]]] = None,
+            browser=None, stop_event: Optional[threading.Event] = None, resume: bool = False,
+            locations: Optional[List[Tuple[str, str]]] = None, max_requests: Optional[int] = None,
+            max_seconds: Optional[float] = None, enrich: Optional[bool] = None) -> Dict:
         """
         Exécute le pipeline complet de scraping.
+        
+        La progression (statut par source, compteurs, heartbeat) est enregistrée dans scrape_runs.
+        
+        Args:
+            run_id: Run créé en attente par l'application (statut 'queued'); sinon un run est créé
+            event_callback: Reçoit les événements structurés (event, **champs), voir scraper/events.py
+            units: Couples (source, requête) à exécuter, requête None pour les requêtes par défaut
+                de la source; par défaut chaque source avec chaque requête de queries
+            browser: Navigateur déjà lancé (mode démon), laissé ouvert à la fin du run
+            stop_event: Arrêt demandé: les unités restantes sont ignorées (statut 'skipped')
+            resume: Reprendre le dernier run interrompu lancé avec les mêmes paramètres (moins de
+                RESUME_MAX_HOURS heures): ses unités terminées ne sont pas refaites
+            locations: Couples (pays, lieu) couverts en un seul run (voir scraper/planner.py);
+                par défaut (country, location)
+            max_requests / max_seconds: Budget du run (voir scraper/budget.py): seules les unités
+                au meilleur rendement, plus une part d'exploration, sont exécutées, et le run
+                s'arrête une fois le budget réellement consommé
+            enrich: Télécharger la description complète des offres nouvelles du run (voir
+                scraper/enrich.py); par défaut config.ENRICH_DETAILS
+        
+        Returns:
+            Statistiques du run, dont 'units': résultat de chaque unité (source, query, country,
+            location, status, jobs, valid, requests, error), 'plan': résumé de la planification
+            'budget': répartition du budget (None sans budget) et 'enrichment': coût de
+            l'enrichissement par source
+        
+        Raises:
+            RuntimeError: si un autre run est déjà en cours
         """
         # Fix redondant pour Windows au cas où le thread Streamlit l'outrepasse
         if sys.platform == 'win32':
@@ -49,53 +95,378 @@ class ScrapingPipeline:
             except Exception:
                 pass
 
-        self._log("🚀 Démarrage du pipeline de scraping...", progress_callback)
+        targets = locations or [(country, location)]
+        plan, plan_summary = self._plan_units(queries, units, targets)
+        progress = {label: {'status': 'pending'} for label, *_ in plan}
+        # Paramètres du run: un run interrompu est repris par un run lancé avec les mêmes paramètres
+        params = {'country': country, 'location': location, 'locations': [list(target) for target in targets],
+                  'units': [[source.source_name, query, unit_country, unit_location]
+                            for _, source, query, unit_country, unit_location in plan]}
+        if max_requests is not None or max_seconds is not None:
+            params['budget'] = [max_requests, max_seconds]
+        if run_id is None:
+            run_id = self.db.start_run(pid=os.getpid(), progress=progress, params=params, resume=resume)
+            if run_id is None:
+                raise RuntimeError("Un scraping est déjà en cours")
+        elif not self.db.claim_run(run_id, os.getpid(), progress=progress, params=params):
+            raise RuntimeError(f"Le run #{run_id} n'est pas en attente")
+        
+        def emit(event: str, **fields):
+            if event_callback:
+                event_callback(event, **fields)
         
-        # Collecter les offres de toutes les sources
-        all_raw_jobs = []
+        # Heartbeat en arrière-plan pendant tout le run: certaines étapes (enrichissement, écritures)
+        # ne journalisent rien pendant plus de STALE_RUN_SECONDS
+        heartbeat_stop = threading.Event()
+        
+        def heartbeat():
+            while not heartbeat_stop.wait(HEARTBEAT_INTERVAL):
+                try:
+                    self.db.update_run(run_id)
+                except Exception as e:
+                    print(f"⚠️  Heartbeat du run #{run_id}: {e}")
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=HEADLESS)
+        threading.Thread(target=heartbeat, name=f"run-{run_id}-heartbeat", daemon=True).start()
+        run_start = time.monotonic()
+        # Tout échec après la réservation du run le clôt en échec (sinon il resterait actif)
+        try:
+            # Points de reprise: chaque unité est enregistrée dans scrape_tasks, terminée une fois ses offres écrites
+            worker = f"pipeline:{socket.gethostname()}:{os.getpid()}"
+            finished = {
+                (task['source'], task['query'], task['country'], task['location']): task
+                for task in self.db.get_run_tasks(run_id) if task['status'] == 'done'
+            }
+            if finished:
+                self._log(f"♻️  Reprise du run #{run_id}: {len(finished)}/{len(plan)} unités déjà terminées", progress_callback)
+            resumed = {key: sum(task[key] for task in finished.values()) for key in ('jobs', 'valid', 'added', 'updated')}
+            
+            # Budget: unités retenues selon le rendement mesuré de chaque (source, requête)
+            budget = None
+            if max_requests is not None or max_seconds is not None:
+                candidates = []
+                for item in plan:
+                    _, source, query, unit_country, unit_location = item
+                    key = (source.source_name, query or '', unit_country, unit_location)
+                    # Unités terminées d'un run repris: gardées sans coût
+                    candidates.append({'source': key[0], 'query': key[1], 'plan': item, 'resumed': key in finished})
+                budget = allocate_budget(candidates, self.db.get_query_yields(),
+                                         max_requests=max_requests, max_seconds=max_seconds)
+                self._log(
+                    f"💰 Budget: {len(budget['units'])}/{len(plan)} unités retenues ({budget['exploited']} au meilleur "
+                    f"rendement, {budget['explored']} en exploration), ~{budget['estimated_requests']} requêtes et "
+                    f"~{budget['estimated_seconds']} s estimées", progress_callback
+                )
+                plan = [unit['plan'] for unit in budget['units']]
+                progress = {label: {'status': 'pending'} for label, *_ in plan}
+                self.db.update_run(run_id, progress=progress)
             
             for source in self.sources:
-                self._log(f"\n📡 Source: {source.source_name}", progress_callback)
+                source.event_callback = event_callback
+            
+            self._log("🚀 Démarrage du pipeline de scraping...", progress_callback)
+            if len(targets) > 1:
+                self._log(f"📍 {len(targets)} lieux: {format_plan(plan_summary)}", progress_callback)
+            emit('run_started', run_id=run_id, sources=[label for label, *_ in plan])
+            
+            # Les offres filtrées sont enregistrées au fil de l'eau par un thread d'écriture unique
+            writer = BatchWriter(self.db, run_id=run_id, on_commit=lambda result: emit('db_committed', **result)).start()
+            total_scraped = resumed['jobs']
+            total_valid = resumed['valid']
+            unit_results = []
+            # Navigateur utilisé: 'shared' (navigateur partagé), 'local' ou 'external' (fourni par l'appelant)
+            browser_info = {'mode': 'external', 'startup_ms': 0, 'saved_ms': 0}
+            enrichment = {}
+            # Consommation réelle du budget (requêtes HTTP, durée de scraping)
+            spent = {'requests': 0, 'start': time.monotonic()}
+            
+            def budget_exhausted() -> bool:
+                if max_requests is not None and spent['requests'] >= max_requests:
+                    return True
+                return max_seconds is not None and time.monotonic() - spent['start'] >= max_seconds
+            
+            def report(message: str):
+                # Messages des scrapers relayés au journal du run
+                self._log(message, progress_callback)
+            
+            def save_progress(current_source: Optional[str] = None):
+                db_stats = writer.stats
+                self.db.update_run(
+                    run_id, progress=progress, current_source=current_source, jobs_scraped=total_scraped,
+                    jobs_added=db_stats['added'] + resumed['added'], jobs_updated=db_stats['updated'] + resumed['updated'],
+                    jobs_skipped=db_stats['skipped']
+                )
+            
+            def scrape_units(browser, relaunch: Optional[Callable] = None):
+                nonlocal total_scraped, total_valid
+                for index, (label, source, query, country, location) in enumerate(plan):
+                    result = {'source': source.source_name, 'query': query, 'country': country, 'location': location,
+                              'status': 'skipped', 'jobs': 0, 'valid': 0, 'requests': 0, 'error': None}
+                    unit_results.append(result)
+                    task = finished.get((source.source_name, query or '', country, location))
+                    if task is not None:
+                        progress[label] = {'status': 'done', 'jobs': task['jobs'], 'valid': task['valid'], 'resumed': True}
+                        result.update(status='done', jobs=task['jobs'], valid=task['valid'], resumed=True)
+                        # Offres déjà enregistrées avant l'interruption: comptées sans jobs_extracted ni db_committed
+                        emit('source_finished', source=source.source_name, status='done', jobs=task['jobs'],
+                             valid=task['valid'], added=task['added'], updated=task['updated'], duration_s=0, resumed=True)
+                        continue
+                    if stop_event is not None and stop_event.is_set():
+                        progress[label] = {'status': 'skipped'}
+                        emit('source_finished', source=source.source_name, status='skipped', jobs=0, valid=0,
+                             duration_s=0, error='arrêt demandé')
+                        continue
+                    if budget_exhausted():
+                        progress[label] = {'status': 'skipped', 'error': 'budget épuisé'}
+                        result.update(error='budget épuisé')
+                        emit('source_finished', source=source.source_name, status='skipped', jobs=0, valid=0,
+                             duration_s=0, error='budget épuisé')
+                        continue
                 
-                try:
-                    jobs = source.scrape(browser, country=country, location=location, queries=queries, progress_callback=progress_callback)
-                    all_raw_jobs.extend(jobs)
-                    self._log(f"✅ {source.source_name}: {len(jobs)} offres récupérées", progress_callback)
-                except Exception as e:
-                    self._log(f"❌ {source.source_name}: Erreur - {str(e)}", progress_callback)
-                    continue
+                    if relaunch is not None and not browser.is_connected():
+                        self._log("♻️  Navigateur déconnecté, relance...", progress_callback)
+                        browser = relaunch()
+                
+                    self._log(f"\n📡 Source: {label}", progress_callback)
+                    progress[label] = {'status': 'running'}
+                    save_progress(label)
+                    task_id = self.db.start_task(run_id, source.source_name, query or '', country, location, worker)
+                    emit('source_started', source=source.source_name, index=index, query=query)
+                    source_start = time.monotonic()
+                    requests_before = source.requests
+                
+                    try:
+                        jobs = source.scrape(browser, country=country, location=location,
+                                             queries=[query] if query else None, progress_callback=report)
+                        self._log(f"✅ {label}: {len(jobs)} offres récupérées", progress_callback)
+                    except Exception as e:
+                        self._log(f"❌ {label}: Erreur - {str(e)}", progress_callback)
+                        progress[label] = {'status': 'failed', 'error': str(e)}
+                        unit_requests = source.requests - requests_before
+                        spent['requests'] += unit_requests
+                        result.update(status='failed', error=str(e), requests=unit_requests)
+                        self.db.fail_task(task_id, worker, str(e), requests=unit_requests)
+                        emit('source_finished', source=source.source_name, status='failed', jobs=0, valid=0,
+                             duration_s=round(time.monotonic() - source_start, 2), error=str(e))
+                        continue
+                
+                    unit_requests = source.requests - requests_before
+                    spent['requests'] += unit_requests
+                
+                    # Filtrer et enrichir puis confier l'écriture au thread dédié
+                    filtered_jobs = self._filter_and_enrich(jobs, self._filter_location(source, country, location),
+                                                            progress_callback)
+                    total_scraped += len(jobs)
+                    total_valid += len(filtered_jobs)
+                    emit('jobs_extracted', source=source.source_name, jobs=len(jobs), valid=len(filtered_jobs))
+                    before = writer.stats
+                    writer.put_many(filtered_jobs)
+                    # Point de reprise: l'unité n'est terminée qu'une fois ses offres enregistrées
+                    writer.flush()
+                    after = writer.stats
+                    self.db.complete_task(task_id, worker, jobs=len(jobs), valid=len(filtered_jobs),
+                                          added=after['added'] - before['added'], updated=after['updated'] - before['updated'],
+                                          requests=unit_requests)
+                    progress[label] = {'status': 'done', 'jobs': len(jobs), 'valid': len(filtered_jobs)}
+                    result.update(status='done', jobs=len(jobs), valid=len(filtered_jobs), requests=unit_requests)
+                    emit('source_finished', source=source.source_name, status='done', jobs=len(jobs),
+                         valid=len(filtered_jobs), duration_s=round(time.monotonic() - source_start, 2))
+                return browser
+            
+            def scrape_and_enrich(browser, relaunch: Optional[Callable] = None):
+                browser = scrape_units(browser, relaunch)
+                if (ENRICH_DETAILS if enrich is None else enrich) and not (stop_event is not None and stop_event.is_set()):
+                    if relaunch is not None and not browser.is_connected():
+                        browser = relaunch()
+                    save_progress('enrichissement')
+                    enrichment.update(self._enrich_new_jobs(run_id, browser, progress_callback, emit))
+                return browser
             
-            browser.close()
+            try:
+                if browser is not None:
+                    scrape_and_enrich(browser)
+                else:
+                    # Installation de Chromium différée au premier scraping (l'application ne fait que vérifier)
+                    ensure_chromium_installed(report)
+                    with sync_playwright() as p:
+                        def relaunch():
+                            # Navigateur partagé s'il est démarré (relancé s'il a planté), sinon local
+                            launched, info = connect_browser(p, report)
+                            browser_info.update(info)
+                            return launched
+                        
+                        scrape_and_enrich(relaunch(), relaunch).close()
+            finally:
+                # Enregistrer ce qui a été collecté, même si le navigateur a planté
+                self._log("\n💾 Finalisation des écritures en base de données...", progress_callback)
+                db_stats = writer.close()
+                db_stats['added'] += resumed['added']
+                db_stats['updated'] += resumed['updated']
+            
+            self._log(f"\n📊 Total brut: {total_scraped} offres", progress_callback)
+            self._log(f"✅ Offres valides: {total_valid}", progress_callback)
+            self._log(f"❌ Offres filtrées: {total_scraped - total_valid}", progress_callback)
+            
+            self._log(f"✅ Nouvelles offres: {db_stats['added']}", progress_callback)
+            self._log(f"🔄 Offres mises à jour: {db_stats['updated']}", progress_callback)
+            self._log(f"⏭️  Doublons ignorés: {db_stats['skipped']}", progress_callback)
+            writer_stats = db_stats['writer']
+            self._log(
+                f"🧵 Écritures: {writer_stats['batches']} lots (moy. {writer_stats['avg_batch_size']} offres, "
+                f"commit moy. {writer_stats['avg_commit_ms']} ms), file max {writer_stats['max_queue_depth']}",
+                progress_callback
+            )
+            
+            # Statistiques finales
+            stats = {
+                **db_stats,
+                'run_id': run_id,
+                'units': unit_results,
+                'plan': {key: value for key, value in plan_summary.items() if key != 'tasks'},
+                'budget': {key: value for key, value in budget.items() if key not in ('units', 'dropped')}
+                          if budget else None,
+                'enrichment': enrichment,
+                'browser': browser_info,
+                'total_scraped': total_scraped,
+                'filtered_out': total_scraped - total_valid
+            }
+            
+            # Rétention: archiver les offres anciennes pour garder la table jobs petite
+            stats['archived'] = self.apply_retention(progress_callback)
+            
+            # Instantané lu par le dashboard (statistiques + offres récentes)
+            self.refresh_snapshot()
+        except BaseException as e:
+            error = str(e) or type(e).__name__
+            self.db.finish_run(run_id, status='failed', error=error, progress=progress)
+            emit('run_finished', status='failed', duration_s=round(time.monotonic() - run_start, 2), error=error)
+            raise
+        finally:
+            heartbeat_stop.set()
+            for source in self.sources:
+                source.event_callback = None
         
-        self._log(f"\n📊 Total brut: {len(all_raw_jobs)} offres", progress_callback)
+        self.db.finish_run(
+            run_id, status='succeeded', progress=progress, jobs_scraped=total_scraped,
+            jobs_added=db_stats['added'], jobs_updated=db_stats['updated'], jobs_skipped=db_stats['skipped']
+        )
+        emit('run_finished', status='succeeded', duration_s=round(time.monotonic() - run_start, 2))
+        self._log("\n✨ Pipeline terminé!", progress_callback)
+        return stats
+    
+    def _plan_units(self, queries: Optional[List[str]] = None,
+                    units: Optional[List[Tuple[str, Optional[str]]]] = None,
+                    targets: Optional[List[Tuple[str, str]]] = None) -> Tuple[List[Tuple], Dict]:
+        """
+        Unités du run: (libellé de progression, scraper, requête, pays, lieu), et résumé du plan.
+
+        Une unité par recherche distincte (source, requête, pays, lieu), libellée "source · requête"
+        (suivi du lieu ou du pays pris en compte par la source quand le run couvre plusieurs
+        lieux). Sans units, chaque source avec chaque requête de queries (ou ses requêtes par
+        défaut). Une requête None exécute les requêtes par défaut de la source en une seule unité.
+        """
+        targets = targets or [("France", "France")]
+        summary = plan_tasks(self.sources, targets, queries=queries, units=units)
+        sources = {source.source_name: source for source in self.sources}
+        plan = []
+        for task in summary['tasks']:
+            source = sources[task['source']]
+            label = f"{task['source']} · {task['query']}" if task['query'] else task['source']
+            if len(targets) > 1 and (source.uses_location or source.uses_country):
+                label += f" · {task['location'] if source.uses_location else task['country']}"
+            plan.append((label, source, task['query'], task['country'], task['location']))
+        return plan, summary
+    
+    def _enrich_new_jobs(self, run_id: int, browser=None, progress_callback: Optional[Callable] = None,
+                         emit: Optional[Callable] = None) -> Dict[str, Dict]:
+        """
+        Télécharge la description des offres insérées pendant le run et recalcule leurs mots-clés.
         
-        # Filtrer et enrichir les offres
-        self._log("\n🔍 Filtrage et enrichissement...", progress_callback)
-        filtered_jobs = self._filter_and_enrich(all_raw_jobs, location, progress_callback)
+        Returns:
+            Coût par source (voir scraper.enrich.summarize_costs)
+        """
+        jobs = self.db.get_jobs_to_enrich(run_id, limit=ENRICH_MAX_JOBS)
+        if not jobs:
+            return {}
+        self._log(f"\n🔎 Enrichissement: {len(jobs)} nouvelles offres", progress_callback)
+        results = DetailFetcher().fetch_all(jobs, browser=browser if ENRICH_BROWSER_FALLBACK else None,
+                                            progress_callback=lambda message: self._log(message, progress_callback))
         
-        self._log(f"✅ Offres valides: {len(filtered_jobs)}", progress_callback)
-        self._log(f"❌ Offres filtrées: {len(all_raw_jobs) - len(filtered_jobs)}", progress_callback)
+        rows = []
+        for job, result in zip(jobs, results):
+            if not result['description']:
+                continue
+            text = f"{job['job_title']} {job['snippet'] or ''} {result['description']}"
+            row = {'job_id': job['id'], 'description': result['description'], 'method': result['method'],
+                   'fetch_ms': result['fetch_ms'], 'detected_keywords': ', '.join(sorted(detect_keywords(text)))}
+            # La catégorie reste celle du titre, sauf si le titre seul n'a pas suffi
+            if job['role_category'] in (None, 'Other'):
+                row['role_category'] = categorize_role(text)
+            rows.append(row)
+        self.db.save_descriptions(rows)
         
-        # Sauvegarder en base
-        self._log("\n💾 Sauvegarde en base de données...", progress_callback)
-        db_stats = self.db.bulk_upsert(filtered_jobs)
+        # Premier dictionnaire de compression dès que les descriptions sont assez nombreuses
+        volume = self.db.get_description_stats()
+        if volume['dict_id'] is None and volume['rows'] >= DESCRIPTION_DICT_MIN_SAMPLES:
+            trained = self.db.train_description_dictionary()
+            self._log(f"🗜️  Dictionnaire {trained['codec']} entraîné sur {trained['samples']} descriptions: "
+                      f"taux de compression {trained['ratio']}", progress_callback)
         
-        self._log(f"✅ Nouvelles offres: {db_stats['added']}", progress_callback)
-        self._log(f"🔄 Offres mises à jour: {db_stats['updated']}", progress_callback)
-        self._log(f"⏭️  Doublons ignorés: {db_stats['skipped']}", progress_callback)
+        costs = summarize_costs(results)
+        for source, cost in costs.items():
+            self._log(
+                f"🔎 {source}: {cost['enriched']}/{cost['jobs']} descriptions ({cost['http']} HTTP, "
+                f"{cost['browser']} navigateur), {cost['requests']} requêtes, {cost['seconds']} s cumulées", progress_callback
+            )
+            if emit:
+                emit('details_enriched', source=source, **cost)
+        return costs
+    
+    def get_source(self, source_name: str):
+        """Scraper d'une source (ValueError si elle n'existe pas)."""
+        for source in self.sources:
+            if source.source_name == source_name:
+                return source
+        raise ValueError(f"Sources inconnues: {source_name}")
+    
+    @staticmethod
+    def _filter_location(source, country: str, location: str) -> str:
+        """Lieu cible du filtre de localisation: le pays pour une source qui ignore le lieu (tâche fusionnée)."""
+        return location if source.uses_location else country
+    
+    def scrape_unit(self, browser, source_name: str, query: Optional[str] = None, country: str = "France",
+                    location: str = "France", progress_callback: Optional[Callable] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Scrape une unité (source, requête, lieu) sans l'enregistrer (utilisé par les workers de la file).
         
-        # Statistiques finales
-        stats = {
-            **db_stats,
-            'total_scraped': len(all_raw_jobs),
-            'filtered_out': len(all_raw_jobs) - len(filtered_jobs)
-        }
+        Returns:
+            (offres brutes, offres filtrées et enrichies)
+        """
+        source = self.get_source(source_name)
+        jobs = source.scrape(browser, country=country, location=location, queries=[query] if query else None,
+                             progress_callback=lambda message: self._log(message, progress_callback))
+        return jobs, self._filter_and_enrich(jobs, self._filter_location(source, country, location), progress_callback)
+    
+    def apply_retention(self, progress_callback: Optional[Callable] = None) -> int:
+        """
+        Archive les offres anciennes puis, s'il y en a eu, entretient la base (VACUUM incrémental,
+        index FTS, statistiques).
         
-        self._log("\n✨ Pipeline terminé!", progress_callback)
-        return stats
+        Si la taxonomie des compétences a changé (config.SKILLS), les offres sont réanalysées.
+        """
+        archived = self.db.archive_old_jobs()
+        if archived:
+            self._log(f"🗄️  Offres archivées: {archived}", progress_callback)
+        if self.db.skills_outdated():
+            refreshed = self.db.refresh_skills()
+            self._log(f"🧰 Compétences réanalysées: {refreshed['jobs']} offres, {refreshed['skills']} compétences "
+                      f"citées ({refreshed['seconds']} s)", progress_callback)
+        if archived:
+            self.db.run_maintenance()
+        return archived
+    
+    def refresh_snapshot(self) -> Dict:
+        """Réécrit l'instantané du dashboard et retourne ses métadonnées."""
+        return write_snapshot(self.db)
     
     def _filter_and_enrich(self, raw_jobs: List[Dict], target_location: str = "France", progress_callback: Optional[Callable] = None) -> List[Dict]:
         """
@@ -144,6 +515,39 @@ class ScrapingPipeline:
         """Récupère toutes les offres de la base."""
         return self.db.get_all_jobs(limit)
     
+    def get_jobs_frame(self, filters: Optional[Dict] = None, limit: Optional[int] = None):
+        """Récupère les offres de la base sous forme de DataFrame."""
+        return self.db.get_jobs_frame(filters, limit=limit)
+    
+    def query_jobs(self, filters: Optional[Dict] = None, sort: str = 'published_date', descending: bool = True,
+                   page: int = 1, page_size: int = 50) -> Dict:
+        """Lit une page d'offres filtrée et triée (filtres exécutés en SQL)."""
+        return self.db.query_jobs(filters, sort=sort, descending=descending, page=page, page_size=page_size)
+    
+    def get_posting_lifetimes(self, since: Optional[datetime] = None) -> List[Dict]:
+        """Durée de vie des offres et délai de pourvoi par source."""
+        return self.db.get_posting_lifetimes(since)
+    
+    def get_keyword_counts(self, filters: Optional[Dict] = None, limit: int = 20) -> Dict[str, int]:
+        """Compte les offres par mot-clé."""
+        return self.db.get_keyword_counts(filters, limit)
+    
+    def get_skill_counts(self, filters: Optional[Dict] = None, limit: int = 20) -> Dict[str, int]:
+        """Compte les offres par compétence."""
+        return self.db.get_skill_counts(filters, limit)
+    
+    def search_jobs(self, query: str, limit: int = 100) -> List[Dict]:
+        """Recherche plein texte dans toutes les offres de la base."""
+        return self.db.search_jobs(query, limit=limit)
+    
+    def get_run(self, run_id: Optional[int] = None) -> Optional[Dict]:
+        """Récupère un run de scraping (le plus récent par défaut)."""
+        return self.db.get_run(run_id)
+    
+    def get_data_version(self) -> int:
+        """Version des données (clé de cache des lectures)."""
+        return self.db.get_data_version()
+    
     def get_statistics(self) -> Dict:
         """Récupère les statistiques."""
         return self.db.get_statistics()
@@ -151,3 +555,7 @@ class ScrapingPipeline:
     def update_job_status(self, job_id: int, applied: bool) -> bool:
         """Met à jour le statut de candidature d'une offre."""
         return self.db.update_job_status(job_id, applied)
+    
+    def update_job_statuses(self, changes: Dict[int, bool]) -> Dict[int, bool]:
+        """Met à jour le statut de candidature de plusieurs offres en une transaction."""
+        return self.db.update_job_statuses(changes)
@@ -0,0 +1,103 @@
+"""
+Planification d'un run sur plusieurs lieux.
+
+Un run couvre une matrice lieux × requêtes × sources. Toutes les sources ne tiennent pas
+compte du lieu: WTTJ interroge un index unique, Glassdoor et la recherche DuckDuckGo ne
+filtrent que par pays, APEC, HelloWork et Glassdoor ne couvrent que la France. Le
+planificateur écarte les combinaisons non supportées et fusionne celles qui produiraient
+la même requête HTTP, pour ne lancer chaque recherche qu'une fois par run.
+"""
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_locations(spec, default_country: str = "France") -> List[Tuple[str, str]]:
+    """
+    Lit une liste de lieux: "Pays:Lieu" ou "Lieu", séparés par des virgules ou des retours à la ligne.
+
+    Un lieu sans pays est cherché dans default_country; un pays seul ("Belgique:") couvre tout
+    le pays. Les doublons sont ignorés.
+
+    Returns:
+        Liste de couples (pays, lieu), dans l'ordre de saisie
+    """
+    items = spec.replace('\n', ',').split(',') if isinstance(spec, str) else spec
+    targets = []
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        country, _, location = item.rpartition(':') if ':' in item else (default_country, '', item)
+        country, location = country.strip() or default_country, location.strip()
+        target = (country, location or country)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def _key(value: Optional[str]) -> str:
+    """Valeur normalisée pour la déduplication (casse et espaces ignorés)."""
+    return ' '.join((value or '').split()).casefold()
+
+
+def plan_tasks(sources, targets: List[Tuple[str, str]], queries: Optional[List[str]] = None,
+               units: Optional[List[Tuple[str, Optional[str]]]] = None) -> Dict:
+    """
+    Tâches d'un run multi-lieux, sans recherche redondante.
+
+    Chaque combinaison (source, requête, pays, lieu) est réduite aux paramètres que la source
+    utilise réellement (uses_country, uses_location); les combinaisons qui donnent la même
+    recherche sont fusionnées dans la première tâche. Les pays hors de supported_countries
+    sont écartés.
+
+    Args:
+        sources: Scrapers du pipeline
+        targets: Couples (pays, lieu), voir parse_locations
+        queries: Requêtes pour toutes les sources (par défaut celles de chaque source)
+        units: Couples (source, requête) à planifier au lieu de sources × queries; requête
+            None pour les requêtes par défaut de la source en une seule tâche
+
+    Returns:
+        tasks: dicts source, query, country, location, targets (lieux couverts);
+        combinations: taille de la matrice; unsupported et duplicates: combinaisons écartées
+    """
+    by_name = {source.source_name: source for source in sources}
+    if units is None:
+        units = [(source.source_name, query) for source in sources for query in queries or source.search_queries]
+    unknown = [name for name, _ in units if name not in by_name]
+    if unknown:
+        raise ValueError(f"Sources inconnues: {', '.join(unknown)}")
+
+    tasks: Dict[Tuple, Dict] = {}
+    unsupported = duplicates = 0
+    for name, query in units:
+        source = by_name[name]
+        supported = {_key(country) for country in source.supported_countries or ()}
+        for country, location in targets:
+            if supported and _key(country) not in supported:
+                unsupported += 1
+                continue
+            key = (
+                name, _key(query),
+                _key(country) if source.uses_country else '*',
+                _key(location) if source.uses_location else '*',
+            )
+            task = tasks.get(key)
+            if task is not None:
+                duplicates += 1
+                task['targets'].append((country, location))
+                continue
+            tasks[key] = {'source': name, 'query': query, 'country': country, 'location': location,
+                          'targets': [(country, location)]}
+
+    return {
+        'tasks': list(tasks.values()),
+        'combinations': len(units) * len(targets),
+        'unsupported': unsupported,
+        'duplicates': duplicates,
+    }
+
+
+def format_plan(plan: Dict) -> str:
+    """Résumé d'un plan (ex: "84 combinaisons → 31 tâches (40 fusionnées, 13 non supportées)")."""
+    return (f"{plan['combinations']} combinaisons → {len(plan['tasks'])} tâches "
+            f"({plan['duplicates']} fusionnées, {plan['unsupported']} non supportées)")
@@ -0,0 +1,229 @@
+"""
+Mode démon du scraper: planification par (source, requête).
+
+Un seul processus garde le moteur SQLAlchemy et le navigateur Chromium ouverts, et relance
+chaque unité (source, requête, lieu) à son propre intervalle (config.SCHEDULE_INTERVALS),
+avec un jitter aléatoire pour ne pas interroger les sites à heure fixe. Les échéances sont
+enregistrées dans schedule_state: un redémarrage du démon reprend le planning là où il était.
+
+Chaque lot d'unités échues est exécuté comme un run normal (scrape_runs, événements,
+instantané): le dashboard affiche sa progression et le verrou des runs est respecté.
+"""
+import os
+import random
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from scraper.events import EventLog, events_path
+from config import (
+    RUNS_DIR, SCHEDULE_INTERVALS, SCHEDULE_DEFAULT_INTERVAL, SCHEDULE_JITTER,
+    SCHEDULE_RETRY_DELAY, SCHEDULE_MAX_UNITS_PER_RUN, SCHEDULE_POLL_SECONDS
+)
+
+
+class ScrapeScheduler:
+    """Boucle du mode démon: exécute les unités échues avec un navigateur partagé."""
+
+    def __init__(self, pipeline, country: str = "France", location: str = "France",
+                 queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None,
+                 runs_dir: Optional[str] = RUNS_DIR):
+        """
+        Args:
+            pipeline: ScrapingPipeline (sa base et ses scrapers sont réutilisés à chaque run)
+            queries: Requêtes planifiées pour toutes les sources (par défaut celles de chaque source)
+            runs_dir: Dossier des fichiers d'événements des runs (None: pas d'événements)
+        """
+        self.pipeline = pipeline
+        self.db = pipeline.db
+        self.country = country
+        self.location = location
+        self.queries = queries
+        self.progress_callback = progress_callback
+        self.runs_dir = runs_dir
+        self.stop_event = threading.Event()
+
+    def units(self) -> List[Dict]:
+        """Unités planifiées: une par (source, requête), intervalle en secondes."""
+        units = []
+        for source in self.pipeline.sources:
+            interval_s = SCHEDULE_INTERVALS.get(source.source_name, SCHEDULE_DEFAULT_INTERVAL) * 60
+            for query in self.queries or source.search_queries:
+                units.append({'source': source.source_name, 'query': query,
+                              'location': self.location, 'interval_s': interval_s})
+        return units
+
+    @staticmethod
+    def next_due_at(interval_s: int, failures: int = 0, now: Optional[datetime] = None) -> datetime:
+        """
+        Prochaine échéance d'une unité.
+
+        Après un succès: intervalle ± jitter. Après des échecs consécutifs: SCHEDULE_RETRY_DELAY
+        doublé à chaque échec, plafonné à l'intervalle.
+        """
+        now = now or datetime.utcnow()
+        delay = interval_s
+        if failures:
+            delay = min(SCHEDULE_RETRY_DELAY * 60 * 2 ** (failures - 1), interval_s)
+        delay *= 1 + random.uniform(-SCHEDULE_JITTER, SCHEDULE_JITTER)
+        return now + timedelta(seconds=delay)
+
+    def stop(self, *_):
+        """Demande l'arrêt: le run en cours termine l'unité courante, les suivantes sont reportées."""
+        if self.stop_event.is_set():
+            # Deuxième signal: arrêt immédiat
+            raise KeyboardInterrupt
+        self._log("🛑 Arrêt demandé, fin de l'unité en cours...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        """Arrêt propre sur SIGTERM et SIGINT (Ctrl+C)."""
+        signal.signal(signal.SIGINT, self.stop)
+        if hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, self.stop)
+
+    def due_units(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Unités configurées échues, de la plus en retard à la plus récente."""
+        now = now or datetime.utcnow()
+        configured = {(unit['source'], unit['query']) for unit in self.units()}
+        return [
+            unit for unit in self.db.get_schedule(self.location)
+            if (unit['source'], unit['query']) in configured and unit['next_due_at'] <= now
+        ]
+
+    def _seconds_until_next_due(self) -> float:
+        """Attente jusqu'à la prochaine échéance, bornée par SCHEDULE_POLL_SECONDS."""
+        configured = {(unit['source'], unit['query']) for unit in self.units()}
+        upcoming = [
+            unit['next_due_at'] for unit in self.db.get_schedule(self.location)
+            if (unit['source'], unit['query']) in configured
+        ]
+        if not upcoming:
+            return SCHEDULE_POLL_SECONDS
+        return min(max((min(upcoming) - datetime.utcnow()).total_seconds(), 1), SCHEDULE_POLL_SECONDS)
+
+    def run_forever(self, max_runs: Optional[int] = None) -> int:
+        """
+        Exécute les unités échues jusqu'à l'arrêt demandé.
+
+        Args:
+            max_runs: Nombre de runs avant de s'arrêter (None: illimité)
+
+        Returns:
+            Nombre de runs exécutés
+        """
+        from playwright.sync_api import sync_playwright
+        from scraper.browser import ensure_chromium_installed, connect_browser
+
+        added = self.db.sync_schedule(self.units())
+        self._log(f"🗓️  Mode démon: {len(self.units())} unités planifiées ({added} nouvelles), lieu {self.location}")
+        ensure_chromium_installed(self.progress_callback)
+
+        runs = 0
+        with sync_playwright() as p:
+            browser = None
+            try:
+                while not self.stop_event.is_set() and (max_runs is None or runs < max_runs):
+                    due = self.due_units()[:SCHEDULE_MAX_UNITS_PER_RUN]
+                    if not due:
+                        self.stop_event.wait(self._seconds_until_next_due())
+                        continue
+
+                    # Un run lancé depuis l'application détient le verrou: on attend qu'il se termine
+                    run_id = self.db.start_run(status='queued', pid=os.getpid())
+                    if run_id is None:
+                        self._log("⏳ Un autre run est en cours, unités échues reportées")
+                        self.stop_event.wait(SCHEDULE_POLL_SECONDS)
+                        continue
+
+                    if browser is None or not browser.is_connected():
+                        if browser is not None:
+                            self._log("♻️  Navigateur déconnecté, relance...")
+                        # Navigateur partagé s'il est démarré, sinon Chromium local gardé ouvert
+                        browser, _ = connect_browser(p, self.progress_callback)
+
+                    self._run_units(run_id, due, browser)
+                    runs += 1
+                    self.log_freshness()
+            finally:
+                if browser is not None and browser.is_connected():
+                    browser.close()
+        self._log(f"👋 Mode démon arrêté après {runs} runs")
+        return runs
+
+    def _run_units(self, run_id: int, due: List[Dict], browser):
+        """Exécute un lot d'unités échues comme un run, puis enregistre leurs prochaines échéances."""
+        started_at = datetime.utcnow()
+        for unit in due:
+            self.db.update_schedule(unit['source'], unit['query'], unit['location'], last_started_at=started_at)
+
+        events = EventLog(events_path(self.runs_dir, run_id)) if self.runs_dir else None
+        try:
+            stats = self.pipeline.run(
+                country=self.country, location=self.location, progress_callback=self.progress_callback,
+                run_id=run_id, event_callback=events.emit if events else None,
+                units=[(unit['source'], unit['query']) for unit in due],
+                browser=browser, stop_event=self.stop_event
+            )
+            results = {(result['source'], result['query']): result for result in stats['units']}
+            run_error = None
+        except Exception as e:
+            # Navigateur planté, base indisponible...: les unités non terminées sont en échec
+            self._log(f"❌ Run #{run_id} en échec: {e}")
+            results = {}
+            run_error = str(e)
+        finally:
+            if events:
+                events.close()
+
+        now = datetime.utcnow()
+        for unit in due:
+            result = results.get((unit['source'], unit['query']), {'status': 'failed', 'jobs': 0, 'error': run_error})
+            if result['status'] == 'skipped':
+                # Arrêt demandé avant l'unité: elle reste échue pour le prochain démarrage
+                continue
+            values = {'last_finished_at': now, 'last_status': result['status'],
+                      'last_jobs': result['jobs'], 'last_error': result['error']}
+            if result['status'] == 'done':
+                values.update(last_success_at=now, failures=0, next_due_at=self.next_due_at(unit['interval_s'], now=now))
+            else:
+                failures = unit['failures'] + 1
+                values.update(failures=failures, next_due_at=self.next_due_at(unit['interval_s'], failures, now=now))
+            self.db.update_schedule(unit['source'], unit['query'], unit['location'], **values)
+
+    def log_freshness(self):
+        """Affiche la fraîcheur par source (âge du plus ancien passage réussi, retard)."""
+        for line in format_freshness(self.db.get_source_freshness(self.location)):
+            self._log(line)
+
+    def _log(self, message: str):
+        """Log un message."""
+        if self.progress_callback:
+            self.progress_callback(message)
+        else:
+            print(message)
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    """Durée lisible (ex: 2h05, 14 min)."""
+    if seconds is None:
+        return "jamais"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60}h{minutes % 60:02d}"
+
+
+def format_freshness(freshness: Dict[str, Dict]) -> List[str]:
+    """Lignes de rapport de fraîcheur par source (get_source_freshness)."""
+    lines = ["📈 Fraîcheur par source:"]
+    for source, info in freshness.items():
+        line = f"  {source:<16} plus ancien succès: {_format_duration(info['lag_s'])}"
+        if info['overdue_s']:
+            line += f", en retard de {_format_duration(info['overdue_s'])}"
+        if info['never_succeeded']:
+            line += f", {info['never_succeeded']}/{info['units']} unités jamais réussies"
+        if info['failing']:
+            line += f", {info['failing']} en échec"
+        lines.append(line)
+    return lines
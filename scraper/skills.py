@@ -0,0 +1,160 @@
+"""
+Extraction des compétences citées dans les offres (taxonomie config.SKILLS).
+
+detect_keywords ne cherche qu'une dizaine de termes génériques ("data", "business"): presque
+toutes les offres reçoivent les mêmes mots-clés. La taxonomie décrit les outils et savoir-faire
+réellement demandés (SQL, dbt, Power BI...) avec leurs alias français et anglais.
+
+Tous les alias sont compilés en une seule expression régulière, factorisée en arbre de
+préfixes (trie): un texte est parcouru une seule fois, quel que soit le nombre d'alias, au
+lieu d'une recherche par alias. À une même position, l'alias le plus long l'emporte
+("sql server" plutôt que "sql", "tableau de bord" - exclu - plutôt que "Tableau").
+"""
+import re
+import zlib
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config import SKILLS, SKILL_EXCLUSIONS
+
+# Lettres et leurs variantes accentuées (les alias sont insensibles aux accents)
+ACCENTS = {
+    'a': 'aàâä', 'c': 'cç', 'e': 'eéèêë', 'i': 'iîï', 'o': 'oôö', 'u': 'uùûü', 'y': 'yÿ',
+}
+SEPARATORS = ' -_'
+# Noeud de fin d'alias dans le trie
+_END = ''
+
+
+def _strip_accents(value: str) -> str:
+    """Texte sans accents."""
+    return ''.join(char for char in unicodedata.normalize('NFKD', value) if not unicodedata.combining(char))
+
+
+def _key(value: str) -> str:
+    """Clé de comparaison d'un alias ou d'un texte trouvé: minuscules, sans accents ni séparateurs."""
+    return ''.join(char for char in _strip_accents(value).lower() if char not in SEPARATORS)
+
+
+def _units(alias: str) -> List[str]:
+    """Caractères d'un alias normalisé, les séparateurs consécutifs réduits à un seul ' '."""
+    units = []
+    for char in _strip_accents(alias).lower().strip():
+        if char in SEPARATORS:
+            if units and units[-1] != ' ':
+                units.append(' ')
+        else:
+            units.append(char)
+    return units
+
+
+def _unit_pattern(unit: str) -> str:
+    """Expression d'un caractère d'alias: séparateur facultatif, lettre et ses variantes accentuées."""
+    if unit == ' ':
+        return r'[\s\-_]?'
+    if unit in ACCENTS:
+        return f'[{ACCENTS[unit]}]'
+    return re.escape(unit)
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Expression régulière d'un noeud du trie (les branches les plus longues sont essayées d'abord)."""
+    branches = [_unit_pattern(unit) + _trie_pattern(child) for unit, child in sorted(node.items()) if unit != _END]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # Fin d'alias possible ici: la suite est facultative (gourmande, donc la plus longue d'abord)
+    return f'(?:{body})?' if _END in node else body
+
+
+class SkillMatcher:
+    """Taxonomie compilée: une expression régulière pour tous les alias."""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]] = SKILLS,
+                 exclusions: Iterable[str] = SKILL_EXCLUSIONS):
+        """
+        Args:
+            taxonomy: famille -> compétence -> alias; "=" en tête d'un alias le rend sensible à la casse
+            exclusions: Expressions reconnues puis ignorées ("tableau de bord")
+
+        Raises:
+            ValueError: si un même alias désigne deux compétences
+        """
+        self.families: Dict[str, str] = {}
+        self._skills_by_key: Dict[str, Optional[str]] = {}
+        trie: Dict = {}
+        exact = []
+
+        entries = [(skill, alias) for skills in taxonomy.values() for skill, aliases in skills.items()
+                   for alias in aliases]
+        entries += [(None, alias) for alias in exclusions]
+        for family, skills in taxonomy.items():
+            for skill in skills:
+                self.families[skill] = family
+        for skill, alias in entries:
+            key = _key(alias.lstrip('='))
+            if self._skills_by_key.get(key, skill) != skill:
+                raise ValueError(f"Alias '{alias}' en double: {self._skills_by_key[key]} et {skill}")
+            self._skills_by_key[key] = skill
+            if alias.startswith('='):
+                exact.append(re.escape(alias[1:]))
+                continue
+            node = trie
+            for unit in _units(alias):
+                node = node.setdefault(unit, {})
+            node[_END] = {}
+
+        alternatives = [_trie_pattern(trie)]
+        if exact:
+            alternatives.append('(?-i:' + '|'.join(sorted(exact, key=len, reverse=True)) + ')')
+        # Bornes: pas de lettre, chiffre, point ou tiret collé à l'alias ("PostgreSQL" ne contient
+        # pas "sql", "excellent" pas "excel"); un point final de phrase est accepté
+        self.pattern = re.compile(
+            r'(?<![\w.\-])(?:' + '|'.join(alternatives) + r')(?![\w\-+#]|\.\w)', re.IGNORECASE
+        )
+        self.fingerprint = zlib.crc32(repr((sorted(self.families.items()), self.pattern.pattern)).encode('utf-8'))
+        self._resolve = lru_cache(maxsize=4096)(self._resolve_match)
+
+    def _resolve_match(self, text: str) -> Optional[str]:
+        """Compétence d'un texte trouvé (None pour une exclusion)."""
+        return self._skills_by_key.get(_key(text))
+
+    def extract(self, text: Optional[str]) -> Set[str]:
+        """Compétences citées dans un texte."""
+        if not text:
+            return set()
+        resolve = self._resolve
+        skills = {resolve(match) for match in self.pattern.findall(text)}
+        skills.discard(None)
+        return skills
+
+    def extract_job(self, title: Optional[str], *texts: Optional[str]) -> Dict[str, bool]:
+        """
+        Compétences d'une offre.
+
+        Args:
+            title: Titre de l'offre
+            texts: Extrait, description complète...
+
+        Returns:
+            compétence -> True si elle est citée dans le titre
+        """
+        found = dict.fromkeys(self.extract(' \n '.join(text for text in texts if text)), False)
+        found.update(dict.fromkeys(self.extract(title), True))
+        return found
+
+    def extract_batch(self, jobs: Iterable[Tuple]) -> List[Dict[str, bool]]:
+        """Applique extract_job à des tuples (titre, texte...), dans l'ordre."""
+        extract_job = self.extract_job
+        return [extract_job(*job) for job in jobs]
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> SkillMatcher:
+    """Taxonomie de config.SKILLS, compilée une fois par processus."""
+    return SkillMatcher()
+
+
+def extract_skills(text: Optional[str]) -> Set[str]:
+    """Compétences citées dans un texte (taxonomie de config.SKILLS)."""
+    return get_matcher().extract(text)
@@ -0,0 +1,142 @@
+"""
+Instantané du dashboard écrit à la fin de chaque run.
+
+Le pipeline écrit les N offres les plus récentes (colonnes dérivées déjà calculées)
+dans un fichier Arrow/Feather non compressé, et les statistiques dans un fichier JSON
+portant un numéro de version. L'application ne relit le fichier Arrow (mappé en
+mémoire) que lorsque cette version change: les interactions de page ne touchent pas la base.
+"""
+import os
+import glob
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from config import SNAPSHOT_PATH, MAX_TABLE_ROWS
+
+# Une offre est "Nouveau" si elle a été vue dans les dernières NEW_JOB_HOURS heures
+NEW_JOB_HOURS = 24
+
+# Colonnes calculées par add_derived_columns
+DERIVED_COLUMNS = ('is_new', 'status', 'published_day')
+
+# Colonnes encodées en dictionnaire dans le fichier (catégories pandas à la relecture)
+CATEGORICAL_COLUMNS = ('role_category', 'source', 'location')
+
+
+def _meta_path(path: str) -> str:
+    """Fichier JSON des métadonnées associé à l'instantané."""
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _data_path(path: str, version: int) -> str:
+    """
+    Fichier Arrow d'une version de l'instantané.
+
+    Chaque version a son propre fichier: un fichier mappé en mémoire par l'application
+    ne peut pas être remplacé sous Windows.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}-{version}{ext}"
+
+
+def add_derived_columns(df, now: Optional[datetime] = None):
+    """
+    Ajoute les colonnes calculées pour l'affichage.
+
+    - is_new / status: badge "🆕 Nouveau" pour les offres vues il y a moins de NEW_JOB_HOURS heures
+    - published_day: date de publication formatée (AAAA-MM-JJ, "-" si inconnue)
+    """
+    import pandas as pd
+
+    now = now or datetime.utcnow()
+    scraped_at = pd.to_datetime(df['scraped_at'], errors='coerce')
+    df['is_new'] = (scraped_at >= now - timedelta(hours=NEW_JOB_HOURS)).fillna(False)
+    df['status'] = df['is_new'].map({True: "🆕 Nouveau", False: ""})
+    df['published_day'] = pd.to_datetime(df['published_date'], errors='coerce').dt.strftime('%Y-%m-%d').fillna("-")
+    return df
+
+
+def write_snapshot(db, path: str = SNAPSHOT_PATH, limit: int = MAX_TABLE_ROWS) -> Dict:
+    """
+    Écrit l'instantané du dashboard.
+
+    Args:
+        db: DatabaseManager
+        path: Fichier Arrow de référence (le JSON des métadonnées est écrit à côté)
+        limit: Nombre d'offres incluses
+
+    Returns:
+        Métadonnées: version, created_at, rows, file, stats, keyword_counts, skill_counts
+    """
+    import pyarrow.feather as feather
+
+    created_at = datetime.utcnow()
+    version = time.time_ns()
+    df = add_derived_columns(db.get_jobs_frame(limit=limit), created_at)
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+
+    # Non compressé pour pouvoir être mappé en mémoire à la lecture
+    data_path = _data_path(path, version)
+    feather.write_feather(df, data_path + '.tmp', compression='uncompressed')
+    os.replace(data_path + '.tmp', data_path)
+
+    meta = {
+        'version': version,
+        'created_at': created_at.isoformat(),
+        'rows': len(df),
+        'file': os.path.basename(data_path),
+        'stats': db.get_statistics(),
+        'keyword_counts': db.get_keyword_counts(limit=15),
+        'skill_counts': db.get_skill_counts(limit=20),
+    }
+    # Les métadonnées sont publiées en dernier: un lecteur ne voit jamais une version sans son fichier
+    meta_path = _meta_path(path)
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(meta_path + '.tmp', meta_path)
+
+    _remove_old_versions(path, keep=data_path)
+    return meta
+
+
+def _remove_old_versions(path: str, keep: str):
+    """Supprime les anciennes versions (celles encore ouvertes sous Windows sont ignorées)."""
+    root, ext = os.path.splitext(path)
+    for old in glob.glob(f"{glob.escape(root)}-*{ext}"):
+        if os.path.abspath(old) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def read_snapshot_meta(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """Lit les métadonnées de l'instantané (None s'il n'existe pas encore)."""
+    try:
+        with open(_meta_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Tuple[Dict, object]]:
+    """
+    Charge l'instantané courant.
+
+    Returns:
+        (métadonnées, DataFrame) ou None si aucun instantané n'est disponible
+    """
+    import pyarrow.feather as feather
+
+    meta = read_snapshot_meta(path)
+    if meta is None:
+        return None
+    data_path = os.path.join(os.path.dirname(path), meta['file'])
+    try:
+        table = feather.read_table(data_path, memory_map=True)
+    except OSError:
+        return None
+    return meta, table.to_pandas()
@@ -15,13 +15,15 @@ class APECScraper(SourceScraper):
     def __init__(self):
         super().__init__("APEC")
         self.base_url = "https://www.apec.fr"
+        self.search_queries = ["Data Analyst", "Data Engineer"]
+        self.supported_countries = ("France",)
         
-    def scrape(self, browser: Browser, country: str = "France", location: str = "France", progress_callback: Optional[Callable] = None) -> List[Dict]:
+    def scrape(self, browser: Browser, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> List[Dict]:
         """
         Scrape les offres de l'APEC.
         """
         all_jobs = []
-        queries = ["Data Analyst", "Data Engineer"]
+        queries = queries if queries else self.search_queries
         
         if country.lower() != "france":
             if progress_callback:
@@ -45,7 +47,7 @@ class APECScraper(SourceScraper):
                 logger.info(f"Navigating to {search_url}")
                 
                 try:
-                    page.goto(search_url, wait_until="networkidle", timeout=60000)
+                    self._goto(page, search_url, wait_until="networkidle", timeout=60000)
                     
                     # Gérer le bandeau de cookies
                     try:
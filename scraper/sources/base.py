@@ -4,7 +4,7 @@ Interface de base pour les scrapers de sources d'offres d'emploi.
 import time
 import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Callable, Optional
+from typing import List, Dict, Callable, Optional, Tuple
 from playwright.sync_api import Browser, Page
 from config import MAX_RETRIES, RETRY_DELAY, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX, USER_AGENTS
 
@@ -20,6 +20,17 @@ class SourceScraper(ABC):
             source_name: Nom de la source (ex: "Indeed", "WTTJ")
         """
         self.source_name = source_name
+        # Requêtes utilisées quand aucune n'est fournie (planifiées séparément par le mode démon)
+        self.search_queries: List[str] = []
+        # Portée géographique, utilisée par le planificateur multi-lieux (scraper/planner.py):
+        # pays supportés (None: tous) et paramètres réellement pris en compte par la recherche
+        self.supported_countries: Optional[Tuple[str, ...]] = None
+        self.uses_country = True
+        self.uses_location = True
+        # Callback d'événements du pipeline (voir scraper/events.py), optionnel
+        self.event_callback: Optional[Callable] = None
+        # Requêtes HTTP émises depuis la création (coût des unités, voir scraper/budget.py)
+        self.requests = 0
     
     @abstractmethod
     def scrape(self, browser: Browser, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> List[Dict]:
@@ -84,6 +95,27 @@ class SourceScraper(ABC):
         page = context.new_page()
         return page
     
+    def _goto(self, page: Page, url: str, **kwargs):
+        """
+        Charge une page et émet un événement page_fetched (statut HTTP, durée).
+        
+        Args:
+            page: Page Playwright
+            url: URL à charger
+            kwargs: Options de page.goto (wait_until, timeout)
+        """
+        start = time.perf_counter()
+        status = None
+        self.requests += 1
+        try:
+            response = page.goto(url, **kwargs)
+            status = response.status if response else None
+            return response
+        finally:
+            if self.event_callback:
+                self.event_callback('page_fetched', source=self.source_name, url=url, status=status,
+                                    duration_ms=round((time.perf_counter() - start) * 1000))
+    
     def _safe_get_text(self, element, default: str = '') -> str:
         """
         Extrait le texte d'un élément de manière sécurisée.
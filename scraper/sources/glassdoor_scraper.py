@@ -4,7 +4,7 @@ Scraper pour Glassdoor.
 import logging
 import time
 import random
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from playwright.sync_api import Browser
 from scraper.sources.base import SourceScraper
 from scraper.utils import parse_relative_date
@@ -15,14 +15,23 @@ class GlassdoorScraper(SourceScraper):
     def __init__(self):
         super().__init__("Glassdoor")
         self.base_url = "https://www.glassdoor.fr"
+        # Glassdoor est très sensible, on limite les requêtes
+        self.search_queries = ["Data Analyst"]
+        # Recherche France entière uniquement
+        self.supported_countries = ("France",)
+        self.uses_location = False
         
-    def scrape(self, browser: Browser, progress_callback=None) -> List[Dict]:
+    def scrape(self, browser: Browser, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> List[Dict]:
         """
-        Scrape les offres de Glassdoor.
+        Scrape les offres de Glassdoor (recherche France uniquement, location ignorée).
         """
         all_jobs = []
-        # Glassdoor est très sensible, on limite les requêtes
-        queries = ["Data Analyst"]
+        queries = queries if queries else self.search_queries
+        
+        if country.lower() != "france":
+            if progress_callback:
+                progress_callback("Glassdoor: seule la recherche France est supportée. Recherche ignorée.")
+            return []
         
         context = browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -36,11 +45,13 @@ class GlassdoorScraper(SourceScraper):
                 
                 # URL de recherche Glassdoor France
                 # Note: Ces URLs peuvent expirer ou changer
-                search_url = f"{self.base_url}/Emploi/france-{query.lower().replace(' ', '-')}-emplois-SRCH_IL.0,6_IN86_KO7,19.htm"
+                # IL/KO: positions du lieu ("france") et des mots-clés dans le segment d'URL
+                slug = query.lower().replace(' ', '-')
+                search_url = f"{self.base_url}/Emploi/france-{slug}-emplois-SRCH_IL.0,6_IN86_KO7,{7 + len(slug)}.htm"
                 logger.info(f"Navigating to {search_url}")
                 
                 try:
-                    page.goto(search_url, wait_until="networkidle", timeout=60000)
+                    self._goto(page, search_url, wait_until="networkidle", timeout=60000)
                     
                     # Vérifier si on est bloqué
                     if "Aidez-nous à protéger Glassdoor" in page.content() or "Just a moment" in page.content():
@@ -15,13 +15,15 @@ class HelloWorkScraper(SourceScraper):
     def __init__(self):
         super().__init__("HelloWork")
         self.base_url = "https://www.hellowork.com"
+        self.search_queries = ["Data Analyst", "Data Engineer", "Business Analyst"]
+        self.supported_countries = ("France",)
         
-    def scrape(self, browser: Browser, country: str = "France", location: str = "France", progress_callback: Optional[Callable] = None) -> List[Dict]:
+    def scrape(self, browser: Browser, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> List[Dict]:
         """
         Scrape les offres de HelloWork.
         """
         all_jobs = []
-        queries = ["Data Analyst", "Data Engineer", "Business Analyst"]
+        queries = queries if queries else self.search_queries
         
         context = browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -40,7 +42,7 @@ class HelloWorkScraper(SourceScraper):
                 logger.info(f"Navigating to {search_url}")
                 
                 try:
-                    page.goto(search_url, wait_until="networkidle", timeout=60000)
+                    self._goto(page, search_url, wait_until="networkidle", timeout=60000)
                     # Petit délai pour le rendu dynamique
                     page.wait_for_timeout(2000)
                     
@@ -61,7 +61,7 @@ class IndeedScraper(SourceScraper):
             search_url = f"{self.base_url}/jobs?q={query.replace(' ', '+')}&l={location.replace(' ', '+')}&fromage=3"
             
             self._log_progress(f"Chargement: {search_url}", progress_callback)
-            page.goto(search_url, wait_until='domcontentloaded', timeout=40000)
+            self._goto(page, search_url, wait_until='domcontentloaded', timeout=40000)
             
             # Petit délai pour laisser le temps au contenu de s'afficher (anti-bot)
             page.wait_for_timeout(3000)
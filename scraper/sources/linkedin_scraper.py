@@ -13,6 +13,8 @@ class LinkedInScraper(SourceScraper):
     
     def __init__(self):
         super().__init__("LinkedIn")
+        # Seul le lieu est passé à la recherche (LinkedIn gère villes et pays)
+        self.uses_country = False
         self.base_url = "https://www.linkedin.com"
         self.search_queries = [
             "Data Analyst",
@@ -53,7 +55,7 @@ class LinkedInScraper(SourceScraper):
             search_url = f"{self.base_url}/jobs/search?keywords={query.replace(' ', '%20')}&location={location.replace(' ', '%20')}&f_TPR=r259200"
             
             self._log_progress(f"Chargement: {search_url}", progress_callback)
-            page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
+            self._goto(page, search_url, wait_until='domcontentloaded', timeout=30000)
             
             # Attendre le chargement
             try:
@@ -6,7 +6,7 @@ import logging
 import time
 import random
 import urllib.parse
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from playwright.sync_api import Browser
 from scraper.sources.base import SourceScraper
 from scraper.utils import parse_relative_date
@@ -18,15 +18,21 @@ class SearchScraper(SourceScraper):
         super().__init__("Internet Search")
         # Utilisation de la version standard (plus discrète si on simule bien)
         self.base_url = "https://duckduckgo.com"
+        self.search_queries = ["Data Analyst"]
+        # La requête cible le pays, pas la ville
+        self.uses_location = False
+        # Sites d'ATS interrogés pour chaque requête
+        self.ats_sites = ["greenhouse.io", "lever.co"]
         
-    def scrape(self, browser: Browser, progress_callback=None) -> List[Dict]:
+    def scrape(self, browser: Browser, country: str = "France", location: str = "France", queries: Optional[List[str]] = None, progress_callback: Optional[Callable] = None) -> List[Dict]:
         """
         Scrape les résultats de recherche pour trouver des offres.
         """
         all_jobs = []
         queries = [
-            'site:greenhouse.io "Data Analyst" France',
-            'site:lever.co "Data Analyst" France'
+            f'site:{site} "{query}" {country}'
+            for query in (queries if queries else self.search_queries)
+            for site in self.ats_sites
         ]
         
         context = browser.new_context(
@@ -42,7 +48,7 @@ class SearchScraper(SourceScraper):
                 
                 try:
                     # Navigation vers la home d'abord pour paraître humain
-                    page.goto(self.base_url, wait_until="networkidle")
+                    self._goto(page, self.base_url, wait_until="networkidle")
                     page.wait_for_timeout(1000)
                     
                     # Taper la recherche
@@ -94,7 +100,7 @@ class SearchScraper(SourceScraper):
                             job_data = {
                                 "job_title": title,
                                 "company": company,
-                                "location": "France (via web search)",
+                                "location": f"{country} (via web search)",
                                 "published_date": parse_relative_date("today"),
                                 "url": url,
                                 "source": self.source_name,
@@ -20,6 +20,9 @@ class WTTJScraper(SourceScraper):
     
     def __init__(self):
         super().__init__("WTTJ")
+        # Index Algolia unique: pays et lieu ignorés
+        self.uses_country = False
+        self.uses_location = False
         self.search_queries = [
             "data analyst",
             "business analyst",
@@ -63,6 +66,7 @@ class WTTJScraper(SourceScraper):
                     "params": "&".join([f"{k}={v}" for k, v in params.items()])
                 }
                 
+                self.requests += 1
                 response = requests.post(api_url, headers=self.headers, json=payload)
                 
                 if response.status_code == 200:
@@ -0,0 +1,169 @@
+"""
+File de tâches de scraping partagée par plusieurs workers.
+
+Un run est découpé en tâches (source, requête, pays, lieu) stockées dans scrape_tasks.
+Chaque worker (scraper_cli.py --worker, sur cette machine ou une autre partageant la base)
+réserve une tâche par bail, prolonge le bail par des heartbeats pendant l'exécution, puis
+la marque terminée ou en échec. Une tâche en échec est retentée avec un délai croissant;
+le bail d'un worker mort expire et la tâche est reprise par un autre. Le dernier worker
+à terminer une tâche d'un run clôt le run (rétention, instantané du dashboard).
+"""
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from config import TASK_HEARTBEAT_SECONDS, TASK_RETRY_DELAY, TASK_POLL_SECONDS
+
+
+def enqueue_run(db, tasks: List[Dict]) -> Optional[int]:
+    """
+    Crée un run en attente et ajoute ses tâches à la file.
+
+    Args:
+        tasks: Tâches planifiées (scraper.planner.plan_tasks)
+
+    Returns:
+        Identifiant du run, ou None si un autre run est déjà actif
+    """
+    run_id = db.start_run(status='queued')
+    if run_id is None:
+        return None
+    db.enqueue_tasks(run_id, [
+        {key: task[key] for key in ('source', 'query', 'country', 'location')} for task in tasks
+    ])
+    db.sync_task_run(run_id)
+    return run_id
+
+
+def default_worker_id() -> str:
+    """Identifiant du worker: machine et processus."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TaskWorker:
+    """Worker de la file: exécute des tâches avec un navigateur ouvert une seule fois."""
+
+    def __init__(self, pipeline, worker_id: Optional[str] = None, progress_callback: Optional[Callable] = None):
+        """
+        Args:
+            pipeline: ScrapingPipeline (scrapers, filtres et base réutilisés)
+            worker_id: Identifiant du worker dans la file (par défaut machine:pid)
+        """
+        self.pipeline = pipeline
+        self.db = pipeline.db
+        self.worker_id = worker_id or default_worker_id()
+        self.progress_callback = progress_callback
+        self.stop_event = threading.Event()
+
+    def run(self, wait: bool = False, max_tasks: Optional[int] = None) -> Dict[str, int]:
+        """
+        Exécute des tâches jusqu'à ce que la file soit vide (ou indéfiniment avec wait).
+
+        Sans wait, le worker attend les tâches reportées (délai de nouvelle tentative) et ne
+        s'arrête que lorsqu'aucune tâche n'est plus en attente.
+
+        Args:
+            wait: Attendre de nouvelles tâches quand la file est vide
+            max_tasks: Nombre de tâches avant de s'arrêter (None: illimité)
+
+        Returns:
+            Compteurs: done, failed, retried
+        """
+        from playwright.sync_api import sync_playwright
+        from scraper.browser import ensure_chromium_installed, connect_browser
+
+        counts = {'done': 0, 'failed': 0, 'retried': 0}
+        self._log(f"👷 Worker {self.worker_id} démarré")
+        with sync_playwright() as p:
+            browser = None
+            try:
+                while not self.stop_event.is_set() and (max_tasks is None or sum(counts.values()) < max_tasks):
+                    task = self.db.claim_task(self.worker_id)
+                    if task is None:
+                        next_at = self.db.next_task_at()
+                        if next_at is None and not wait:
+                            break
+                        delay = TASK_POLL_SECONDS
+                        if next_at is not None:
+                            delay = min(delay, max((next_at - datetime.utcnow()).total_seconds(), 1))
+                        self.stop_event.wait(delay)
+                        continue
+
+                    if browser is None or not browser.is_connected():
+                        ensure_chromium_installed(self.progress_callback)
+                        browser, _ = connect_browser(p, self.progress_callback)
+                    status = self._execute(task, browser)
+                    counts[status] += 1
+            finally:
+                if browser is not None and browser.is_connected():
+                    browser.close()
+        self._log(f"👷 Worker {self.worker_id} arrêté: {counts['done']} tâches terminées, "
+                  f"{counts['retried']} reportées, {counts['failed']} en échec")
+        return counts
+
+    def _execute(self, task: Dict, browser) -> str:
+        """Exécute une tâche réservée. Returns: 'done', 'retried' ou 'failed'."""
+        label = f"{task['source']} · {task['query']} · {task['location']}"
+        self._log(f"\n📡 Tâche #{task['id']} (run #{task['run_id']}, tentative {task['attempts']}/{task['max_attempts']}): {label}")
+        self.db.sync_task_run(task['run_id'], current_source=label)
+
+        # Heartbeat en arrière-plan: le scraping d'une tâche peut dépasser la durée du bail
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(TASK_HEARTBEAT_SECONDS):
+                if not self.db.heartbeat_task(task['id'], self.worker_id):
+                    self._log(f"⚠️  Tâche #{task['id']}: bail perdu (reprise par un autre worker)")
+                    return
+
+        thread = threading.Thread(target=heartbeat, name=f"task-{task['id']}-heartbeat", daemon=True)
+        thread.start()
+        # Requêtes HTTP de la tentative (rendement des couples source, requête)
+        source = self.pipeline.get_source(task['source'])
+        requests_before = source.requests
+        try:
+            jobs, filtered = self.pipeline.scrape_unit(
+                browser, task['source'], task['query'], country=task['country'], location=task['location'],
+                progress_callback=self.progress_callback
+            )
+            stats = self.db.bulk_upsert(filtered, run_id=task['run_id'])
+        except Exception as e:
+            done.set()
+            thread.join()
+            delay = TASK_RETRY_DELAY * 2 ** (task['attempts'] - 1)
+            status = self.db.fail_task(task['id'], self.worker_id, str(e) or type(e).__name__, retry_delay=delay,
+                                       requests=source.requests - requests_before)
+            self._log(f"❌ Tâche #{task['id']}: {e}" + (f" (nouvelle tentative dans {delay}s)" if status == 'pending' else ""))
+            self._finish_run_if_drained(task['run_id'])
+            return 'retried' if status == 'pending' else 'failed'
+
+        done.set()
+        thread.join()
+        self.db.complete_task(task['id'], self.worker_id, jobs=len(jobs), valid=len(filtered),
+                              added=stats['added'], updated=stats['updated'], requests=source.requests - requests_before)
+        self._log(f"✅ Tâche #{task['id']}: {len(jobs)} offres, {len(filtered)} valides, {stats['added']} nouvelles")
+        self._finish_run_if_drained(task['run_id'])
+        return 'done'
+
+    def _finish_run_if_drained(self, run_id: int):
+        """Met à jour le run; s'il n'a plus de tâche en attente, applique la rétention et réécrit l'instantané."""
+        closed = self.db.sync_task_run(run_id)
+        if closed is None:
+            return
+        self._log(f"🏁 Run #{run_id} terminé: {closed['tasks']} tâches ({closed['failed']} en échec), "
+                  f"{closed['jobs_added']} nouvelles offres")
+        self.pipeline.apply_retention(self.progress_callback)
+        self.pipeline.refresh_snapshot()
+
+    def stop(self, *_):
+        """Arrêt après la tâche en cours."""
+        self._log("🛑 Arrêt demandé, fin de la tâche en cours...")
+        self.stop_event.set()
+
+    def _log(self, message: str):
+        """Log un message."""
+        if self.progress_callback:
+            self.progress_callback(message)
+        else:
+            print(message)
@@ -1,8 +1,11 @@
 """
 Fonctions utilitaires pour le scraping et le traitement des données.
 """
+import os
 import re
+import sys
 import hashlib
+import subprocess
 from datetime import datetime, timedelta
 from typing import List, Optional, Set
 from dateutil import parser as date_parser
@@ -278,3 +281,17 @@ def parse_relative_date(date_text: str) -> Optional[datetime]:
         return date_parser.parse(date_text, fuzzy=True)
     except Exception:
         return None
+
+
+def pid_alive(pid: int) -> bool:
+    """Indique si un processus de cette machine existe encore."""
+    if sys.platform == 'win32':
+        result = subprocess.run(['tasklist', '/FI', f'PID eq {pid}', '/NH'], capture_output=True, text=True)
+        return str(pid) in result.stdout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
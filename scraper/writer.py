@@ -0,0 +1,170 @@
+"""
+Écrivain de base de données en arrière-plan.
+
+Un thread unique possède les écritures SQLite pendant un run: les producteurs
+(scrapers) déposent les offres dans une file bornée, et le thread les enregistre
+par lots, déclenchés par la taille du lot ou par un délai maximum.
+"""
+import time
+import queue
+import threading
+from typing import List, Dict, Optional, Callable
+from scraper.db import DatabaseManager
+
+# Marqueurs de fin de file et d'écriture immédiate du lot en cours
+_STOP = object()
+_FLUSH = object()
+
+
+class BatchWriter:
+    """Thread d'écriture par lots avec contre-pression sur les producteurs."""
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 200, flush_interval: float = 2.0,
+                 max_queue_size: int = 1000, run_id: Optional[int] = None,
+                 on_commit: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialise l'écrivain.
+
+        Args:
+            db: Gestionnaire de base de données
+            run_id: Run de scraping auquel rattacher les apparitions des offres
+            batch_size: Nombre d'offres par transaction
+            flush_interval: Délai maximum (secondes) avant l'écriture d'un lot incomplet
+            max_queue_size: Taille de la file; au-delà, put() bloque le producteur
+            on_commit: Appelé (depuis le thread d'écriture) après chaque lot enregistré, avec
+                batch, added, updated, skipped, commit_ms
+        """
+        self.db = db
+        self.run_id = run_id
+        self.on_commit = on_commit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._db_stats = {'added': 0, 'updated': 0, 'skipped': 0}
+        self._batch_sizes: List[int] = []
+        self._commit_latencies: List[float] = []
+        self._max_queue_depth = 0
+        self._producer_wait = 0.0
+
+    def start(self) -> 'BatchWriter':
+        """Démarre le thread d'écriture."""
+        self._thread.start()
+        return self
+
+    def put(self, job: Dict):
+        """
+        Ajoute une offre à la file.
+
+        Bloque si la file est pleine (contre-pression) tant que l'écrivain n'a pas rattrapé son retard.
+        """
+        if self.error:
+            raise RuntimeError("L'écrivain de base de données a échoué") from self.error
+        start = time.perf_counter()
+        self.queue.put(job)
+        self._producer_wait += time.perf_counter() - start
+        self._max_queue_depth = max(self._max_queue_depth, self.queue.qsize())
+
+    def put_many(self, jobs: List[Dict]):
+        """Ajoute plusieurs offres à la file."""
+        for job in jobs:
+            self.put(job)
+
+    def flush(self):
+        """
+        Enregistre sans attendre le lot en cours et attend que toutes les offres déjà déposées soient écrites.
+
+        Raises:
+            RuntimeError: si une écriture a échoué
+        """
+        self.queue.put(_FLUSH)
+        self.queue.join()
+        if self.error:
+            raise RuntimeError("L'écrivain de base de données a échoué") from self.error
+
+    def close(self) -> Dict:
+        """
+        Enregistre les offres restantes, arrête le thread et retourne les statistiques.
+
+        Raises:
+            RuntimeError: si une écriture a échoué pendant le run
+        """
+        self.queue.put(_STOP)
+        self._thread.join()
+        if self.error:
+            raise RuntimeError("L'écrivain de base de données a échoué") from self.error
+        return self.stats
+
+    @property
+    def stats(self) -> Dict:
+        """Statistiques d'écriture (résultats d'upsert, lots, file, latence des commits)."""
+        batches = len(self._batch_sizes)
+        return {
+            **self._db_stats,
+            'writer': {
+                'batches': batches,
+                'avg_batch_size': round(sum(self._batch_sizes) / batches, 1) if batches else 0,
+                'max_batch_size': max(self._batch_sizes, default=0),
+                'max_queue_depth': self._max_queue_depth,
+                'avg_commit_ms': round(sum(self._commit_latencies) / batches * 1000, 1) if batches else 0,
+                'max_commit_ms': round(max(self._commit_latencies, default=0) * 1000, 1),
+                'producer_wait_s': round(self._producer_wait, 2),
+            }
+        }
+
+    def _run(self):
+        """Boucle du thread: accumule un lot puis l'enregistre en une transaction."""
+        batch = []
+        deadline = None
+        stopping = False
+
+        while not stopping:
+            flushing = False
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
+                if item is _STOP:
+                    stopping = True
+                    self.queue.task_done()
+                elif item is _FLUSH:
+                    flushing = True
+                    self.queue.task_done()
+                else:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (stopping or flushing or due or len(batch) >= self.batch_size):
+                try:
+                    self._write(batch)
+                finally:
+                    # Même si l'écriture lève: flush() et close() ne doivent jamais rester bloqués
+                    for _ in batch:
+                        self.queue.task_done()
+                batch = []
+                deadline = None
+
+    def _write(self, batch: List[Dict]):
+        """Enregistre un lot; en cas d'échec (écriture ou on_commit), l'erreur est remontée par put() et close()."""
+        if self.error:
+            return
+        start = time.perf_counter()
+        try:
+            result = self.db.bulk_upsert(batch, run_id=self.run_id)
+        except Exception as e:
+            self.error = e
+            return
+        latency = time.perf_counter() - start
+        self._commit_latencies.append(latency)
+        self._batch_sizes.append(len(batch))
+        for key in self._db_stats:
+            self._db_stats[key] += result[key]
+        if self.on_commit:
+            try:
+                self.on_commit({'batch': len(batch), **result, 'commit_ms': round(latency * 1000, 1)})
+            except Exception as e:
+                self.error = e
@@ -14,16 +14,145 @@ if sys.platform == 'win32':
         pass
 
 import argparse
+from datetime import datetime
+from scraper.db import DatabaseManager
+from scraper.export import EXPORT_FORMATS
+from scraper.events import EventLog, events_path
 from scraper.pipeline import ScrapingPipeline
+from config import RUNS_DIR, BUDGET_MAX_REQUESTS, BUDGET_MAX_SECONDS
 
 def main():
     parser = argparse.ArgumentParser(description="Exécuter le pipeline de scraping.")
     parser.add_argument("--country", type=str, default="France", help="Pays cible")
     parser.add_argument("--location", type=str, default="France", help="Région ou ville cible")
+    parser.add_argument("--locations", type=str, default="",
+                        help="Plusieurs lieux en un run, séparés par des virgules (Pays:Lieu ou Lieu, ex: \"Lyon,Belgique:Bruxelles\")")
     parser.add_argument("--queries", type=str, default="", help="Mots-clés de recherche séparés par des virgules")
+    parser.add_argument("--archive-only", action="store_true", help="Archiver les offres anciennes et entretenir la base, sans scraper")
+    parser.add_argument("--export", type=str, default="", help="Exporter les offres vers ce fichier, sans scraper")
+    parser.add_argument("--format", type=str, default="parquet", choices=EXPORT_FORMATS, help="Format d'export")
+    parser.add_argument("--since", type=str, default="", help="Export incrémental: offres vues après cette date (ISO)")
+    parser.add_argument("--include-archive", action="store_true", help="Inclure les offres archivées dans l'export")
+    parser.add_argument("--run-id", type=int, default=None, help="Exécuter un run mis en attente par l'application")
+    parser.add_argument("--events", type=str, default="", help="Fichier d'événements JSON lines (par défaut runs/run_<id>.events.jsonl avec --run-id)")
+    parser.add_argument("--no-resume", action="store_true", help="Ne pas reprendre le dernier run interrompu lancé avec les mêmes paramètres")
+    parser.add_argument("--daemon", action="store_true", help="Mode démon: relancer chaque (source, requête) à son intervalle (config.SCHEDULE_INTERVALS)")
+    parser.add_argument("--max-runs", type=int, default=None, help="Mode démon: s'arrêter après ce nombre de runs")
+    parser.add_argument("--schedule-status", action="store_true", help="Afficher les échéances et la fraîcheur par source du mode démon")
+    parser.add_argument("--enqueue", action="store_true", help="Découper un run en tâches dans la file, exécutées par les workers")
+    parser.add_argument("--worker", action="store_true", help="Exécuter les tâches de la file (plusieurs workers possibles)")
+    parser.add_argument("--worker-id", type=str, default="", help="Identifiant du worker (par défaut machine:pid)")
+    parser.add_argument("--wait", action="store_true", help="Worker: attendre de nouvelles tâches quand la file est vide")
+    parser.add_argument("--max-tasks", type=int, default=None, help="Worker: s'arrêter après ce nombre de tâches")
+    parser.add_argument("--retry-failed", type=int, default=None, metavar="RUN_ID", help="Remettre en file les tâches en échec d'un run")
+    parser.add_argument("--queue-status", action="store_true", help="Afficher le nombre de tâches par statut")
+    parser.add_argument("--budget-requests", type=int, default=BUDGET_MAX_REQUESTS,
+                        help="Budget de requêtes HTTP du run, dépensé sur les (source, requête) au meilleur rendement")
+    parser.add_argument("--budget-seconds", type=float, default=BUDGET_MAX_SECONDS,
+                        help="Budget de durée du run (secondes), dépensé sur les (source, requête) au meilleur rendement")
+    parser.add_argument("--enrich", action=argparse.BooleanOptionalAction, default=None,
+                        help="Télécharger (ou non) la description complète des nouvelles offres (défaut: config.ENRICH_DETAILS)")
+    parser.add_argument("--train-dictionary", action="store_true",
+                        help="Entraîner un dictionnaire de compression des descriptions et les recompresser")
+    parser.add_argument("--description-stats", action="store_true", help="Afficher le volume et le taux de compression des descriptions")
+    parser.add_argument("--extract-skills", action="store_true",
+                        help="Réanalyser les compétences de toutes les offres (taxonomie config.SKILLS)")
+    parser.add_argument("--yield-report", action="store_true", help="Afficher le rendement mesuré de chaque (source, requête)")
+    parser.add_argument("--browser-server", type=str, choices=["start", "stop", "status"], default="",
+                        help="Gérer le navigateur partagé réutilisé par les runs et les scripts")
     args = parser.parse_args()
 
-    print(f"🚀 Démarrage du scraper en mode isolé ({args.country}, {args.location})...")
+    if args.export:
+        since = datetime.fromisoformat(args.since) if args.since else None
+        stats = DatabaseManager().export_jobs(args.export, fmt=args.format, since_scraped_at=since,
+                                              include_archive=args.include_archive)
+        print(f"📦 {stats['rows']} offres exportées vers {args.export} ({stats['chunks']} blocs)")
+        if stats['max_scraped_at']:
+            print(f"⏭️  Prochain export incrémental: --since {stats['max_scraped_at'].isoformat()}")
+        return
+
+    if args.browser_server:
+        from scraper.browser import start_browser_server, stop_browser_server, browser_server_status
+        state = browser_server_status()
+        if args.browser_server == "start":
+            if state and state['alive']:
+                print(f"🌐 Navigateur partagé déjà démarré ({state['endpoint']}, pid {state['pid']})")
+                return
+            state = start_browser_server()
+            print(f"🌐 Navigateur partagé démarré sur {state['endpoint']} (pid {state['pid']}, lancement {state['launch_ms']} ms)")
+        elif args.browser_server == "stop":
+            print("🛑 Navigateur partagé arrêté" if stop_browser_server() else "ℹ️  Aucun navigateur partagé démarré")
+        elif state is None:
+            print("ℹ️  Aucun navigateur partagé démarré")
+        else:
+            status = "actif" if state['alive'] else "arrêté (relancé à la prochaine connexion)"
+            print(f"🌐 Navigateur partagé {status}: {state['endpoint']}, pid {state['pid']}, "
+                  f"démarré le {state['started_at']} (lancement {state['launch_ms']} ms)")
+        return
+
+    if args.queue_status:
+        db = DatabaseManager()
+        counts = db.get_task_counts(args.run_id)
+        scope = f"run #{args.run_id}" if args.run_id is not None else "file"
+        print(f"📋 Tâches ({scope}): " + (", ".join(f"{status} {count}" for status, count in sorted(counts.items())) or "aucune"))
+        return
+
+    if args.retry_failed is not None:
+        count = DatabaseManager().requeue_failed_tasks(args.retry_failed)
+        if count is None:
+            print("⏳ Un autre run est en cours, réessayez plus tard")
+            sys.exit(1)
+        print(f"🔁 {count} tâches du run #{args.retry_failed} remises en file")
+        return
+
+    if args.train_dictionary or args.description_stats:
+        db = DatabaseManager()
+        if args.train_dictionary:
+            trained = db.train_description_dictionary()
+            if trained is None:
+                print("Aucune description en base (voir --enrich)")
+                return
+            print(f"🗜️  Dictionnaire #{trained['dict_id']} ({trained['codec']}, {trained['dict_size'] // 1024} Ko) "
+                  f"entraîné sur {trained['samples']} descriptions, {trained['rows']} recompressées")
+        volume = db.get_description_stats()
+        print(f"📄 {volume['rows']} descriptions: {volume['raw_bytes'] / 1e6:.1f} Mo → {volume['stored_bytes'] / 1e6:.1f} Mo "
+              f"(taux {volume['ratio']}), codecs: {volume['codecs']}")
+        return
+
+    if args.extract_skills:
+        db = DatabaseManager()
+        refreshed = db.refresh_skills()
+        print(f"🧰 {refreshed['jobs']} offres analysées en {refreshed['seconds']} s: "
+              f"{refreshed['links']} compétences trouvées, {refreshed['skills']} distinctes")
+        for name, count in db.get_skill_counts(limit=15).items():
+            print(f"  {name:<28} {count}")
+        return
+
+    if args.yield_report:
+        from scraper.budget import format_yields
+        print("\n".join(format_yields(DatabaseManager().get_query_yields())))
+        return
+
+    if args.schedule_status:
+        from scraper.scheduler import format_freshness
+        db = DatabaseManager()
+        for unit in db.get_schedule(args.location):
+            print(f"  {unit['source']:<16} {unit['query']:<28} prochaine échéance {unit['next_due_at']:%Y-%m-%d %H:%M} UTC"
+                  f" ({unit['last_status'] or 'jamais exécutée'})")
+        print("\n".join(format_freshness(db.get_source_freshness(args.location))))
+        return
+
+    if args.archive_only:
+        pipeline = ScrapingPipeline()
+        archived = pipeline.apply_retention()
+        pipeline.refresh_snapshot()
+        print(f"🗄️  {archived} offres archivées")
+        return
+
+    # Lieux du run: --locations (planification multi-lieux) ou --country/--location
+    from scraper.planner import parse_locations
+    locations = parse_locations(args.locations, default_country=args.country) or [(args.country, args.location)]
+    print(f"🚀 Démarrage du scraper en mode isolé ({'; '.join(f'{c}, {l}' for c, l in locations)})...")
     pipeline = ScrapingPipeline()
     
     # Définir un callback simple pour les logs dans le terminal
@@ -33,8 +162,46 @@ def main():
     # Parser les queries
     queries_list = [q.strip() for q in args.queries.split(",")] if args.queries else None
     
+    if args.enqueue:
+        from scraper.planner import plan_tasks, format_plan
+        from scraper.tasks import enqueue_run
+        plan = plan_tasks(pipeline.sources, locations, queries=queries_list)
+        run_id = enqueue_run(pipeline.db, plan['tasks'])
+        if run_id is None:
+            print("⏳ Un autre run est en cours")
+            sys.exit(1)
+        print(f"📋 Run #{run_id}: {format_plan(plan)}, en file (python scraper_cli.py --worker)")
+        return
+    
+    if args.worker:
+        import signal
+        from scraper.tasks import TaskWorker
+        worker = TaskWorker(pipeline, worker_id=args.worker_id or None, progress_callback=cli_callback)
+        signal.signal(signal.SIGINT, worker.stop)
+        if hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, worker.stop)
+        worker.run(wait=args.wait, max_tasks=args.max_tasks)
+        return
+    
+    if args.daemon:
+        from scraper.scheduler import ScrapeScheduler
+        scheduler = ScrapeScheduler(pipeline, country=args.country, location=args.location,
+                                    queries=queries_list, progress_callback=cli_callback)
+        scheduler.install_signal_handlers()
+        scheduler.run_forever(max_runs=args.max_runs)
+        return
+    
+    # Flux d'événements structurés lu par l'application
+    events_file = args.events or (events_path(RUNS_DIR, args.run_id) if args.run_id is not None else "")
+    events = EventLog(events_file) if events_file else None
+    
     try:
-        stats = pipeline.run(country=args.country, location=args.location, queries=queries_list, progress_callback=cli_callback)
+        stats = pipeline.run(country=args.country, location=args.location, queries=queries_list,
+                             progress_callback=cli_callback, run_id=args.run_id,
+                             event_callback=events.emit if events else None, resume=not args.no_resume,
+                             locations=locations if args.locations else None,
+                             max_requests=args.budget_requests, max_seconds=args.budget_seconds,
+                             enrich=args.enrich)
         print("\n✨ Scraping terminé avec succès!")
         print(f"📊 Stats: {stats}")
     except Exception as e:
@@ -42,6 +209,9 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if events:
+            events.close()
 
 if __name__ == "__main__":
     main()
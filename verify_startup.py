@@ -0,0 +1,93 @@
+"""
+Vérifie le temps de démarrage à froid de l'application.
+
+Importe dans un processus Python neuf les modules importés au niveau module par app.py,
+mesure le temps d'import et vérifie qu'aucun module lourd (Playwright, sources de
+scraping, plotly) n'est chargé au démarrage. Code de sortie 1 en cas de régression.
+
+Usage:
+    python verify_startup.py
+    python verify_startup.py --budget 2.5 --exclude streamlit --runs 3
+"""
+import os
+import sys
+import ast
+import json
+import argparse
+import subprocess
+from config import STARTUP_IMPORT_BUDGET, STARTUP_FORBIDDEN_MODULES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Exécuté dans le processus neuf: importe les modules et rapporte durée et modules chargés
+PROBE = """
+import sys, json, time, importlib
+start = time.perf_counter()
+for name in json.loads(sys.argv[1]):
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+def top_level_imports(path: str = APP_PATH) -> list:
+    """Modules importés au niveau module d'un script (hors imports dans les fonctions et blocs)."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return modules
+
+
+def measure(modules: list) -> dict:
+    """Importe les modules dans un processus Python neuf (aucun module déjà chargé)."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(modules)],
+        capture_output=True, text=True, cwd=os.path.dirname(APP_PATH), check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie le temps de démarrage de l'application")
+    parser.add_argument('--budget', type=float, default=STARTUP_IMPORT_BUDGET, help="Budget en secondes")
+    parser.add_argument('--runs', type=int, default=3, help="Nombre de mesures (la meilleure est retenue)")
+    parser.add_argument('--exclude', nargs='*', default=[], help="Modules à ne pas importer (ex: streamlit non installé)")
+    args = parser.parse_args()
+
+    modules = [
+        name for name in top_level_imports()
+        if not any(name == excluded or name.startswith(excluded + '.') for excluded in args.exclude)
+    ]
+    print(f"📦 Modules importés par app.py: {', '.join(modules)}")
+
+    samples = [measure(modules) for _ in range(max(args.runs, 1))]
+    elapsed = min(sample['elapsed'] for sample in samples)
+    loaded = samples[0]['modules']
+    forbidden = sorted(
+        name for name in loaded
+        if any(name == prefix or name.startswith(prefix + '.') for prefix in STARTUP_FORBIDDEN_MODULES)
+    )
+
+    print(f"⏱️  Temps d'import: {elapsed:.3f}s (budget {args.budget:.3f}s, {len(loaded)} modules chargés)")
+    ok = True
+    if elapsed > args.budget:
+        print("❌ Budget de démarrage dépassé")
+        ok = False
+    if forbidden:
+        print(f"❌ Modules interdits au démarrage: {', '.join(forbidden)}")
+        ok = False
+    if ok:
+        print("✅ Démarrage dans le budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,13 @@
 from scraper.sources.wttj_scraper import WTTJScraper
 from playwright.sync_api import sync_playwright
+from scraper.browser import connect_browser
 
 def test_wttj():
     scraper = WTTJScraper()
     print("Testing WTTJ Scraper...")
     
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+        browser, _ = connect_browser(p)
         # Search for something common
         scraper.search_queries = ["Data Analyst"] 
         